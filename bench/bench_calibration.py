@@ -0,0 +1,69 @@
+"""Benchmark: Schwellen-Replay (hotelbot.calibration) gegen Einzelläufe je Schwelle.
+
+Synthetische KB und ein Log aus ``synth_queries`` (Paraphrasen + unbekannte
+Themen, jede Anfrage mehrfach). Gemessen:
+  * Replay      Log lesen, verschiedene Anfragen einmal bewerten, alle Schwellen,
+  * Naiv        ``kb.search`` über das ganze Log einmal je Schwelle
+                (aus --naive-thresholds Läufen hochgerechnet),
+  * Abweichung  max. Differenz der Antwortquote zwischen beiden Wegen.
+
+    python -m bench.bench_calibration --kb-size 10000 --rows 1000000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from bench.synth import synth_kb, synth_queries
+from hotelbot import calibration
+from hotelbot.engine import KnowledgeBase
+
+
+def write_log(path, queries, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["timestamp", "user_text", "picked_id", "similarity", "session_id", "arm"])
+        for i in range(rows):
+            w.writerow([f"2026-01-01T00:00:{i % 60:02d}", rng.choice(queries), "", "0.0", f"s{i % 5000}", ""])
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--kb-size", type=int, default=10_000)
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--distinct", type=int, default=50_000, help="verschiedene Anfragen im Log")
+    p.add_argument("--naive-thresholds", type=int, default=2)
+    args = p.parse_args(argv)
+    frame = synth_kb(args.kb_size)
+    kb = KnowledgeBase.from_frame(frame)
+    queries = synth_queries(frame, args.distinct)
+    thresholds = calibration.DEFAULT_THRESHOLDS
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "logs.csv")
+        write_log(path, queries, args.rows)
+        t0 = time.perf_counter()
+        rows, stats = calibration.replay(kb, [path], thresholds=thresholds)
+        replay_s = time.perf_counter() - t0
+
+        texts = [r["user_text"] for r in csv.DictReader(open(path, newline="", encoding="utf-8"))]
+        picked = [thresholds[0], thresholds[len(thresholds) // 2], thresholds[-1]][:args.naive_thresholds]
+        t0 = time.perf_counter()
+        naive = [np.mean([a.picked_id is not None for a in kb.search(texts, threshold=t)]) for t in picked]
+        naive_s = (time.perf_counter() - t0) / len(picked) * len(thresholds)
+    by_t = {round(r["threshold"], 2): r["answer_rate"] for r in rows}
+    diff = max(abs(by_t[round(float(t), 2)] - a) for t, a in zip(picked, naive))
+    print(f"KB {args.kb_size} Fragen, Log {stats['rows']} Zeilen ({stats['distinct']} verschieden), "
+          f"{len(thresholds)} Schwellen")
+    print(f"Replay {replay_s:.2f}s  Naiv ~{naive_s:.0f}s (hochgerechnet)  "
+          f"Faktor ~{naive_s / replay_s:.0f}x  Abweichung {diff:.1e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
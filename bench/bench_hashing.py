@@ -0,0 +1,121 @@
+"""Benchmark: gelerntes Vokabular (TfidfVectorizer) vs. gehashte Spalten (hotelbot.hashing).
+
+1. Paraphrasen gegen die echte answers.csv: Treffer@1 je Vektorizer.
+2. Synthetische KBs je Größe:
+   * Fit-Zeit beider Vektorizer,
+   * ``--append`` neue Fragen: ``KnowledgeBase.append`` (hashing) gegenüber
+     einem vollen Refit (tfidf),
+   * Top-1-Übereinstimmung mit TF-IDF – frisch gebaut und nach dem Anhängen
+     (ältere Zeilen behalten dann ihre IDF-Gewichte),
+   * Speicher: Vokabular-Dict + IDF gegenüber festem df/IDF-Array, X + Xᵀ,
+     sowie belegte Spalten (Terme vs. gehashte Spalten = Kollisionen).
+
+    python -m bench.bench_hashing --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench.bench_semantic import PARAPHRASES
+from bench.suite import csr_bytes, vocab_bytes
+from bench.synth import synth_kb, synth_queries
+from hotelbot.engine import KnowledgeBase
+
+
+def paraphrase_report(csv_path, threshold):
+    df = pd.read_csv(csv_path).fillna("")
+    kbs = {kind: KnowledgeBase.from_frame(df, vectorizer=kind) for kind in ("tfidf", "hashing")}
+    print(f"Paraphrasen gegen {csv_path} (threshold={threshold})")
+    print(f"{'Anfrage':<26} {'tfidf':>14} {'hashing':>14}")
+    hits = {kind: 0 for kind in kbs}
+    for text, expected in PARAPHRASES:
+        cells = []
+        for kind, kb in kbs.items():
+            res = kb.search([text], threshold=threshold)[0]
+            ok = res.picked_id in expected
+            hits[kind] += ok
+            cells.append(f"{res.picked_id or '-':>6} {res.similarity:.2f} {'✓' if ok else '✗'}")
+        print(f"{text:<26} {cells[0]:>14} {cells[1]:>14}")
+    print(f"{'Treffer@1':<26} {hits['tfidf']:>12}/{len(PARAPHRASES)} "
+          f"{hits['hashing']:>12}/{len(PARAPHRASES)}\n")
+
+
+def _agreement(a, b):
+    """Anteil gleicher Top-1-IDs (inkl. gemeinsamer Fallbacks) und mittlere |Δ Score|."""
+    same = np.mean([x.picked_id == y.picked_id for x, y in zip(a, b)])
+    delta = np.mean([abs(x.similarity - y.similarity) for x, y in zip(a, b)])
+    return float(same), float(delta)
+
+
+def bench_size(n, n_append, n_queries, threshold):
+    df = synth_kb(n + n_append)
+    base, extra = df.iloc[:n], df.iloc[n:]
+    queries = synth_queries(df, n_queries)
+
+    t0 = time.perf_counter()
+    tfidf = KnowledgeBase.from_frame(base, retrieval="brute")
+    fit_tfidf = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    hashed = KnowledgeBase.from_frame(base, retrieval="brute", vectorizer="hashing")
+    fit_hashing = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    tfidf_all = KnowledgeBase.from_frame(df, retrieval="brute")
+    refit_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    appended = hashed.append(extra["id"].astype(str).tolist(), extra["question"].tolist(),
+                             extra["answer"].tolist())
+    append_s = time.perf_counter() - t0
+    hashed_all = KnowledgeBase.from_frame(df, retrieval="brute", vectorizer="hashing")
+
+    ref = tfidf_all.search(queries, threshold=threshold)
+    fresh_same, fresh_delta = _agreement(ref, hashed_all.search(queries, threshold=threshold))
+    app_same, app_delta = _agreement(ref, appended.search(queries, threshold=threshold))
+    return {
+        "size": n,
+        "fit_tfidf_s": fit_tfidf,
+        "fit_hashing_s": fit_hashing,
+        "refit_tfidf_s": refit_s,
+        "append_hashing_s": append_s,
+        "top1_fresh": fresh_same, "delta_fresh": fresh_delta,
+        "top1_appended": app_same, "delta_appended": app_delta,
+        "vocab_tfidf_bytes": vocab_bytes(tfidf_all.vec.vocabulary_) + tfidf_all.vec.idf_.nbytes,
+        "vocab_hashing_bytes": hashed_all.vec.df_.nbytes + hashed_all.vec.idf_.nbytes,
+        "matrix_tfidf_bytes": csr_bytes(tfidf_all.X) + csr_bytes(tfidf_all.XT),
+        "matrix_hashing_bytes": csr_bytes(hashed_all.X) + csr_bytes(hashed_all.XT),
+        "terms": len(tfidf_all.vec.vocabulary_),
+        "columns": int(np.count_nonzero(hashed_all.vec.df_)),
+    }
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--kb", default="answers.csv")
+    p.add_argument("--threshold", type=float, default=0.30)
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    p.add_argument("--append", type=int, default=1_000, help="neue Fragen je Größe")
+    p.add_argument("--queries", type=int, default=500)
+    args = p.parse_args(argv)
+
+    if os.path.exists(args.kb):
+        paraphrase_report(args.kb, args.threshold)
+    print(f"{'KB-Zeilen':>10} {'Fit tfidf/hash':>15} {'+neu: Refit/Append':>19} "
+          f"{'Top-1 frisch/angeh.':>20} {'Vokabular tfidf/hash':>21} {'X+Xᵀ tfidf/hash':>17} "
+          f"{'Terme/Spalten':>15}")
+    for n in args.sizes:
+        r = bench_size(n, args.append, args.queries, args.threshold)
+        print(f"{n:>10} {r['fit_tfidf_s']:>6.2f}/{r['fit_hashing_s']:<6.2f}s "
+              f"{r['refit_tfidf_s']:>8.2f}s/{r['append_hashing_s'] * 1000:<7.1f}ms "
+              f"{r['top1_fresh']:>9.1%}/{r['top1_appended']:<9.1%} "
+              f"{r['vocab_tfidf_bytes'] / 2**20:>9.1f}/{r['vocab_hashing_bytes'] / 2**20:<9.1f}MB "
+              f"{r['matrix_tfidf_bytes'] / 2**20:>7.1f}/{r['matrix_hashing_bytes'] / 2**20:<7.1f}MB "
+              f"{r['terms']:>7}/{r['columns']:<7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Benchmark: Brute-Force (Q·Xᵀ über alle Zeilen) vs. invertierter Index mit MaxScore.
+
+Prüft zuerst, dass beide Pfade für alle Anfragen dieselben Answers liefern
+(IDs, Reihenfolge und bitgleiche Scores), und misst dann die Latenz je
+Einzelanfrage.
+
+    python -m bench.bench_inverted --sizes 100000 1000000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from bench.synth import synth_kb, synth_queries
+from hotelbot.engine import KnowledgeBase
+
+
+def _latencies_ms(kb, queries, topk):
+    lat = np.empty(len(queries))
+    for i, q in enumerate(queries):
+        t0 = time.perf_counter()
+        kb.search([q], topk=topk)
+        lat[i] = time.perf_counter() - t0
+    return lat * 1000
+
+
+def run(sizes, n_queries, topk):
+    print(f"{'KB-Zeilen':>10} {'brute p50':>10} {'p95':>8} {'invertiert p50':>15} {'p95':>8} {'Faktor p50':>11}")
+    for n in sizes:
+        df = synth_kb(n)
+        queries = synth_queries(df, n_queries)
+        brute = KnowledgeBase.from_frame(df, retrieval="brute")
+        inverted = KnowledgeBase(brute.ids, brute.questions, brute.answers, brute.vec, brute.X,
+                                 XT=brute.XT, normalized=True, retrieval="inverted")
+        inverted.inverted  # Aufbau (max. Gewicht je Term) nicht mitmessen
+
+        for threshold in (0.30, 0.0):
+            a = brute.search(queries, threshold=threshold, topk=topk)
+            b = inverted.search(queries, threshold=threshold, topk=topk)
+            diff = sum(x != y for x, y in zip(a, b))
+            if diff:
+                print(f"{n:>10} ABWEICHUNG bei {diff} von {len(queries)} Anfragen (threshold={threshold})",
+                      file=sys.stderr)
+                return 1
+
+        b50, b95 = np.percentile(_latencies_ms(brute, queries, topk), [50, 95])
+        i50, i95 = np.percentile(_latencies_ms(inverted, queries, topk), [50, 95])
+        print(f"{n:>10} {b50:>8.2f}ms {b95:>6.2f}ms {i50:>13.2f}ms {i95:>6.2f}ms {b50 / i50:>10.1f}x")
+    return 0
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--queries", type=int, default=300)
+    p.add_argument("--topk", type=int, default=3)
+    args = p.parse_args(argv)
+    return run(args.sizes, args.queries, args.topk)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
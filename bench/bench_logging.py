@@ -0,0 +1,162 @@
+"""Durchsatz: CSV-Logging pro Event (pandas) vs. gepufferter CsvLogWriter vs. SQLite.
+
+Misst Events/Sekunde für den alten Pfad (DataFrame + to_csv je Event), den
+CSV-Writer und den SQLite-Writer (hotelbot.log_sinks), danach schreiben
+mehrere Prozesse gleichzeitig in dieselbe Datei und es wird geprüft, dass kein
+Header doppelt und keine Zeile zerrissen ist. Für SQLite läuft parallel dazu
+ein Leser mit Auswertungs-Abfragen (Top-Fragen, letzte Stunde), gemessen
+werden seine Abfragen/s und die langsamste Abfrage.
+
+    python -m bench.bench_logging --events 5000 --procs 4
+"""
+import argparse
+import csv
+import multiprocessing as mp
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from hotelbot.csv_log import LOG_FIELDS, CsvLogWriter
+from hotelbot.log_sinks import SqliteLogWriter
+
+
+def legacy_log_event(user_text, picked_id, sim, logfile):
+    # Stand vor dem Writer (aus app.py)
+    row = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "user_text": user_text,
+        "picked_id": picked_id,
+        "similarity": sim,
+    }
+    exists = os.path.exists(logfile)
+    pd.DataFrame([row]).to_csv(logfile, mode="a", index=False, header=not exists)
+
+
+def _row(i):
+    return {"timestamp": datetime.utcnow().isoformat(), "user_text": f"Frage, Nr. {i}",
+            "picked_id": f"Q{i % 300}", "similarity": 0.5}
+
+
+def _writer_proc(path, n, max_bytes):
+    w = CsvLogWriter(path, max_bytes=max_bytes, flush_interval=0).start()
+    for i in range(n):
+        w.write(_row(i))
+    w.close()
+
+
+def _sqlite_proc(path, n):
+    w = SqliteLogWriter(path, flush_interval=0).start()
+    for i in range(n):
+        w.write(_row(i))
+    w.close()
+
+
+def _reader_proc(path, stop, out):
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=10)
+    queries, worst = 0, 0.0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        db.execute("SELECT picked_id, COUNT(*) FROM logs WHERE picked_id != '' "
+                   "GROUP BY picked_id ORDER BY 2 DESC LIMIT 10").fetchall()
+        db.execute("SELECT COUNT(*) FROM logs WHERE timestamp >= ?", ("2000-01-01",)).fetchone()
+        worst = max(worst, time.perf_counter() - t0)
+        queries += 2
+    out.put((queries, worst))
+
+
+def bench_legacy(path, n):
+    t0 = time.perf_counter()
+    for i in range(n):
+        legacy_log_event(f"Frage, Nr. {i}", f"Q{i % 300}", 0.5, path)
+    return n / (time.perf_counter() - t0)
+
+
+def bench_writer(path, n):
+    t0 = time.perf_counter()
+    w = CsvLogWriter(path, flush_interval=0).start()
+    for i in range(n):
+        w.write(_row(i))
+    w.close()
+    return n / (time.perf_counter() - t0)
+
+
+def bench_sqlite(path, n):
+    t0 = time.perf_counter()
+    w = SqliteLogWriter(path, flush_interval=0).start()
+    for i in range(n):
+        w.write(_row(i))
+    w.close()
+    return n / (time.perf_counter() - t0)
+
+
+def check_concurrent_sqlite(directory, procs, n):
+    path = os.path.join(directory, "concurrent.db")
+    SqliteLogWriter(path).start().close()  # Schema + WAL anlegen, bevor der Leser startet
+    stop, out = mp.Event(), mp.Queue()
+    reader = mp.Process(target=_reader_proc, args=(path, stop, out))
+    reader.start()
+    ps = [mp.Process(target=_sqlite_proc, args=(path, n)) for _ in range(procs)]
+    t0 = time.perf_counter()
+    for p in ps:
+        p.start()
+    for p in ps:
+        p.join()
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    queries, worst = out.get()
+    reader.join()
+    rows = sqlite3.connect(path).execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+    assert rows == procs * n, (rows, procs * n)
+    return procs * n / elapsed, queries / elapsed, worst
+
+
+def check_concurrent(directory, procs, n, max_bytes):
+    path = os.path.join(directory, "concurrent.csv")
+    ps = [mp.Process(target=_writer_proc, args=(path, n, max_bytes)) for _ in range(procs)]
+    t0 = time.perf_counter()
+    for p in ps:
+        p.start()
+    for p in ps:
+        p.join()
+    elapsed = time.perf_counter() - t0
+    rows, headers = 0, 0
+    files = [f for f in os.listdir(directory) if f.startswith("concurrent")]
+    for name in files:
+        with open(os.path.join(directory, name), newline="", encoding="utf-8") as f:
+            for rec in csv.reader(f):
+                if rec == LOG_FIELDS:
+                    headers += 1
+                else:
+                    assert len(rec) == len(LOG_FIELDS), f"kaputte Zeile in {name}: {rec}"
+                    rows += 1
+    assert rows == procs * n, (rows, procs * n)
+    assert headers == len(files), (headers, len(files))
+    return procs * n / elapsed, len(files)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--events", type=int, default=5000)
+    p.add_argument("--procs", type=int, default=4)
+    args = p.parse_args(argv)
+    with tempfile.TemporaryDirectory() as d:
+        old = bench_legacy(os.path.join(d, "legacy.csv"), args.events)
+        new = bench_writer(os.path.join(d, "writer.csv"), args.events)
+        print(f"pandas je Event : {old:>10.0f} Events/s")
+        print(f"CsvLogWriter    : {new:>10.0f} Events/s ({new / old:.0f}x)")
+        lite = bench_sqlite(os.path.join(d, "writer.db"), args.events)
+        print(f"SqliteLogWriter : {lite:>10.0f} Events/s ({lite / old:.0f}x)")
+        rate, files = check_concurrent(d, args.procs, args.events, max_bytes=64 * 1024)
+        print(f"{args.procs} Prozesse CSV    : {rate:>10.0f} Events/s, {files} Dateien nach Rotation, "
+              f"keine doppelten Header/zerrissenen Zeilen")
+        rate, qps, worst = check_concurrent_sqlite(d, args.procs, args.events)
+        print(f"{args.procs} Prozesse SQLite : {rate:>10.0f} Events/s, alle Zeilen vorhanden; "
+              f"Leser parallel {qps:.0f} Abfragen/s, langsamste {worst * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark: Nachbarschaftsgraph (hotelbot.neighbors) – Aufbau, Update, Lookup.
+
+Je KB-Größe:
+  * Build       voller Aufbau aus X·Xᵀ in Blöcken (offline, quadratisch),
+  * Update      ``updated`` nach --changed neuen/geänderten Fragen,
+  * Lookup      Vorschläge für eine Frage aus dem Graphen (zur Anfragezeit),
+  * Scoring     zum Vergleich: dieselben Vorschläge live per Q·Xᵀ berechnet,
+  * Speicher    Graph (Fragen x k, int32 + float32).
+
+    python -m bench.bench_neighbors --sizes 1000 10000 30000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from bench.synth import synth_kb
+from hotelbot.engine import RELATED_LIMIT, KnowledgeBase, topk_rows
+from hotelbot.neighbors import NeighborGraph
+
+
+def _per_call_us(fn, rows):
+    t0 = time.perf_counter()
+    for r in rows:
+        fn(r)
+    return (time.perf_counter() - t0) / len(rows) * 1e6
+
+
+def bench_size(n, n_changed, n_lookups):
+    kb = KnowledgeBase.from_frame(synth_kb(n))
+    t0 = time.perf_counter()
+    graph = NeighborGraph.build(kb.X, kb.XT)
+    build_s = time.perf_counter() - t0
+
+    changed = list(range(0, n, max(1, n // n_changed)))[:n_changed]
+    keep = set(changed)
+    reuse = [(i, i) for i in range(n) if i not in keep]
+    t0 = time.perf_counter()
+    graph.updated(kb.X, kb.XT, reuse, changed)
+    update_s = time.perf_counter() - t0
+
+    rows = np.random.default_rng(0).integers(0, n, n_lookups)
+    lookup_us = _per_call_us(lambda r: graph.related(r, RELATED_LIMIT), rows)
+
+    def live(r):
+        sims = (kb.X[r] @ kb.XT).toarray()
+        sims[0, r] = -np.inf
+        return topk_rows(sims, RELATED_LIMIT)
+    scoring_us = _per_call_us(live, rows)
+    return {"size": n, "build_s": build_s, "update_s": update_s, "lookup_us": lookup_us,
+            "scoring_us": scoring_us, "bytes": graph.nbytes()}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    p.add_argument("--changed", type=int, default=100)
+    p.add_argument("--lookups", type=int, default=500)
+    args = p.parse_args(argv)
+    print(f"{'KB-Zeilen':>10} {'Build':>9} {'Update':>9} {'Lookup':>10} {'Scoring':>10} {'Graph':>9}")
+    for n in args.sizes:
+        r = bench_size(n, args.changed, args.lookups)
+        print(f"{n:>10} {r['build_s']:>8.2f}s {r['update_s']:>8.2f}s {r['lookup_us']:>8.1f}µs "
+              f"{r['scoring_us']:>8.0f}µs {r['bytes'] / 2**20:>7.2f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Benchmark: Sparse (Wort-TF-IDF) vs. hybrid (Sparse + LSA-Vektoren, hotelbot.semantic).
+
+1. Paraphrasen gegen die echte answers.csv: Treffer@1 und Ähnlichkeit je Modus.
+2. Synthetische KBs: Latenz je Einzelanfrage, Fit-Zeit und Speicher
+   (X + Xᵀ als CSR gegenüber float16-Vektoren + LSA-Modell).
+
+    python -m bench.bench_semantic --sizes 10000 100000
+"""
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from bench.suite import csr_bytes, rss_bytes
+from bench.synth import synth_kb, synth_queries
+from hotelbot.engine import KnowledgeBase
+from hotelbot.index_store import load_index, save_index
+
+# Anfrage -> akzeptierte IDs aus answers.csv
+PARAPHRASES = [
+    ("Frühstückszeiten", {"Q34", "Q101"}),
+    ("Frühstückspreis", {"Q35"}),
+    ("Parkgebühren", {"Q18"}),
+    ("Parkplatzreservierung", {"Q19"}),
+    ("Ladesäule Elektroauto", {"Q20", "Q21"}),
+    ("Haustier mitbringen", {"Q22", "Q190"}),
+    ("Öffnungszeiten Rezeption", {"Q8"}),
+    ("Uhrzeit Auschecken", {"Q3"}),
+    ("Anreisezeit Einchecken", {"Q2"}),
+    ("WLAN-Zugang", {"Q14"}),
+]
+
+
+def paraphrase_report(csv_path, threshold):
+    df = pd.read_csv(csv_path).fillna("")
+    kbs = {mode: KnowledgeBase.from_frame(df, scoring=mode) for mode in ("dot", "hybrid")}
+    print(f"Paraphrasen gegen {csv_path} (threshold={threshold})")
+    print(f"{'Anfrage':<26} {'dot':>14} {'hybrid':>14}")
+    hits = {mode: 0 for mode in kbs}
+    for text, expected in PARAPHRASES:
+        cells = []
+        for mode, kb in kbs.items():
+            res = kb.search([text], threshold=threshold)[0]
+            ok = res.picked_id in expected
+            hits[mode] += ok
+            cells.append(f"{res.picked_id or '-':>6} {res.similarity:.2f} {'✓' if ok else '✗'}")
+        print(f"{text:<26} {cells[0]:>14} {cells[1]:>14}")
+    print(f"{'Treffer@1':<26} {hits['dot']:>12}/{len(PARAPHRASES)} {hits['hybrid']:>12}/{len(PARAPHRASES)}\n")
+
+
+def _p50_p95_ms(kb, queries):
+    lat = np.empty(len(queries))
+    for i, q in enumerate(queries):
+        t0 = time.perf_counter()
+        kb.search([q])
+        lat[i] = time.perf_counter() - t0
+    return np.percentile(lat * 1000, [50, 95])
+
+
+def bench_size(n, n_queries):
+    df = synth_kb(n)
+    queries = synth_queries(df, n_queries)
+    t0 = time.perf_counter()
+    sparse = KnowledgeBase.from_frame(df, retrieval="brute")
+    fit_sparse = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    hybrid = KnowledgeBase(sparse.ids, sparse.questions, sparse.answers, sparse.vec, sparse.X,
+                           XT=sparse.XT, normalized=True, scoring="hybrid")
+    fit_semantic = time.perf_counter() - t0
+
+    d = tempfile.mkdtemp()
+    try:
+        save_index(hybrid, os.path.join(d, "kb.index"), digest="bench")
+        del hybrid
+        gc.collect()
+        rss0 = rss_bytes()
+        hybrid = load_index(os.path.join(d, "kb.index"), scoring="hybrid")
+        s50, s95 = _p50_p95_ms(sparse, queries)
+        h50, h95 = _p50_p95_ms(hybrid, queries)
+        rss_delta = rss_bytes() - rss0
+        return {
+            "size": n,
+            "fit_sparse_s": fit_sparse,
+            "fit_semantic_s": fit_semantic,
+            "sparse_p50_ms": s50, "sparse_p95_ms": s95,
+            "hybrid_p50_ms": h50, "hybrid_p95_ms": h95,
+            "sparse_bytes": csr_bytes(sparse.X) + csr_bytes(sparse.XT),
+            "semantic_bytes": hybrid.semantic.nbytes(),
+            "rss_delta_bytes": rss_delta,
+        }
+    finally:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--kb", default="answers.csv")
+    p.add_argument("--threshold", type=float, default=0.30)
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    p.add_argument("--queries", type=int, default=200)
+    args = p.parse_args(argv)
+
+    if os.path.exists(args.kb):
+        paraphrase_report(args.kb, args.threshold)
+    print(f"{'KB-Zeilen':>10} {'Fit LSA':>8} {'sparse p50/p95':>16} {'hybrid p50/p95':>16} "
+          f"{'X+Xᵀ':>9} {'LSA':>9} {'RSS +':>9}")
+    for n in args.sizes:
+        r = bench_size(n, args.queries)
+        print(f"{n:>10} {r['fit_semantic_s']:>7.1f}s "
+              f"{r['sparse_p50_ms']:>7.2f}/{r['sparse_p95_ms']:<6.2f}ms "
+              f"{r['hybrid_p50_ms']:>7.2f}/{r['hybrid_p95_ms']:<6.2f}ms "
+              f"{r['sparse_bytes'] / 2**20:>7.1f}MB {r['semantic_bytes'] / 2**20:>7.1f}MB "
+              f"{r['rss_delta_bytes'] / 2**20:>7.1f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
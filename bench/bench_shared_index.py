@@ -0,0 +1,91 @@
+"""Benchmark: Speicher je Worker-Prozess mit gemeinsam gemapptem KB-Index.
+
+Baut eine synthetische KB, schreibt den Index (hotelbot.index_store) und
+startet --workers frische Prozesse (spawn), die ihn wie ein Streamlit-Replikat
+laden und --queries Anfragen beantworten. Alle Worker halten den Index
+gleichzeitig, dann misst jeder aus ``/proc/self/smaps_rollup``:
+  * privat   Zuwachs an Private_Clean + Private_Dirty durch Laden + Anfragen,
+  * PSS      Zuwachs an Pss (geteilte Seiten anteilig je Prozess),
+  * geteilt  Zuwachs an Shared_Clean + Shared_Dirty (dieselben physischen Seiten wie andere Worker).
+Mit ``--mode fit`` baut jeder Worker die KB stattdessen selbst aus der CSV.
+
+    python -m bench.bench_shared_index --kb-size 100000 --workers 1 4
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+
+_FIELDS = {"private": ("Private_Clean", "Private_Dirty"), "pss": ("Pss",), "shared": ("Shared_Clean", "Shared_Dirty")}
+
+
+def smaps() -> dict:
+    """Speicher des Prozesses in Bytes (Linux)."""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    return {k: sum(values.get(n, 0) for n in names) for k, names in _FIELDS.items()}
+
+
+def _worker(mode, csv_path, index_dir, queries, ready, done, out):
+    import numpy as np  # noqa: F401  (Importe vor der ersten Messung)
+    import scipy.sparse  # noqa: F401
+    from hotelbot.engine import KnowledgeBase
+    from hotelbot.index_store import load_index
+    before = smaps()
+    kb = KnowledgeBase.from_csv(csv_path) if mode == "fit" else load_index(index_dir)
+    kb.search(queries)
+    for qid in kb.ids[::max(1, len(kb) // 100)]:
+        kb.answer_by_id(str(qid))
+    ready.wait()  # alle Worker haben den Index geladen: jetzt teilen sie sich die Seiten
+    after = smaps()
+    out.put({k: after[k] - before[k] for k in after})
+    done.wait()
+
+
+def run(mode, n_workers, csv_path, index_dir, queries):
+    ctx = mp.get_context("spawn")
+    ready, done, out = ctx.Barrier(n_workers), ctx.Barrier(n_workers + 1), ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(mode, csv_path, index_dir, queries, ready, done, out))
+             for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    results = [out.get() for _ in procs]
+    done.wait()
+    for p in procs:
+        p.join()
+    return {k: sum(r[k] for r in results) / n_workers for k in results[0]}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--kb-size", type=int, default=100_000)
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--mode", choices=("index", "fit"), default="index")
+    args = p.parse_args(argv)
+    from bench.synth import synth_kb, synth_queries
+    from hotelbot.engine import KnowledgeBase
+    from hotelbot.index_store import save_index
+
+    frame = synth_kb(args.kb_size)
+    queries = synth_queries(frame, args.queries)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, index_dir = os.path.join(tmp, "kb.csv"), os.path.join(tmp, "kb.index")
+        frame.to_csv(csv_path, index=False)
+        save_index(KnowledgeBase.from_frame(frame), index_dir, digest="bench")
+        size = sum(e.stat().st_size for e in os.scandir(index_dir) if e.is_file())
+        print(f"KB {args.kb_size} Fragen, Index {size / 2**20:.1f}MB, Modus {args.mode}")
+        print(f"{'Worker':>6} {'privat MB':>10} {'PSS MB':>8} {'geteilt MB':>11}")
+        for n in args.workers:
+            r = run(args.mode, n, csv_path, index_dir, queries)
+            print(f"{n:>6} {r['private'] / 2**20:>10.1f} {r['pss'] / 2**20:>8.1f} {r['shared'] / 2**20:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Benchmark: Kaltstart eines Serving-Prozesses (Import-Zeit, erste Antwort, RSS).
+
+Jede Variante läuft in einem frischen Interpreter, der einen kompilierten
+Index lädt (``TenantRegistry`` wie in UI und HTTP-Dienst) und eine Anfrage
+beantwortet:
+
+* ``schlank``         nur was der Serving-Pfad selbst importiert,
+* ``mit pandas/sklearn`` dieselben Schritte, pandas und scikit-learn aber vorab
+  importiert – so teuer war jeder Worker, solange beides beim Import geladen wurde.
+
+Zusätzlich wird gelistet, welche schweren Module im schlanken Prozess geladen sind.
+
+    python -m bench.bench_startup --kb answers.csv --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+for name in PRELOAD:
+    __import__(name)
+from hotelbot.tenants import TenantRegistry
+t_import = time.perf_counter() - t0
+registry = TenantRegistry({"default": KB})
+res = registry.get().search(["Wann ist das Frühstück?"])[0]
+t_first = time.perf_counter() - t0
+with open("/proc/self/status") as f:
+    rss = next(int(l.split()[1]) * 1024 for l in f if l.startswith("VmRSS:"))
+registry.close()
+heavy = sorted(m for m in ("pandas", "sklearn", "gspread", "streamlit") if m in sys.modules)
+print(json.dumps({"import_s": t_import, "first_answer_s": t_first, "rss_bytes": rss,
+                  "heavy": heavy, "picked_id": res.picked_id}))
+"""
+
+VARIANTS = {
+    "schlank": [],
+    "mit pandas/sklearn": ["pandas", "sklearn.feature_extraction.text"],
+}
+
+
+def probe(kb, preload):
+    code = f"PRELOAD = {preload!r}\nKB = {kb!r}\n" + _PROBE
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--kb", default="answers.csv")
+    p.add_argument("--runs", type=int, default=5)
+    args = p.parse_args(argv)
+
+    probe(args.kb, [])  # Index kompilieren und Dateicache wärmen
+    print(f"{'Variante':<20} {'Import':>9} {'1. Antwort':>11} {'RSS':>9}  schwere Module")
+    for name, preload in VARIANTS.items():
+        runs = [probe(args.kb, preload) for _ in range(args.runs)]
+        med = {k: statistics.median(r[k] for r in runs) for k in ("import_s", "first_answer_s", "rss_bytes")}
+        print(f"{name:<20} {med['import_s'] * 1000:>7.0f}ms {med['first_answer_s'] * 1000:>9.0f}ms "
+              f"{med['rss_bytes'] / 2**20:>7.1f}MB  {', '.join(runs[-1]['heavy']) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Microbenchmark: alter Scoring-Pfad vs. vorab normierte Dot-Products.
+
+Alt:  cosine_similarity(q, X) + sims.argsort() + df.iloc je Treffer
+Neu:  Q·Xᵀ auf L2-normiertem X + argpartition + flache Arrays
+
+    python -m bench.bench_topk --sizes 300 10000 100000
+"""
+import argparse
+import time
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+from bench.synth import synth_kb, synth_queries
+from hotelbot.engine import KnowledgeBase
+
+
+def legacy_find_best_answer(user_text, df, vec, X, threshold=0.30, topk=3):
+    # Stand vor der Engine (1:1 aus app.py übernommen)
+    q = vec.transform([user_text])
+    sims = cosine_similarity(q, X).flatten()
+    best_idx = int(sims.argmax())
+    best_sim = float(sims[best_idx])
+    if best_sim < threshold:
+        return None, best_sim, []
+    top_idx = sims.argsort()[::-1][:topk]
+    top = [(df.iloc[i]["id"], df.iloc[i]["question"], float(sims[i])) for i in top_idx]
+    return df.iloc[best_idx], best_sim, top
+
+
+def _per_query_us(fn, queries):
+    t0 = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - t0) / len(queries) * 1e6
+
+
+def run(sizes, n_queries):
+    print(f"{'KB-Zeilen':>10} {'alt µs/q':>12} {'neu µs/q':>12} {'Faktor':>8}")
+    for n in sizes:
+        df = synth_kb(n)
+        kb = KnowledgeBase.from_frame(df)
+        queries = synth_queries(df, n_queries)
+        # gleiche Eingaben für den alten Pfad: ungeändertes X, DataFrame-Zugriffe
+        X_raw = kb.vec.transform(df["question"].tolist())
+        old = _per_query_us(lambda q: legacy_find_best_answer(q, df, kb.vec, X_raw), queries)
+        new = _per_query_us(lambda q: kb.search([q]), queries)
+        print(f"{n:>10} {old:>12.1f} {new:>12.1f} {old / new:>7.1f}x")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", type=int, nargs="+", default=[300, 10_000, 100_000])
+    p.add_argument("--queries", type=int, default=200)
+    args = p.parse_args(argv)
+    run(args.sizes, args.queries)
+
+
+if __name__ == "__main__":
+    main()
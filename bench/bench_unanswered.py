@@ -0,0 +1,118 @@
+"""Benchmark: Clustern unbeantworteter Fragen (hotelbot.unanswered) auf großen Logs.
+
+Erzeugt ein synthetisches ``logs.csv`` mit --rows Zeilen (Anteil --unanswered
+ohne Treffer: Fragen zu --topics fehlenden Themen in Varianten plus ein Schwanz
+von Einzelfällen) und misst je Phase:
+  * Lesen       blockweises Einlesen + Zählen je normalisierter Frage,
+  * Vektoren    TF-IDF der verschiedenen Fragen,
+  * Cluster     gierige Anführer-Clusterung in Blöcken,
+  * Peak-RSS    Höchststand des Prozesses (ru_maxrss),
+  * Reinheit    Anteil der Fragen, deren Cluster-Anführer dasselbe Thema hat.
+
+    python -m bench.bench_unanswered --rows 2000000
+"""
+import argparse
+import csv
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from bench.synth import _STARTS, _SUFFIXES, _TYPOS, synth_kb
+from hotelbot import unanswered
+
+_TOPICS = ["Golfplatz", "Yogakurs", "Konzertkarten", "Museumsticket", "E-Bike Verleih",
+           "Skipass", "Ladestation Elektroauto", "Hundesitter", "Babysitter", "Wäscheservice",
+           "Tennisplatz", "Weinprobe", "Kochkurs", "Stadtführung", "Massagetermin",
+           "Flughafentransfer", "Kinderclub", "Raucherbereich", "Tischreservierung", "Geschenkgutschein"]
+
+
+def _topic_question(rng, topic):
+    q = f"{rng.choice(_STARTS)} {topic} {rng.choice(_SUFFIXES)}".strip()
+    r = rng.random()
+    if r < 0.3:
+        q = q.lower()
+    elif r < 0.5:
+        q = q.translate(_TYPOS)
+    return q + rng.choice(["?", "", " ?", "??"])
+
+
+def write_log(path, rows, unanswered_share, n_topics, seed=0):
+    """Synthetisches Log; liefert {Frage: Thema} der unbeantworteten Themenfragen."""
+    rng = random.Random(seed)
+    answered = synth_kb(2_000, seed)
+    questions, ids = answered["question"].tolist(), answered["id"].tolist()
+    topics = _TOPICS[:n_topics]
+    weights = [1 / (i + 1) for i in range(len(topics))]  # Zipf-artig: wenige Themen dominieren
+    truth = {}
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["timestamp", "user_text", "picked_id", "similarity", "session_id", "arm"])
+        for i in range(rows):
+            ts = f"2026-01-01T00:00:{i % 60:02d}"
+            if rng.random() >= unanswered_share:
+                j = rng.randrange(len(questions))
+                w.writerow([ts, questions[j], ids[j], f"{rng.uniform(0.4, 1):.4f}", f"s{i % 5000}", ""])
+            elif rng.random() < 0.9:
+                topic = rng.choices(topics, weights)[0]
+                q = _topic_question(rng, topic)
+                truth[q] = topic
+                w.writerow([ts, q, "", "0.0", f"s{i % 5000}", ""])
+            else:
+                w.writerow([ts, f"Frage {rng.randrange(10**9)} zu Zimmer {rng.randrange(999)}", "", "0.0",
+                            f"s{i % 5000}", ""])
+    return truth
+
+
+def purity(utterances, labels, leaders, truth):
+    hit = total = 0
+    for (text, n), label in zip(utterances, labels):
+        topic = truth.get(text)
+        if topic is None:
+            continue
+        total += n
+        hit += n * (truth.get(utterances[leaders[label]][0]) == topic)
+    return hit / total if total else 0.0
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--unanswered", type=float, default=0.2, help="Anteil unbeantworteter Zeilen")
+    p.add_argument("--topics", type=int, default=len(_TOPICS))
+    p.add_argument("--threshold", type=float, default=unanswered.DEFAULT_THRESHOLD)
+    p.add_argument("--max-distinct", type=int, default=unanswered.DEFAULT_MAX_DISTINCT)
+    args = p.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "logs.csv")
+        truth = write_log(path, args.rows, args.unanswered, args.topics)
+        size = os.path.getsize(path)
+        rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+        t0 = time.perf_counter()
+        utterances, stats = unanswered.collect_unanswered([path], max_distinct=args.max_distinct)
+        t1 = time.perf_counter()
+        X = unanswered.vectorize([t for t, _ in utterances])
+        t2 = time.perf_counter()
+        labels, leaders = unanswered.cluster(X, args.threshold)
+        t3 = time.perf_counter()
+        clusters = unanswered.rank_clusters(utterances, labels, leaders)
+        unanswered.write_clusters(os.path.join(tmp, "clusters.csv"), clusters, stats["unanswered"])
+        t4 = time.perf_counter()
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    print(f"Log: {args.rows} Zeilen ({size / 2**20:.0f}MB), {stats['unanswered']} unbeantwortet, "
+          f"{stats['distinct']} verschieden, {stats['pruned']} verworfen")
+    print(f"Lesen {t1 - t0:.2f}s  Vektoren {t2 - t1:.2f}s  Cluster {t3 - t2:.2f}s  "
+          f"Schreiben {t4 - t3:.2f}s  gesamt {t4 - t0:.2f}s")
+    print(f"{len(leaders)} Cluster, Top-{args.topics} decken "
+          f"{sum(c.count for c in clusters[:args.topics]) / max(stats['unanswered'], 1):.1%} ab, "
+          f"Reinheit {purity(utterances, labels, leaders, truth):.1%}")
+    print(f"Peak-RSS {peak / 2**20:.0f}MB (vor dem Lauf {rss0 / 2**20:.0f}MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
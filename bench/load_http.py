@@ -0,0 +1,84 @@
+"""Lasttest für den HTTP-Antwortdienst (lokal, ohne externe Dienste).
+
+Startet den Dienst im selben Prozess auf einem freien Port (oder nutzt --url),
+öffnet N Keep-Alive-Verbindungen und misst Requests/s sowie p50/p95/p99.
+
+    python -m bench.load_http --concurrency 1 8 64 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from hotelbot.http_service import AnswerService, serve
+from hotelbot.live import LiveKnowledgeBase
+
+
+async def _client(host, port, texts, n, lat):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n):
+            body = json.dumps({"text": random.choice(texts)}).encode("utf-8")
+            req = (f"POST /answer HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                   f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+            t0 = time.perf_counter()
+            writer.write(req)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(next(l.split(b":")[1] for l in head.split(b"\r\n")
+                              if l.lower().startswith(b"content-length")))
+            await reader.readexactly(length)
+            lat.append(time.perf_counter() - t0)
+            assert head.startswith(b"HTTP/1.1 200"), head
+    finally:
+        writer.close()
+
+
+async def run_level(host, port, texts, concurrency, total):
+    lat = []
+    per = max(1, total // concurrency)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, texts, per, lat) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    p = np.percentile(np.array(lat) * 1000, [50, 95, 99])
+    print(f"{concurrency:>5} {len(lat) / elapsed:>10.0f} {p[0]:>8.2f} {p[1]:>8.2f} {p[2]:>8.2f}")
+
+
+async def main_async(args):
+    texts = [json.loads(l).get("question") for l in open(args.queries, encoding="utf-8")] \
+        if args.queries else None
+    if not texts:
+        import pandas as pd
+        texts = pd.read_csv(args.kb)["question"].tolist()
+    server_task = None
+    host, port = "127.0.0.1", args.port
+    if not args.external:
+        ready = asyncio.get_running_loop().create_future()
+        service = AnswerService(LiveKnowledgeBase(args.kb), batch_window=args.batch_window_ms / 1000)
+        server_task = asyncio.ensure_future(serve(service, host, 0, ready=ready.set_result))
+        host, port = (await ready)[:2]
+    print(f"{'Verb.':>5} {'Req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for c in args.concurrency:
+        await run_level(host, port, texts, c, args.requests)
+    if server_task is not None:
+        server_task.cancel()
+        print(f"Micro-Batches: {service.batcher.batches} für {service.requests} Requests")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--kb", default="answers.csv")
+    p.add_argument("--queries", default=None, help="JSONL mit Feld 'question' (Standard: KB-Fragen)")
+    p.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64])
+    p.add_argument("--requests", type=int, default=2000)
+    p.add_argument("--batch-window-ms", type=float, default=5.0)
+    p.add_argument("--external", action="store_true", help="laufenden Dienst auf --port testen")
+    p.add_argument("--port", type=int, default=8502)
+    asyncio.run(main_async(p.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
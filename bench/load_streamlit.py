@@ -0,0 +1,187 @@
+"""Lasttest für die Streamlit-Apps: N gleichzeitige Sessions über ``AppTest``.
+
+Jede Session ist ein eigenes ``AppTest`` des echten Einstiegsskripts (chat.py,
+app.py, app_human.py oder minimal_app.py) in einem eigenen Thread – wie die
+Script-Threads eines Streamlit-Servers teilen sich alle Sessions einen
+Prozess, dessen ``st.cache_resource``-Objekte und das GIL. Pro Turn wird eine
+Frage eingegeben und der komplette Lauf (inkl. ``st.rerun()``) gemessen.
+
+Statt Google Sheets liefert ``hotelbot.ui._open_worksheet`` ein
+``hotelbot.fakes.FakeWorksheet`` mit einstellbarer Latenz und Fehlerquote.
+Die Skripte laufen in einem temporären Verzeichnis mit Links auf KB, Index
+und Bilder, damit ``logs.csv`` und ``logs_spill.jsonl`` nicht angefasst werden.
+
+Je Stufe:
+  * Turns/s       abgeschlossene Turns aller Sessions / Wandzeit
+  * p50/p95       Latenz je Turn (Eingabe bis fertig gerenderter Lauf)
+  * Fehler        Exceptions im Skript oder Timeouts
+  * MB/Session    RSS-Zuwachs der Stufe / Sessions (Session-State + AppTest-Baum)
+
+    python -m bench.load_streamlit --sessions 1 4 16 --turns 5 --latency 0.3 --error-rate 0.1
+    python -m bench.load_streamlit --script minimal_app.py --no-animation
+"""
+import argparse
+import atexit
+import csv
+import gc
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from bench.suite import rss_bytes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS = ("chat.py", "app.py", "app_human.py", "minimal_app.py")
+# Nicht verlinkt: Logs bleiben im temporären Verzeichnis
+_PRIVATE = ("logs", "requests.jsonl")
+_OFF_TOPIC = ["Welche Farbe hat der Himmel?", "ok", "Wie wird das Wetter morgen?",
+              "Kann ich mit Bitcoin zahlen?", "Wer hat das Hotel gebaut?"]
+
+
+def prepare_workdir(tmp):
+    for name in os.listdir(ROOT):
+        if not name.startswith(_PRIVATE):
+            os.symlink(os.path.join(ROOT, name), os.path.join(tmp, name))
+    os.chdir(tmp)
+
+
+def load_queries(kb_path="answers.csv"):
+    with open(kb_path, newline="", encoding="utf-8") as f:
+        questions = [r["question"] for r in csv.DictReader(f) if r.get("question")]
+    return questions + [q.lower().rstrip("?") for q in questions[::3]] + _OFF_TOPIC
+
+
+def share_runtime():
+    """AppTest setzt je Lauf eine globale Mock-Runtime und räumt sie danach ab.
+
+    Mit parallelen Sessions sähe ein Script-Thread dazwischen keine Runtime;
+    hier wird die zuletzt gesehene weiterverwendet.
+    """
+    from streamlit.runtime import Runtime
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+        elif not last:
+            raise RuntimeError("Runtime hasn't been created!")
+        return cls._instance or last[0]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or bool(last))
+
+
+class Session:
+    """Eine simulierte Sitzung: ein AppTest, Turns nacheinander."""
+
+    def __init__(self, script, timeout, queries, seed):
+        from streamlit.testing.v1 import AppTest
+        self.at = AppTest.from_file(os.path.abspath(script), default_timeout=timeout)
+        self.rng = random.Random(seed)
+        self.queries = queries
+        self.latencies = []
+        self.errors = 0
+
+    def _run(self, step):
+        t0 = time.perf_counter()
+        try:
+            step()
+            if self.at.exception:
+                self.errors += 1
+        except Exception:  # Timeout oder Fehler im Skript-Thread
+            self.errors += 1
+            return None
+        return time.perf_counter() - t0
+
+    def drive(self, turns, start):
+        start.wait()
+        self._run(self.at.run)  # erster Seitenaufruf, nicht als Turn gezählt
+        for _ in range(turns):
+            if not self.at.chat_input:
+                self.errors += 1
+                return
+            q = self.rng.choice(self.queries)
+            lat = self._run(lambda: self.at.chat_input[0].set_value(q).run())
+            if lat is not None:
+                self.latencies.append(lat)
+
+
+def run_level(script, n, turns, timeout, queries, seed):
+    gc.collect()
+    rss0 = rss_bytes()
+    sessions = [Session(script, timeout, queries, seed + i) for i in range(n)]
+    start = threading.Barrier(n + 1)
+    threads = [threading.Thread(target=s.drive, args=(turns, start), daemon=True) for s in sessions]
+    for t in threads:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    lat = np.array([x for s in sessions for x in s.latencies]) * 1000
+    p50, p95 = np.percentile(lat, [50, 95]) if len(lat) else (float("nan"),) * 2
+    return {"sessions": n, "turns": len(lat), "turns_per_s": len(lat) / elapsed, "p50_ms": p50,
+            "p95_ms": p95, "errors": sum(s.errors for s in sessions),
+            "mb_per_session": (rss_bytes() - rss0) / n / 2**20}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--script", choices=SCRIPTS, default="chat.py")
+    p.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16])
+    p.add_argument("--turns", type=int, default=5, help="Turns je Session")
+    p.add_argument("--latency", type=float, default=0.3, help="Sekunden je Sheets-Request")
+    p.add_argument("--error-rate", type=float, default=0.0, help="Anteil fehlschlagender Sheets-Requests")
+    p.add_argument("--error-code", type=int, default=503, help="HTTP-Status der Fehler (429 = Quota)")
+    p.add_argument("--animation", action=argparse.BooleanOptionalAction, default=True,
+                   help="Tipp-Animation wie im Betrieb (--no-animation: HOTELBOT_ANIMATION=off)")
+    p.add_argument("--timeout", type=float, default=60.0, help="Sekunden je Lauf bis zum Abbruch")
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args(argv)
+    if not args.animation:
+        os.environ["HOTELBOT_ANIMATION"] = "off"
+    # Ohne Server meldet jeder Zugriff außerhalb eines Script-Threads "missing ScriptRunContext"
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").disabled = True
+    sys.path.insert(0, ROOT)
+
+    import hotelbot.ui as ui
+    from hotelbot.fakes import FakeWorksheet
+    ws = FakeWorksheet(latency=args.latency, error_rate=args.error_rate, error_code=args.error_code,
+                       seed=args.seed, header=ui.SHEET_HEADER)
+    ui._open_worksheet = lambda: ws
+
+    share_runtime()
+
+    # Arbeitsverzeichnis bleibt bis zum Prozessende: die Log-Writer flushen per
+    # atexit in relative Pfade; das Aufräumen ist vorher registriert, läuft also danach
+    tmp = tempfile.mkdtemp(prefix="hotelbot-load-")
+    atexit.register(shutil.rmtree, tmp, ignore_errors=True)
+    prepare_workdir(tmp)
+    queries = load_queries()
+    run_level(args.script, 1, 1, args.timeout, queries, args.seed)  # Aufwärmen: KB, Caches, Worker
+    print(f"{args.script}, {args.turns} Turns/Session, Sheets {args.latency * 1000:.0f} ms, "
+          f"Fehlerquote {args.error_rate:.0%}, Animation {'an' if args.animation else 'aus'}")
+    print(f"{'Sessions':>8} {'Turns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'Fehler':>7} {'MB/Session':>11}")
+    for n in args.sessions:
+        r = run_level(args.script, n, args.turns, args.timeout, queries, args.seed + 1000 * n)
+        print(f"{n:>8} {r['turns_per_s']:>9.1f} {r['p50_ms']:>8.0f} {r['p95_ms']:>8.0f} "
+              f"{r['errors']:>7} {r['mb_per_session']:>11.2f}")
+    if args.script != "minimal_app.py":
+        sink = ui._log_sink()
+        sink.close()
+        stats = {type(s).__name__: s.stats for s in sink.sinks}
+        print(f"Sheets: {len(ws.rows) - 1} Zeilen in {ws.requests} Requests; Log-Ziele: {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
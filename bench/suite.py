@@ -0,0 +1,199 @@
+"""Retrieval-Benchmark-Suite: Skalierungskurven und Regressions-Gate.
+
+Erzeugt synthetische deutsche Hotel-KBs (bench.synth) und misst je Größe:
+  * fit_s          Kaltstart mit Refit (TfidfVectorizer.fit_transform)
+  * load_s         Kaltstart aus dem kompilierten Index (hotelbot.index_store)
+  * p50/p95/p99_ms Latenz je Einzelanfrage
+  * batch_qps      Durchsatz mit Batches à --batch-size Anfragen
+  * matrix_bytes   X und Xᵀ (CSR), vocab_bytes: Vokabular-Dict, rss_delta_bytes
+
+    python -m bench.suite --sizes 1000 10000 100000 1000000 --out bench_results.json
+    python -m bench.suite --compare bench/baseline.json --tolerance 0.25
+
+Im Compare-Modus endet das Skript mit Exit-Code 1, sobald eine Kennzahl um
+mehr als ``--tolerance`` schlechter ist als in der Baseline – und zugleich um
+mehr als ihre absolute Schwelle (``METRICS``, z.B. 1 ms Latenz, 10 ms
+Index-Laden). Sonst schlägt das Gate auf Millisekunden-Kennzahlen schon bei
+zwei Läufen hintereinander am unveränderten Stand an.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import scipy
+import sklearn
+
+from bench.synth import synth_kb, synth_queries
+from hotelbot.engine import KnowledgeBase
+from hotelbot.index_store import load_index, save_index
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Je Kennzahl: (kleiner ist besser?, kleinste absolute Änderung, die als Regression zählt)
+METRICS = {
+    "fit_s": (True, 0.05),
+    "load_s": (True, 0.01),
+    "p50_ms": (True, 1.0),
+    "p95_ms": (True, 1.0),
+    "p99_ms": (True, 1.0),
+    "batch_qps": (False, 100.0),
+    "matrix_bytes": (True, 0),
+    "vocab_bytes": (True, 0),
+}
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def csr_bytes(M) -> int:
+    return int(M.data.nbytes + M.indices.nbytes + M.indptr.nbytes)
+
+
+def vocab_bytes(vocab: dict) -> int:
+    return sys.getsizeof(vocab) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in vocab.items())
+
+
+def bench_size(n, n_queries, batch_size):
+    df = synth_kb(n)
+    queries = synth_queries(df, n_queries)
+    gc.collect()
+    rss0 = rss_bytes()
+    t0 = time.perf_counter()
+    kb = KnowledgeBase.from_frame(df)
+    fit_s = time.perf_counter() - t0
+    rss_delta = rss_bytes() - rss0
+
+    with tempfile.TemporaryDirectory() as d:
+        index_dir = os.path.join(d, "kb.index")
+        save_index(kb, index_dir, digest="bench")
+        t0 = time.perf_counter()
+        loaded = load_index(index_dir)
+        loaded.search(queries[:1])  # erster Zugriff zählt zum Kaltstart (Page-Faults)
+        load_s = time.perf_counter() - t0
+        del loaded
+
+    lat = np.empty(len(queries))
+    for i, q in enumerate(queries):
+        t0 = time.perf_counter()
+        kb.search([q])
+        lat[i] = time.perf_counter() - t0
+    p50, p95, p99 = np.percentile(lat * 1000, [50, 95, 99])
+
+    batch = (queries * (batch_size // len(queries) + 1))[:batch_size]
+    t0 = time.perf_counter()
+    kb.search(batch)
+    batch_qps = len(batch) / (time.perf_counter() - t0)
+
+    return {
+        "size": n,
+        "fit_s": round(fit_s, 4),
+        "load_s": round(load_s, 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "batch_qps": round(batch_qps, 1),
+        "matrix_bytes": csr_bytes(kb.X) + csr_bytes(kb.XT),
+        "vocab_bytes": vocab_bytes(kb.vec.vocabulary_),
+        "rss_delta_bytes": int(rss_delta),
+        "vocab_terms": len(kb.vec.vocabulary_),
+    }
+
+
+def run_suite(sizes, n_queries, batch_size, verbose=True):
+    results = []
+    for n in sizes:
+        r = bench_size(n, n_queries, batch_size)
+        results.append(r)
+        if verbose:
+            print(f"{n:>9} fit {r['fit_s']:>7.2f}s  load {r['load_s']:>6.3f}s  "
+                  f"p50 {r['p50_ms']:>7.2f}ms  p95 {r['p95_ms']:>7.2f}ms  p99 {r['p99_ms']:>7.2f}ms  "
+                  f"batch {r['batch_qps']:>9.0f} q/s  X {r['matrix_bytes'] / 2**20:>7.1f} MiB  "
+                  f"vocab {r['vocab_bytes'] / 2**20:>6.1f} MiB", file=sys.stderr)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "sklearn": sklearn.__version__,
+            "machine": platform.machine(),
+            "queries": n_queries,
+            "batch_size": batch_size,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Liste von Regressionen (size, metric, baseline, current, Änderung).
+
+    Zählt nur, was relativ über ``tolerance`` und absolut über der Schwelle
+    der Kennzahl liegt.
+    """
+    base = {r["size"]: r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        b = base.get(r["size"])
+        if b is None:
+            continue
+        for metric, (lower_is_better, min_delta) in METRICS.items():
+            old, new = b.get(metric), r.get(metric)
+            if not old or new is None:
+                continue
+            worse = (new - old) if lower_is_better else (old - new)
+            if worse > tolerance * abs(old) and worse > min_delta:
+                regressions.append((r["size"], metric, old, new, (new - old) / old))
+    return regressions
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    p.add_argument("--queries", type=int, default=500)
+    p.add_argument("--batch-size", type=int, default=1024)
+    p.add_argument("--out", default=None, help="Ergebnis-JSON (Standard: stdout)")
+    p.add_argument("--compare", default=None, help="Baseline-JSON für das Regressions-Gate")
+    p.add_argument("--tolerance", type=float, default=0.25)
+    args = p.parse_args(argv)
+
+    sizes = args.sizes
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if sizes == DEFAULT_SIZES:
+            sizes = [r["size"] for r in baseline["results"]]
+
+    current = run_suite(sizes, args.queries, args.batch_size)
+    text = json.dumps(current, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    elif not baseline:
+        print(text)
+
+    if baseline:
+        regressions = compare(current, baseline, args.tolerance)
+        for size, metric, old, new, change in regressions:
+            print(f"REGRESSION {size:>9} {metric:<13} {old:>12} -> {new:>12} ({change:+.0%})", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"Keine Regression über {args.tolerance:.0%} gegenüber {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Synthetische deutsche Hotel-FAQs und Anfragen für Benchmarks."""
+import random
+
+import pandas as pd
+
+_STARTS = ["Wie kann ich", "Wann kann ich", "Wo kann ich", "Darf ich", "Gibt es",
+           "Kann ich", "Ab wann kann ich", "Bis wann muss ich", "Wie viel kostet",
+           "Ist es möglich", "Wo finde ich", "Haben Sie"]
+_OBJECTS = ["einchecken", "auschecken", "das Frühstück", "den Pool", "die Sauna",
+            "das WLAN", "einen Parkplatz", "den Fitnessraum", "ein Handtuch",
+            "den Zimmerservice", "ein Taxi", "die Minibar", "einen Föhn",
+            "ein Kinderbett", "den Shuttle", "die Rezeption", "ein Bügeleisen",
+            "den Safe", "ein Haustier", "die Bar", "das Restaurant", "den Spa"]
+_SUFFIXES = ["", "heute", "morgen früh", "am Wochenende", "im Zimmer", "am Abend",
+             "nach 22 Uhr", "mit Kindern", "kostenlos", "im Erdgeschoss"]
+_PROPERTIES = ["Bellevue", "Seeblick", "Alpenhof", "Stadtpalais", "Parkhotel",
+               "Residenz", "Bergblick", "Hafenhaus"]
+_TYPOS = str.maketrans({"ü": "ue", "ö": "oe", "ä": "ae"})
+
+
+def synth_question(rng: random.Random, uid: int) -> str:
+    parts = [rng.choice(_STARTS), rng.choice(_OBJECTS), rng.choice(_SUFFIXES)]
+    # Hotel-/Standortbezug macht Fragen größerer KBs unterscheidbar
+    parts.append(f"im {rng.choice(_PROPERTIES)} {uid % 997}")
+    return " ".join(p for p in parts if p) + "?"
+
+
+def synth_kb(n: int, seed: int = 0) -> pd.DataFrame:
+    """KB mit n Zeilen im Format von answers.csv (id, question, answer)."""
+    rng = random.Random(seed)
+    qs = [synth_question(rng, i) for i in range(n)]
+    return pd.DataFrame({
+        "id": [f"S{i}" for i in range(n)],
+        "question": qs,
+        "answer": [f"Antwort {i}: Bitte wenden Sie sich an die Rezeption." for i in range(n)],
+    })
+
+
+def synth_queries(kb: pd.DataFrame, n: int, seed: int = 1) -> list:
+    """Anfragen: teils Paraphrasen bestehender Fragen, teils unbekannte Themen."""
+    rng = random.Random(seed)
+    questions = kb["question"].tolist()
+    out = []
+    for _ in range(n):
+        r = rng.random()
+        q = rng.choice(questions)
+        if r < 0.5:
+            out.append(q.lower().rstrip("?"))
+        elif r < 0.8:
+            words = q.split()
+            rng.shuffle(words)
+            out.append(" ".join(words[: max(2, len(words) - 2)]).translate(_TYPOS))
+        else:
+            out.append(f"{rng.choice(_STARTS)} {rng.choice(['Golf', 'Yoga', 'Konzert', 'Museum'])}?")
+    return out
@@ -0,0 +1,6 @@
+from hotelbot.ui import run_app
+
+# Ein Server für beide Personas: jede Session bekommt deterministisch einen Arm
+# (Chatino oder Sarah), der mit jedem Log-Event geschrieben wird.
+# Für Tests lässt sich die Persona per ?persona=ai bzw. ?persona=human festlegen.
+run_app()
@@ -0,0 +1,5 @@
+"""Gemeinsamer Kern des Hotel-Chatbots (Retrieval, Logging, Tools)."""
+from .answer_cache import AnswerCache, normalize_query
+from .engine import Answer, KnowledgeBase, find_best_answer, load_kb
+
+__all__ = ["Answer", "AnswerCache", "KnowledgeBase", "find_best_answer", "load_kb", "normalize_query"]
@@ -0,0 +1,83 @@
+"""Anfrage-Vektorisierung ohne scikit-learn (nur NumPy/SciPy).
+
+Zum Beantworten braucht ein Worker vom gefitteten ``TfidfVectorizer`` nur
+Vokabular und IDF aus dem kompilierten Index; ``VocabVectorizer`` bildet dessen
+``transform`` nach:
+
+* Tokenisierung wie sklearn: ``str.lower()``, ``(?u)\\b\\w\\w+\\b``, Wort-n-Gramme
+  mit Leerzeichen verbunden (erst alle 1-Gramme, dann 2-Gramme, ...),
+* Rohzählung je Term, mal IDF, L2-Normierung zeilenweise in Spaltenreihenfolge.
+
+Das Vokabular ist ein Dict oder der gemappte ``SortedStringIndex`` aus dem
+Index; dann werden alle Terme eines Batches in einem Durchgang nachgeschlagen
+(``term_columns``).
+
+Die Ergebnisse sind bitgleich mit sklearn (gleiche Summationsreihenfolge bei
+der Norm), damit Scores gegen den Index exakt dieselben bleiben.
+"""
+import math
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def word_ngrams(text, ngram_range=(1, 2), lowercase=True):
+    """Terme eines Textes in der Reihenfolge von sklearns ``build_analyzer()``."""
+    if lowercase:
+        text = text.lower()
+    tokens = TOKEN_PATTERN.findall(text)
+    min_n, max_n = ngram_range
+    if max_n == 1:
+        return tokens
+    terms = list(tokens) if min_n == 1 else []
+    for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+        terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return terms
+
+
+def term_columns(vocabulary, terms) -> dict:
+    """Spalte je bekanntem Term; mit ``lookup`` (SortedStringIndex) alle auf einmal."""
+    terms = list(terms)
+    if hasattr(vocabulary, "lookup"):
+        return {t: int(c) for t, c in zip(terms, vocabulary.lookup(terms)) if c >= 0}
+    return {t: vocabulary[t] for t in terms if t in vocabulary}
+
+
+class VocabVectorizer:
+    """TF-IDF-Transform mit festem Vokabular (aus dem Index geladen)."""
+
+    def __init__(self, vocabulary: dict, idf, ngram_range=(1, 2), lowercase=True):
+        self.vocabulary_ = vocabulary
+        self.idf_ = np.asarray(idf, dtype=np.float64)
+        self.ngram_range = tuple(ngram_range)
+        self.lowercase = lowercase
+
+    def build_analyzer(self):
+        return lambda text: word_ngrams(text, self.ngram_range, self.lowercase)
+
+    def transform(self, texts):
+        indptr, indices, data = [0], [], []
+        docs = [word_ngrams(text, self.ngram_range, self.lowercase) for text in texts]
+        columns = term_columns(self.vocabulary_, {term for terms in docs for term in terms})
+        for terms in docs:
+            counts = {}
+            for term in terms:
+                col = columns.get(term)
+                if col is not None:
+                    counts[col] = counts.get(col, 0) + 1
+            cols = sorted(counts)
+            weights = [counts[c] * self.idf_[c] for c in cols]
+            sq = 0.0
+            for w in weights:
+                sq += w * w
+            norm = math.sqrt(sq)
+            if norm:
+                weights = [w / norm for w in weights]
+            indices.extend(cols)
+            data.extend(weights)
+            indptr.append(len(indices))
+        return sp.csr_matrix((np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32),
+                              np.asarray(indptr, dtype=np.int32)), shape=(len(indptr) - 1, len(self.vocabulary_)))
@@ -0,0 +1,88 @@
+"""Prozessweiter LRU-Cache für Antworten, Schlüssel = normalisierte Anfrage.
+
+Gäste stellen dieselben Fragen immer wieder ("Wie melde ich mich an?"); ein
+Treffer spart Vektorisierung und Scoring komplett. Normalisiert wird nur, was
+der Analyzer ohnehin ignoriert: Groß-/Kleinschreibung (``str.lower`` wie
+sklearn), Whitespace und Satzzeichen – "Frühstück?" und "frühstück" teilen
+sich einen Eintrag, "fruehstueck" nicht. Bewertet wird genau der normalisierte
+Text, damit das Ergebnis eines Eintrags nicht davon abhängt, welche
+Schreibweise ihn zuerst gefüllt hat (auch im Zeichen-n-Gramm-Modus).
+
+Zum Schlüssel gehören die Quelle des Snapshots (Mandant bzw. CSV,
+``kb.source``) und seine fortlaufende ``generation`` – nie ``id(kb)``, das nach
+dem Entladen einer KB für ein anderes Hotel wiederverwendet werden kann. Ein
+Index-Tausch oder das Entladen eines Mandanten (``TenantRegistry.on_unload``)
+verwirft nur die Einträge dieser Quelle. Trägt eine noch laufende Anfrage
+danach ein Ergebnis zum alten Stand ein, passt dessen ``generation`` zu
+keinem Snapshot mehr; der Eintrag wird nie getroffen und fällt per LRU heraus.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+from . import metrics
+
+_WORDS = re.compile(r"\w+")
+
+
+def normalize_query(text: str) -> str:
+    # Wortfolgen wie im Analyzer (hotelbot.analyzer.word_ngrams): gleiche Terme
+    return " ".join(_WORDS.findall(str(text).lower()))
+
+
+class AnswerCache:
+    def __init__(self, maxsize=2048):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def bind(self, live_kb):
+        """Verwirft Einträge einer Quelle bei deren Index-Tausch bzw. Entladen.
+
+        ``live_kb``: ``LiveKnowledgeBase`` oder ``TenantRegistry``.
+        """
+        live_kb.subscribe(lambda kb: self.drop(kb.source))
+        if hasattr(live_kb, "on_unload"):
+            live_kb.on_unload(self.drop)
+        return self
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def drop(self, source):
+        """Alle Einträge einer Quelle (Mandant bzw. CSV) entfernen."""
+        with self._lock:
+            for key in [k for k in self._data if k[0] == source]:
+                del self._data[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+    def search(self, kb, text, threshold=0.30, topk=3):
+        """Wie ``kb.search([normalize_query(text)])[0]``, aber mit Cache davor."""
+        query = normalize_query(text)
+        key = (kb.source, kb.generation, query, threshold, topk)
+        with self._lock:
+            res = self._data.get(key)
+            if res is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                metrics.inc("hotelbot_cache_hits_total")
+                return res
+            self.misses += 1
+        metrics.inc("hotelbot_cache_misses_total")
+        res = kb.search([query], threshold=threshold, topk=topk)[0]
+        with self._lock:
+            self._data[key] = res
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+                metrics.inc("hotelbot_cache_evictions_total")
+        return res
@@ -0,0 +1,91 @@
+"""Bilder einmalig auf Anzeigegröße bringen und als statische Dateien ausliefern.
+
+Bisher wurden ``bed.jpg`` und das Seitenlogo (``Mitarbeiter.jpg``: 1,3 MB) bei
+jedem Rerun base64-kodiert und ins HTML eingebettet. Jetzt entsteht pro Bild
+genau einmal ein verkleinertes, neu komprimiertes Thumbnail in ``static/``.
+Der Dateiname enthält einen Hash aus Quelle und Parametern, die URL ändert sich
+also nur, wenn sich das Bild ändert. Streamlit liefert ``static/`` mit
+ETag/Last-Modified aus (``server.enableStaticServing``), der Browser lädt es
+also nur einmal.
+
+Ohne Static Serving fällt ``image_src`` auf eine Data-URI des *Thumbnails*
+zurück, das ist immer noch ein Bruchteil der Originalgröße.
+"""
+import base64
+import hashlib
+import os
+import threading
+
+ASSET_DIR = "static"
+STATIC_URL_PREFIX = "app/static/"
+
+# Anzeigegrößen (Breite, Höhe) inkl. Reserve für HiDPI-Displays
+HEADER_SIZE = (1280, 360)
+SIDEBOX_LOGO_SIZE = (320, 320)
+AVATAR_SIZE = (96, 96)
+
+_MIME = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png", ".webp": "image/webp"}
+_lock = threading.Lock()
+_built = {}
+
+
+def thumbnail(src, max_size, quality=80, out_dir=ASSET_DIR):
+    """Pfad zum Thumbnail von ``src`` (wird bei Bedarf erzeugt); None, wenn src fehlt."""
+    key = (os.path.abspath(src), tuple(max_size), quality, os.path.abspath(out_dir))
+    with _lock:
+        if key in _built:
+            return _built[key]
+        try:
+            with open(src, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        stem, ext = os.path.splitext(os.path.basename(src))
+        ext = ext.lower() if ext.lower() in (".jpg", ".jpeg") else ".png"
+        digest = hashlib.sha1(raw + repr((tuple(max_size), quality)).encode()).hexdigest()[:10]
+        out = os.path.join(out_dir, f"{stem}.{digest}{ext}")
+        if not os.path.exists(out):
+            _write_thumbnail(src, out, max_size, quality)
+        _built[key] = out
+        return out
+
+
+def _write_thumbnail(src, out, max_size, quality):
+    from PIL import Image
+
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    tmp = f"{out}.{os.getpid()}.tmp"
+    with Image.open(src) as im:
+        im.thumbnail(max_size, Image.LANCZOS)
+        if out.lower().endswith((".jpg", ".jpeg")):
+            im.convert("RGB").save(tmp, "JPEG", quality=quality, optimize=True, progressive=True)
+        else:
+            im.save(tmp, "PNG", optimize=True)
+    os.replace(tmp, out)
+
+
+def static_url(path) -> str:
+    return STATIC_URL_PREFIX + os.path.basename(path)
+
+
+def data_uri(path) -> str:
+    mime = _MIME.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+    with open(path, "rb") as f:
+        return f"data:{mime};base64," + base64.b64encode(f.read()).decode("ascii")
+
+
+def image_src(src, max_size, static_serving=True, quality=80) -> str:
+    """``src``-Attribut für <img>: Static-URL, sonst Data-URI; "" wenn das Bild fehlt."""
+    try:
+        path = thumbnail(src, max_size, quality=quality)
+    except (OSError, ImportError):
+        # kein Pillow oder static/ nicht beschreibbar: Original wie bisher einbetten
+        return data_uri(src) if os.path.exists(src) else ""
+    if path is None:
+        return ""
+    return static_url(path) if static_serving else data_uri(path)
+
+
+def build_all(sources):
+    """Erzeugt alle Thumbnails vorab (z.B. im Deployment); sources = [(pfad, größe)]."""
+    return [thumbnail(src, size) for src, size in sources]
@@ -0,0 +1,127 @@
+"""Schwellenwert-Kalibrierung: historische Anfragen gegen die aktuelle KB abspielen.
+
+Die Apps nutzen unterschiedliche, geschätzte Cutoffs (``app.py`` 0.30,
+``minimal_app.py`` 0.20/0.25). Dieses Werkzeug liest alle ``user_text`` aus
+dem Log (blockweise, wie hotelbot.unanswered), bewertet jede *verschiedene*
+Anfrage einmal gegen die KB und rechnet daraus für viele Schwellen auf einmal:
+
+* ``answer_rate``   Anteil der Log-Zeilen mit Treffer (bester Score >= Schwelle),
+* ``fallback_rate`` der Rest,
+* mit gelabelter Teilmenge (CSV ``user_text,expected_id``; leere ``expected_id``
+  = sollte keinen Treffer geben) zusätzlich ``precision`` (richtige Treffer /
+  Treffer) und ``recall`` (richtige Treffer / Fragen mit ``expected_id``).
+
+Bewertet wird einmal je Anfrage: ``KnowledgeBase.score`` in Blöcken von
+höchstens ``MAX_DENSE_CELLS`` Zellen, davon nur der beste Treffer (``argmax``,
+dieselbe Wahl wie ``search``). Die Schwellen-Auswertung ist danach nur
+Sortieren + ``searchsorted`` über die besten Scores, unabhängig von der Zahl
+der Schwellen.
+
+    python -m hotelbot calibrate logs.csv --kb answers.csv --labels labeled.csv -o sweep.csv
+"""
+import csv
+import sys
+
+import numpy as np
+
+from .engine import MAX_DENSE_CELLS
+from .unanswered import DEFAULT_CHUNK_ROWS, iter_log_chunks
+
+DEFAULT_THRESHOLDS = np.round(np.arange(0.05, 0.951, 0.01), 2)
+
+SWEEP_FIELDS = ["threshold", "answer_rate", "fallback_rate", "precision", "recall"]
+
+
+def read_log_counts(paths, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Verschiedene ``user_text`` mit ihrer Häufigkeit; liefert (Texte, Anzahlen)."""
+    counts = {}
+    for chunk in iter_log_chunks(paths, chunk_rows):
+        for row in chunk:
+            text = row.get("user_text") or ""
+            counts[text] = counts.get(text, 0) + 1
+    return list(counts), np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+
+
+def read_labels(path):
+    """Gelabelte Anfragen: (Texte, erwartete IDs; "" = sollte Fallback sein)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = [r for r in csv.DictReader(f) if r.get("user_text")]
+    return [r["user_text"] for r in rows], [(r.get("expected_id") or "").strip() for r in rows]
+
+
+def best_matches(kb, texts):
+    """Bester Treffer je Anfrage: (Zeile in der KB, Score); Gleichstände zur kleineren Zeile."""
+    texts = list(texts)
+    rows = np.zeros(len(texts), dtype=np.int64)
+    sims = np.zeros(len(texts), dtype=np.float64)
+    chunk = max(1, MAX_DENSE_CELLS // max(len(kb), 1))
+    for start in range(0, len(texts), chunk):
+        scores = kb.score(texts[start:start + chunk])
+        best = scores.argmax(axis=1)
+        rows[start:start + len(best)] = best
+        sims[start:start + len(best)] = scores[np.arange(len(best)), best]
+    return rows, sims
+
+
+def _at_least(values, weights, thresholds):
+    """Summe der Gewichte mit Wert >= Schwelle, für alle Schwellen auf einmal."""
+    order = np.argsort(values)
+    tail = np.concatenate([np.cumsum(weights[order][::-1])[::-1], [0]])
+    return tail[np.searchsorted(values[order], thresholds, side="left")]
+
+
+def sweep(sims, weights, thresholds=DEFAULT_THRESHOLDS, label_sims=None, correct=None, in_scope=None):
+    """Kennzahlen je Schwelle als Liste von Dicts (Felder ``SWEEP_FIELDS``).
+
+    ``label_sims``/``correct``/``in_scope``: bester Score, "bester Treffer ist
+    die erwartete ID" und "hat eine erwartete ID" je gelabelter Anfrage.
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    total = max(int(weights.sum()), 1)
+    answered = _at_least(sims, weights, thresholds) / total
+    precision = recall = [None] * len(thresholds)
+    if label_sims is not None and len(label_sims):
+        ones = np.ones(len(label_sims), dtype=np.int64)
+        hits = _at_least(label_sims, ones, thresholds)
+        right = _at_least(label_sims[correct], ones[correct], thresholds)
+        precision = np.where(hits > 0, right / np.maximum(hits, 1), np.nan)
+        recall = right / max(int(in_scope.sum()), 1)
+    return [{"threshold": float(t), "answer_rate": float(a), "fallback_rate": float(1 - a),
+             "precision": None if p is None or np.isnan(p) else float(p),
+             "recall": None if r is None else float(r)}
+            for t, a, p, r in zip(thresholds, answered, precision, recall)]
+
+
+def suggest(rows, min_precision):
+    """Kleinste Schwelle mit Precision >= ``min_precision`` (höchste Antwortquote)."""
+    ok = [r for r in rows if r["precision"] is not None and r["precision"] >= min_precision]
+    return min(ok, key=lambda r: r["threshold"]) if ok else None
+
+
+def replay(kb, log_paths, labels_path=None, thresholds=DEFAULT_THRESHOLDS, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Log (und Labels) gegen die KB abspielen; liefert (Sweep-Zeilen, stats)."""
+    texts, weights = read_log_counts(log_paths, chunk_rows)
+    label_texts, expected = read_labels(labels_path) if labels_path else ([], [])
+    rows, sims = best_matches(kb, texts + label_texts)
+    stats = {"rows": int(weights.sum()), "distinct": len(texts), "labeled": len(label_texts)}
+    kwargs = {}
+    if label_texts:
+        picked = kb.ids[rows[len(texts):]].astype(str)
+        expected = np.asarray(expected, dtype=object)
+        kwargs = {"label_sims": sims[len(texts):], "correct": np.asarray(picked == expected, dtype=bool),
+                  "in_scope": np.asarray(expected != "", dtype=bool)}
+    return sweep(sims[:len(texts)], weights, thresholds, **kwargs), stats
+
+
+def write_sweep(path, rows):
+    """Sweep als CSV nach ``path`` ('-' = stdout)."""
+    out = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+    try:
+        w = csv.DictWriter(out, fieldnames=SWEEP_FIELDS, lineterminator="\n")
+        w.writeheader()
+        for r in rows:
+            w.writerow({k: "" if v is None else (f"{v:.2f}" if k == "threshold" else f"{v:.4f}")
+                        for k, v in r.items()})
+    finally:
+        if out is not sys.stdout:
+            out.close()
@@ -0,0 +1,213 @@
+"""Kommandozeile für Betrieb und Wartung ohne UI.
+
+Beispiele:
+    python -m hotelbot answer requests.jsonl -o answers.jsonl --kb answers.csv
+    python -m hotelbot serve --port 8502
+    python -m hotelbot calibrate logs.csv --kb answers.csv --labels labeled.csv
+    python -m hotelbot unanswered logs.csv -o unanswered_clusters.csv --kb answers.csv
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from .engine import SCORING_MODES, VECTORIZERS, load_kb
+
+# Felder, in denen der Anfragetext stehen darf (erstes nicht-leeres gewinnt)
+TEXT_FIELDS = ("user_text", "text", "query", "question", "body")
+
+
+def _query_text(rec: dict) -> str:
+    for key in TEXT_FIELDS:
+        if rec.get(key):
+            return str(rec[key])
+    return ""
+
+
+def _read_jsonl(fh):
+    for line in fh:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def answer_stream(kb, records, out, threshold=0.30, topk=3, batch_size=1024):
+    """Liest Datensätze blockweise, beantwortet jeden Block in einem Batch."""
+    n = 0
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return n
+        results = kb.search([_query_text(r) for r in batch], threshold=threshold, topk=topk)
+        for rec, res in zip(batch, results):
+            row = {"request_id": rec.get("request_id", rec.get("id")), "user_text": _query_text(rec)}
+            row.update(res.to_dict())
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        n += len(batch)
+
+
+def cmd_answer(args):
+    kb = load_kb(args.kb, scoring=args.scoring, vectorizer=args.vectorizer)
+    fin = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    fout = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        n = answer_stream(kb, _read_jsonl(fin), fout, threshold=args.threshold,
+                          topk=args.topk, batch_size=args.batch_size)
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if fout is not sys.stdout:
+            fout.close()
+    print(f"{n} Anfragen beantwortet", file=sys.stderr)
+    return 0
+
+
+def cmd_compile(args):
+    from .index_store import build_index, default_index_dir
+    t0 = time.perf_counter()
+    kb = build_index(args.kb, index_dir=args.index_dir, scoring=args.scoring, vectorizer=args.vectorizer,
+                     neighbors=args.neighbors)
+    target = args.index_dir or default_index_dir(args.kb, args.vectorizer)
+    print(f"Index mit {len(kb)} Fragen nach {target} geschrieben "
+          f"({time.perf_counter() - t0:.2f}s)", file=sys.stderr)
+    return 0
+
+
+def cmd_assets(args):
+    from . import assets
+    sources = [("bed.jpg", assets.HEADER_SIZE)]
+    sources += [(p, assets.SIDEBOX_LOGO_SIZE) for p in ("AI-Chatbot.png", "Mitarbeiter.jpg")]
+    sources += [(p, assets.AVATAR_SIZE) for p in ("AI-Icon.png", "Human-Icon.png", "User-Icon.png")]
+    for (src, _), out in zip(sources, assets.build_all(sources)):
+        if out:
+            print(f"{src} ({os.path.getsize(src)} B) -> {out} ({os.path.getsize(out)} B)", file=sys.stderr)
+    return 0
+
+
+def cmd_serve(args):
+    import logging
+    from .http_service import run
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    run(args.kb, host=args.host, port=args.port, log_path=args.log or None,
+        batch_window=args.batch_window_ms / 1000, threshold=args.threshold, scoring=args.scoring,
+        tenants=args.tenants, vectorizer=args.vectorizer)
+    return 0
+
+
+def cmd_unanswered(args):
+    from . import unanswered
+    t0 = time.perf_counter()
+    kb = load_kb(args.kb) if args.kb else None
+    stats = unanswered.run(args.logs, args.output, kb=kb, low_similarity=args.low_similarity,
+                           threshold=args.threshold, chunk_rows=args.chunk_rows,
+                           max_distinct=args.max_distinct, examples=args.examples, top=args.top)
+    print(f"{stats['rows']} Log-Zeilen, {stats['unanswered']} unbeantwortet "
+          f"({stats['distinct']} verschieden, {stats['pruned']} Einzelfälle verworfen) -> "
+          f"{stats['clusters']} Cluster nach {args.output} ({time.perf_counter() - t0:.2f}s)", file=sys.stderr)
+    return 0
+
+
+def cmd_calibrate(args):
+    import numpy as np
+    from . import calibration
+    t0 = time.perf_counter()
+    kb = load_kb(args.kb, scoring=args.scoring, vectorizer=args.vectorizer)
+    start, stop, step = args.thresholds
+    thresholds = np.round(np.arange(start, stop + step / 2, step), 4)
+    rows, stats = calibration.replay(kb, args.logs, labels_path=args.labels, thresholds=thresholds)
+    calibration.write_sweep(args.output, rows)
+    print(f"{stats['rows']} Log-Zeilen ({stats['distinct']} verschieden, {stats['labeled']} gelabelt) "
+          f"gegen {len(kb)} Fragen, {len(rows)} Schwellen ({time.perf_counter() - t0:.2f}s)", file=sys.stderr)
+    if args.labels:
+        best = calibration.suggest(rows, args.min_precision)
+        if best is None:
+            print(f"Keine Schwelle erreicht Precision >= {args.min_precision}", file=sys.stderr)
+        else:
+            print(f"Vorschlag: threshold={best['threshold']:.2f} (Precision {best['precision']:.3f}, "
+                  f"Antwortquote {best['answer_rate']:.3f})", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="hotelbot", description="Hotel-Chatbot Werkzeuge")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    a = sub.add_parser("answer", help="JSONL-Anfragen im Batch beantworten")
+    a.add_argument("input", help="JSONL-Datei mit Anfragen ('-' = stdin)")
+    a.add_argument("-o", "--output", default="-", help="Ziel-JSONL ('-' = stdout)")
+    a.add_argument("--kb", default="answers.csv", help="Pfad zur FAQ-CSV")
+    a.add_argument("--scoring", choices=SCORING_MODES, default="dot",
+                   help="hybrid = zusätzlich LSA-Vektoren (hotelbot.semantic)")
+    a.add_argument("--vectorizer", choices=VECTORIZERS, default="tfidf",
+                   help="hashing = feste gehashte Spalten, Anhängen ohne Refit (hotelbot.hashing)")
+    a.add_argument("--threshold", type=float, default=0.30)
+    a.add_argument("--topk", type=int, default=3)
+    a.add_argument("--batch-size", type=int, default=1024)
+    a.set_defaults(func=cmd_answer)
+
+    c = sub.add_parser("compile", help="Kompilierten KB-Index neu bauen")
+    c.add_argument("--kb", default="answers.csv", help="Pfad zur FAQ-CSV")
+    c.add_argument("--scoring", choices=SCORING_MODES, default="dot",
+                   help="hybrid = zusätzlich LSA-Vektoren (hotelbot.semantic)")
+    c.add_argument("--vectorizer", choices=VECTORIZERS, default="tfidf",
+                   help="hashing = feste gehashte Spalten, Anhängen ohne Refit (hotelbot.hashing)")
+    c.add_argument("--index-dir", default=None, help="Zielverzeichnis (Standard: neben der CSV)")
+    c.add_argument("--neighbors", action=argparse.BooleanOptionalAction, default=None,
+                   help="Graph ähnlicher Fragen bauen (Standard: nur für kleine KBs)")
+    c.set_defaults(func=cmd_compile)
+
+    s = sub.add_parser("assets", help="Bild-Thumbnails für static/ vorab erzeugen")
+    s.set_defaults(func=cmd_assets)
+
+    h = sub.add_parser("serve", help="HTTP/JSON-Antwortdienst starten")
+    h.add_argument("--kb", default="answers.csv", help="Pfad zur FAQ-CSV")
+    h.add_argument("--scoring", choices=SCORING_MODES, default="dot",
+                   help="hybrid = zusätzlich LSA-Vektoren (hotelbot.semantic)")
+    h.add_argument("--vectorizer", choices=VECTORIZERS, default="tfidf",
+                   help="hashing = feste gehashte Spalten, Anhängen ohne Refit (hotelbot.hashing)")
+    h.add_argument("--host", default="127.0.0.1")
+    h.add_argument("--port", type=int, default=8502)
+    h.add_argument("--log", default=os.environ.get("HOTELBOT_LOG_SINKS", "logs.csv"),
+                   help="Log-Ziele, z.B. logs.csv oder csv,sqlite:logs.db ('' = aus)")
+    h.add_argument("--threshold", type=float, default=0.30)
+    h.add_argument("--batch-window-ms", type=float, default=5.0)
+    h.add_argument("--tenants", default=os.environ.get("HOTELBOT_TENANTS"),
+                   help="Mandanten-Konfiguration (JSON, siehe hotelbot.tenants)")
+    h.set_defaults(func=cmd_serve)
+
+    k = sub.add_parser("calibrate", help="Schwellenwerte am Log durchspielen")
+    k.add_argument("logs", nargs="*", default=["logs.csv"], help="Log-CSV(s), auch rotierte")
+    k.add_argument("-o", "--output", default="-", help="Ziel-CSV je Schwelle ('-' = stdout)")
+    k.add_argument("--kb", default="answers.csv", help="Pfad zur FAQ-CSV")
+    k.add_argument("--scoring", choices=SCORING_MODES, default="dot",
+                   help="hybrid = zusätzlich LSA-Vektoren (hotelbot.semantic)")
+    k.add_argument("--vectorizer", choices=VECTORIZERS, default="tfidf",
+                   help="hashing = feste gehashte Spalten, Anhängen ohne Refit (hotelbot.hashing)")
+    k.add_argument("--labels", default=None, help="CSV user_text,expected_id für Precision/Recall")
+    k.add_argument("--thresholds", type=float, nargs=3, default=[0.05, 0.95, 0.01],
+                   metavar=("START", "STOP", "STEP"))
+    k.add_argument("--min-precision", type=float, default=0.9, help="Ziel für den Schwellen-Vorschlag")
+    k.set_defaults(func=cmd_calibrate)
+
+    u = sub.add_parser("unanswered", help="Unbeantwortete Fragen aus dem Log clustern")
+    u.add_argument("logs", nargs="*", default=["logs.csv"], help="Log-CSV(s), auch rotierte")
+    u.add_argument("-o", "--output", default="unanswered_clusters.csv", help="Ziel-CSV")
+    u.add_argument("--kb", default=None, help="FAQ-CSV für die nächstgelegene KB-Frage je Cluster")
+    u.add_argument("--low-similarity", type=float, default=0.35,
+                   help="Zeilen mit Score darunter zählen als unbeantwortet")
+    u.add_argument("--threshold", type=float, default=0.5, help="Mindest-Kosinus zum Cluster-Anführer")
+    u.add_argument("--chunk-rows", type=int, default=100_000)
+    u.add_argument("--max-distinct", type=int, default=500_000,
+                   help="Obergrenze verschiedener Fragen im Speicher")
+    u.add_argument("--examples", type=int, default=5)
+    u.add_argument("--top", type=int, default=None, help="nur die größten N Cluster schreiben")
+    u.set_defaults(func=cmd_unanswered)
+    return p
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
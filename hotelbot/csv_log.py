@@ -0,0 +1,310 @@
+"""Gepufferter, prozesssicherer CSV-Log-Writer (Ersatz für DataFrame.to_csv je Event).
+
+Zeilen landen zuerst in einem Puffer im Speicher und werden gesammelt
+geschrieben: sobald ``buffer_size`` erreicht ist, spätestens aber alle
+``flush_interval`` Sekunden (Hintergrund-Thread) und beim Beenden.
+
+Jeder Flush hält eine exklusive Dateisperre (``fcntl.flock``), damit mehrere
+Streamlit-Worker keine Zeilen verschränken oder den Header doppelt schreiben.
+Unter der Sperre wird auch rotiert:
+  * ``max_bytes``: Datei ist zu groß,
+  * ``rotate_interval``: letzter Schreibzugriff lag in einer früheren Periode
+    (z.B. 86400 = täglich),
+  * abweichender Header: die Datei stammt von einem älteren Schema.
+Rotierte Dateien heißen ``logs.<zeitstempel>.csv``; ``backup_count`` begrenzt
+ihre Anzahl.
+
+Ist die Datei nicht schreibbar (Platte voll, schreibgeschützt), gilt die
+Fehlerpolitik von ``PendingRows``: begrenzt viele Zeilen warten auf den
+nächsten Versuch, der nur noch aus dem Hintergrund-Thread kommt.
+"""
+import atexit
+import csv
+import glob
+import io
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: ohne Sperre, nur ein Prozess empfohlen
+    fcntl = None
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+LOG_FIELDS = ["timestamp", "user_text", "picked_id", "similarity", "session_id", "arm"]
+
+# Bytes je Rückwärts-Leseschritt in session_rows
+TAIL_BLOCK = 1 << 16
+_ROW_BREAKS = re.compile(rb'["\n]')
+
+# Höchstens so viele Zeilen warten, solange ein Ziel nicht schreibbar ist
+MAX_PENDING_ROWS = 10_000
+# Sekunden bis zum ersten Wiederholversuch, verdoppelt je Fehlschlag
+RETRY_BACKOFF = 1.0
+MAX_RETRY_BACKOFF = 60.0
+
+
+class PendingRows:
+    """Puffer eines Log-Ziels mit gemeinsamer Fehlerpolitik (CSV, SQLite).
+
+    Solange Schreiben klappt, meldet ``add`` einen vollen Puffer und der
+    Aufrufer flusht sofort. Nach einem Fehler (``failed``) kommen die Zeilen
+    zurück, aber höchstens ``max_rows``: die ältesten fallen weg und zählen in
+    ``hotelbot_logging_failures_total{reason="dropped"}``. Bis zum nächsten
+    Erfolg flusht ``write()`` nicht mehr selbst (der Chat-Turn bleibt billig),
+    ``take`` gibt Zeilen erst nach exponentiellem Backoff wieder heraus;
+    ``take(force=True)`` beim Beenden ignoriert ihn.
+    """
+
+    def __init__(self, sink, buffer_size, max_rows=MAX_PENDING_ROWS, backoff=RETRY_BACKOFF,
+                 max_backoff=MAX_RETRY_BACKOFF):
+        self.sink = sink
+        self.buffer_size = buffer_size
+        self.max_rows = max(max_rows, buffer_size)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.dropped = 0
+        self._rows = []
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._retry_at = 0.0
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def failing(self) -> bool:
+        return self._failures > 0
+
+    def add(self, row) -> bool:
+        """Zeile puffern; True = jetzt flushen."""
+        with self._lock:
+            self._rows.append(row)
+            self._trim()
+            return not self._failures and len(self._rows) >= self.buffer_size
+
+    def take(self, force=False) -> list:
+        with self._lock:
+            if self._failures and not force and time.monotonic() < self._retry_at:
+                return []
+            rows, self._rows = self._rows, []
+            return rows
+
+    def succeeded(self):
+        with self._lock:
+            self._failures = 0
+            self._retry_at = 0.0
+
+    def failed(self, rows, error):
+        """Zeilen vor die inzwischen gepufferten zurücklegen, Backoff verlängern."""
+        with self._lock:
+            self._rows[:0] = rows
+            self._failures += 1
+            delay = min(self.backoff * 2 ** (self._failures - 1), self.max_backoff)
+            self._retry_at = time.monotonic() + delay
+            self._trim()
+            pending = len(self._rows)
+        metrics.inc("hotelbot_logging_failures_total", sink=self.sink)
+        logger.warning("%s-Log nicht schreibbar (%d Zeilen zurückgestellt, nächster Versuch in %.0fs): %s",
+                       self.sink, pending, delay, error)
+
+    def _trim(self):
+        # Aufrufer hält _lock
+        excess = len(self._rows) - self.max_rows
+        if excess > 0:
+            del self._rows[:excess]
+            self.dropped += excess
+            metrics.inc("hotelbot_logging_failures_total", excess, sink=self.sink, reason="dropped")
+
+
+class CsvLogWriter:
+    def __init__(self, path="logs.csv", fieldnames=LOG_FIELDS, buffer_size=200,
+                 flush_interval=1.0, max_bytes=50 * 1024 * 1024, rotate_interval=None,
+                 backup_count=30):
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self._pending = PendingRows("csv", buffer_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._header_ok_ino = None
+        self.stats = {"written": 0, "flushes": 0, "rotations": 0}
+
+    def write(self, row: dict):
+        if self._pending.add(row):
+            self.flush()
+
+    def start(self):
+        if self._thread is None and self.flush_interval:
+            self._thread = threading.Thread(target=self._run, name="csv-log", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush(force=True)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self, force=False):
+        """Gepufferte Zeilen schreiben; nach einem Fehler erst nach dem Backoff (außer ``force``)."""
+        rows = self._pending.take(force)
+        if not rows:
+            return
+        out = io.StringIO()
+        w = csv.DictWriter(out, fieldnames=self.fieldnames, extrasaction="ignore", lineterminator="\n")
+        w.writerows(rows)
+        try:
+            with metrics.span("csv_write"):
+                self._append(out.getvalue().encode("utf-8"))
+        except OSError as e:
+            # Zeilen für den nächsten Versuch zurücklegen, Chat läuft weiter
+            self._pending.failed(rows, e)
+            return
+        self._pending.succeeded()
+        self.stats["written"] += len(rows)
+        self.stats["flushes"] += 1
+
+    def session_rows(self, session_id, limit):
+        """Die letzten ``limit`` Zeilen einer Session, chronologisch.
+
+        Liest die aktuelle Datei und dann die rotierten vom Ende her
+        (``iter_rows_reversed``) und hört auf, sobald genug Zeilen gefunden
+        sind; der Aufwand hängt davon ab, wie weit die Turns der Session
+        zurückliegen, nicht von der Dateigröße.
+        """
+        if not limit:
+            return []
+        self.flush()
+        root, ext = os.path.splitext(self.path)
+        paths = [self.path] + sorted(glob.glob(f"{glob.escape(root)}.*{ext}"), reverse=True)
+        needle = session_id.encode("utf-8")
+        found = []
+        for path in paths:
+            try:
+                with open(path, newline="", encoding="utf-8") as f:
+                    names = next(csv.reader(f), None)
+                if not names:
+                    continue
+                for raw in iter_rows_reversed(path):
+                    if needle not in raw:
+                        continue  # billiger Vorfilter vor dem CSV-Parsen
+                    values = next(csv.reader(io.StringIO(raw.decode("utf-8"), newline="")), [])
+                    row = dict(zip(names, values))
+                    if row.get("session_id") == session_id and values != names:
+                        found.append(row)
+                        if len(found) >= limit:
+                            return found[::-1]
+            except (OSError, UnicodeDecodeError, csv.Error):
+                continue
+        return found[::-1]
+
+    # ---- Datei ----
+    def _header(self) -> bytes:
+        return (",".join(self.fieldnames) + "\n").encode("utf-8")
+
+    def _append(self, payload: bytes):
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                # Hat ein anderer Prozess inzwischen rotiert? Dann neu öffnen.
+                try:
+                    same = os.fstat(fd).st_ino == os.stat(self.path).st_ino
+                except FileNotFoundError:
+                    same = False
+                if not same:
+                    continue
+                st = os.fstat(fd)
+                if st.st_size and (self._should_rotate(st, len(payload)) or not self._header_ok(fd, st)):
+                    self._rotate()
+                    continue
+                if st.st_size == 0:
+                    payload = self._header() + payload
+                os.write(fd, payload)
+                return
+            finally:
+                os.close(fd)  # gibt auch die Sperre frei
+
+    def _header_ok(self, fd, st) -> bool:
+        # Nur einmal pro Datei (Inode) prüfen
+        if self._header_ok_ino == st.st_ino:
+            return True
+        header = self._header()
+        first = os.pread(fd, len(header) + 1, 0)
+        if first.replace(b"\r\n", b"\n")[:len(header)] != header:
+            return False
+        self._header_ok_ino = st.st_ino
+        return True
+
+    def _should_rotate(self, st, incoming) -> bool:
+        if self.max_bytes and st.st_size + incoming > self.max_bytes:
+            return True
+        if self.rotate_interval:
+            return int(st.st_mtime // self.rotate_interval) != int(time.time() // self.rotate_interval)
+        return False
+
+    def _rotate(self):
+        root, ext = os.path.splitext(self.path)
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        os.replace(self.path, f"{root}.{stamp}{ext}")
+        self.stats["rotations"] += 1
+        if self.backup_count:
+            backups = sorted(glob.glob(f"{glob.escape(root)}.*{ext}"))
+            for old in backups[:-self.backup_count]:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+
+
+def iter_rows_reversed(path, block=TAIL_BLOCK):
+    """Rohe CSV-Zeilen (Bytes) einer Datei, letzte zuerst, blockweise vom Ende gelesen.
+
+    Am Dateiende steht man außerhalb von Anführungszeichen; rückwärts schaltet
+    jedes ``"`` um (verdoppelte heben sich auf), nur ein ``\n`` außerhalb trennt
+    Zeilen. Zeilenumbrüche in Feldern bleiben so in ihrer Zeile.
+    """
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        quoted = False
+        parts = []  # Stücke der aktuellen Zeile, rückwärts gesammelt
+        while pos > 0:
+            start = max(0, pos - block)
+            f.seek(start)
+            data = f.read(pos - start)
+            pos = start
+            end = len(data)
+            for m in reversed(list(_ROW_BREAKS.finditer(data))):
+                i = m.start()
+                if data[i] == 0x22:
+                    quoted = not quoted
+                elif not quoted:
+                    parts.append(data[i + 1:end])
+                    end = i
+                    row = b"".join(reversed(parts)).rstrip(b"\r")
+                    parts = []
+                    if row:
+                        yield row
+            parts.append(data[:end])
+        row = b"".join(reversed(parts)).rstrip(b"\r")
+        if row:
+            yield row
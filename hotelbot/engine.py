@@ -0,0 +1,328 @@
+"""Retrieval-Engine für die Hotel-FAQ (ohne Streamlit importierbar).
+
+Zum Beantworten reichen NumPy/SciPy: pandas und scikit-learn werden erst
+importiert, wenn eine KB aus der CSV gefittet wird (oder für "cosine",
+"hybrid" und "hashing"), nicht beim Laden eines kompilierten Index.
+"""
+import itertools
+from dataclasses import dataclass, field
+
+import numpy as np
+import scipy.sparse as sp
+
+from . import metrics
+from .string_table import StringTable
+
+REQUIRED_COLUMNS = {"id", "question", "answer"}
+
+# Snapshot-Nummern, prozessweit fortlaufend (anders als id() nie wiederverwendet)
+_GENERATIONS = itertools.count(1)
+
+# Größere Batches werden in Blöcken gerechnet, damit die dichte
+# Ähnlichkeitsmatrix (Batch x KB) nicht beliebig wächst.
+DEFAULT_CHUNK_SIZE = 1024
+# Obergrenze für Zellen der dichten Ähnlichkeitsmatrix je Block (~64 MB float64)
+MAX_DENSE_CELLS = 8_000_000
+
+# "dot": X ist beim Laden L2-normiert, Score = Q·Xᵀ (schnell)
+# "cosine": alter Pfad über cosine_similarity (normiert X bei jedem Aufruf)
+# "hybrid": (1 - w) * dot + w * LSA-Kosinus (hotelbot.semantic), w = semantic_weight
+SCORING_MODES = ("dot", "cosine", "hybrid")
+DEFAULT_SEMANTIC_WEIGHT = 0.5
+
+# "brute": Q·Xᵀ gegen alle Zeilen; "inverted": nur Dokumente mit gemeinsamen
+# Termen, MaxScore-Abbruch (hotelbot.inverted); "auto" ab INVERTED_MIN_ROWS.
+# Beide liefern identische Ergebnisse, "inverted" nur mit scoring="dot".
+RETRIEVAL_MODES = ("auto", "brute", "inverted")
+INVERTED_MIN_ROWS = 50_000
+
+# Vorschläge "Ähnliche Fragen" aus dem Nachbarschaftsgraphen (hotelbot.neighbors):
+# bei Treffern dessen Nachbarn, bei knappen Fehlschlägen (bester Score unter
+# threshold, aber mindestens NEAR_MISS_MIN) der beste Kandidat und seine Nachbarn.
+RELATED_LIMIT = 3
+NEAR_MISS_MIN = 0.15
+
+# "tfidf": gelerntes Vokabular (TfidfVectorizer); "hashing": feste gehashte
+# Spalten mit laufender Dokumenthäufigkeit, Anhängen ohne Refit (hotelbot.hashing)
+VECTORIZERS = ("tfidf", "hashing")
+NGRAM_RANGE = (1, 2)
+
+
+@dataclass(frozen=True)
+class Answer:
+    """Ergebnis einer Anfrage: bester Treffer (oder None) plus Top-k und Vorschläge."""
+    picked_id: str | None
+    question: str | None
+    answer: str | None
+    similarity: float
+    top: list
+    related: list = field(default_factory=list)  # [(id, question)]
+
+    def to_dict(self) -> dict:
+        return {
+            "picked_id": self.picked_id or "",
+            "question": self.question,
+            "answer": self.answer,
+            "similarity": self.similarity,
+            "top": [{"id": i, "question": q, "similarity": s} for i, q, s in self.top],
+            "related": [{"id": i, "question": q} for i, q in self.related],
+        }
+
+
+def topk_rows(sims, k):
+    """Top-k je Zeile per argpartition; liefert (Indizes, Werte) absteigend.
+
+    Gleichstände gehen an den kleineren Index, auch an der k-Grenze – damit ist
+    das Ergebnis deterministisch und mit dem invertierten Index vergleichbar.
+    """
+    n, m = sims.shape
+    k = min(k, m)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.intp), np.empty((n, 0), dtype=sims.dtype)
+    if k < m:
+        part = np.argpartition(sims, m - k, axis=1)[:, m - k:]
+        vals = np.take_along_axis(sims, part, axis=1)
+        kth = vals.min(axis=1)
+        for r in np.flatnonzero((sims >= kth[:, None]).sum(axis=1) > k):
+            gt = np.flatnonzero(sims[r] > kth[r])
+            part[r] = np.concatenate([gt, np.flatnonzero(sims[r] == kth[r])[:k - len(gt)]])
+            vals[r] = sims[r, part[r]]
+    else:
+        part = np.tile(np.arange(m), (n, 1))
+        vals = sims.copy()
+    order = np.lexsort((part, -vals), axis=1)
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(vals, order, axis=1)
+
+
+def _as_array(values):
+    # Arrays (auch memory-mapped) und String-Tabellen aus dem Index unverändert übernehmen,
+    # Listen als object-Array
+    return values if isinstance(values, (np.ndarray, StringTable)) else np.asarray(values, dtype=object)
+
+
+def make_vectorizer(kind="tfidf"):
+    if kind == "hashing":
+        from .hashing import HashingTfidfVectorizer
+        return HashingTfidfVectorizer(ngram_range=NGRAM_RANGE, lowercase=True)
+    if kind != "tfidf":
+        raise ValueError(f"Unbekannter Vektorizer: {kind}")
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(ngram_range=NGRAM_RANGE, stop_words=None, lowercase=True)
+
+
+class KnowledgeBase:
+    """FAQ als flache Arrays plus TF-IDF-Vektorizer und normierte Fragenmatrix."""
+
+    def __init__(self, ids, questions, answers, vec, X, scoring="dot",
+                 XT=None, normalized=False, retrieval="auto", semantic=None,
+                 semantic_weight=DEFAULT_SEMANTIC_WEIGHT, neighbors=None, id_index=None):
+        if scoring not in SCORING_MODES:
+            raise ValueError(f"Unbekannter Scoring-Modus: {scoring}")
+        if retrieval not in RETRIEVAL_MODES:
+            raise ValueError(f"Unbekannter Retrieval-Modus: {retrieval}")
+        if retrieval == "inverted" and scoring != "dot":
+            raise ValueError("Invertierter Index nur mit scoring='dot'")
+        self.ids = _as_array(ids)
+        self.questions = _as_array(questions)
+        self.answers = _as_array(answers)
+        self.vec = vec
+        if not normalized:
+            from sklearn.preprocessing import normalize
+            X = normalize(X.tocsr(), norm="l2", copy=False)
+        self.X = X.tocsr()
+        # Transponierte als CSR: Q·Xᵀ ist dann ein reines CSR×CSR-Produkt
+        self.XT = XT if XT is not None else self.X.T.tocsr()
+        self.scoring = scoring
+        self.retrieval = retrieval
+        self.generation = next(_GENERATIONS)
+        self.source = None  # Name der Live-KB bzw. des Mandanten (hotelbot.live)
+        self._inverted = None
+        self._id_pos = id_index  # ID -> Zeile; aus dem Index gemappt oder beim ersten Zugriff gebaut
+        if scoring == "hybrid" and semantic is None:
+            from .semantic import SemanticIndex
+            semantic = SemanticIndex.fit(self.questions)
+        self.semantic = semantic
+        self.semantic_weight = semantic_weight
+        self.neighbors = neighbors
+
+    @classmethod
+    def from_frame(cls, df, scoring="dot", retrieval="auto", vectorizer="tfidf"):
+        if not REQUIRED_COLUMNS.issubset(df.columns):
+            raise ValueError("CSV braucht Spalten: id, question, answer")
+        vec = make_vectorizer(vectorizer)
+        X = vec.fit_transform(df["question"].tolist())
+        X.sort_indices()  # fit_transform liefert Terme je Zeile unsortiert
+        return cls(df["id"].astype(str).tolist(), df["question"].tolist(),
+                   df["answer"].tolist(), vec, X, scoring=scoring, retrieval=retrieval)
+
+    @classmethod
+    def from_csv(cls, csv_path="answers.csv", scoring="dot", retrieval="auto", vectorizer="tfidf"):
+        import pandas as pd
+        return cls.from_frame(pd.read_csv(csv_path).fillna(""), scoring=scoring,
+                              retrieval=retrieval, vectorizer=vectorizer)
+
+    def __len__(self):
+        return self.X.shape[0]
+
+    @property
+    def vectorizer(self) -> str:
+        return "hashing" if hasattr(self.vec, "partial_fit") else "tfidf"
+
+    def append(self, ids, questions, answers):
+        """Neuer Snapshot mit zusätzlichen Zeilen am Ende, ohne Refit.
+
+        Nur mit vectorizer="hashing": die neuen Fragen werden gehasht, ihre
+        Dokumenthäufigkeiten hochgezählt und mit der neuen IDF gewichtet;
+        vorhandene Zeilen von X und Xᵀ werden nur angehängt, nicht neu gerechnet.
+        """
+        if self.vectorizer != "hashing":
+            raise ValueError("Anhängen ohne Refit nur mit vectorizer='hashing'")
+        questions = [str(q) for q in questions]
+        vec = self.vec.copy()
+        fresh = vec.weight(vec.partial_fit(questions))
+        X = sp.vstack([self.X, fresh], format="csr")
+        XT = sp.hstack([self.XT, fresh.T.tocsr()], format="csr")
+        semantic = None
+        if self.semantic is not None:
+            from .semantic import SemanticIndex
+            sem = self.semantic
+            vectors = np.concatenate([np.asarray(sem.vectors), sem.embed_all(questions)])
+            semantic = SemanticIndex(sem.vec, sem.components, vectors)
+        kb = KnowledgeBase(np.concatenate([self.ids, _as_array([str(i) for i in ids])]),
+                             np.concatenate([self.questions, _as_array(questions)]),
+                             np.concatenate([self.answers, _as_array(list(answers))]),
+                             vec, X, scoring=self.scoring, XT=XT, normalized=True,
+                             retrieval=self.retrieval, semantic=semantic,
+                             semantic_weight=self.semantic_weight)
+        if self.neighbors is not None:
+            n = len(self)
+            kb.neighbors = self.neighbors.updated(X, XT, [(i, i) for i in range(n)], range(n, len(kb)))
+        return kb
+
+    def nbytes(self) -> int:
+        """Ungefährer Speicher der Arrays (X, Xᵀ, Zeilen, IDF, LSA); ohne Vokabular."""
+        total = sum(int(M.data.nbytes + M.indices.nbytes + M.indptr.nbytes) for M in (self.X, self.XT))
+        total += sum(int(a.nbytes) for a in (self.ids, self.questions, self.answers))
+        total += int(self.vec.idf_.nbytes)
+        if self.semantic is not None:
+            total += self.semantic.nbytes()
+        if self.neighbors is not None:
+            total += self.neighbors.nbytes()
+        return total
+
+    def build_neighbors(self, k=None):
+        """Baut den Nachbarschaftsgraphen (quadratisch in der KB-Größe, offline)."""
+        from .neighbors import DEFAULT_K, NeighborGraph
+        self.neighbors = NeighborGraph.build(self.X, self.XT, k or DEFAULT_K)
+        return self
+
+    def score(self, texts):
+        """Ähnlichkeiten aller Anfragen gegen alle KB-Fragen (Batch x KB, dicht)."""
+        texts = list(texts)
+        with metrics.span("vectorize"):
+            Q = self.vec.transform(texts)
+        with metrics.span("score"):
+            if self.scoring == "cosine":
+                from sklearn.metrics.pairwise import cosine_similarity
+                return cosine_similarity(Q, self.X)
+            sims = (Q @ self.XT).toarray()
+        if self.scoring == "hybrid":
+            with metrics.span("semantic"):
+                dense = self.semantic.score(texts)
+            # negative LSA-Kosinuswerte zählen nicht gegen einen Sparse-Treffer
+            sims *= 1 - self.semantic_weight
+            sims += self.semantic_weight * np.maximum(dense, 0)
+        return sims
+
+    def answer_by_id(self, qid):
+        """Antworttext zu einer Fragen-ID; None, wenn es sie nicht (mehr) gibt."""
+        if self._id_pos is None:
+            self._id_pos = {str(i): n for n, i in enumerate(self.ids)}
+        pos = self._id_pos.get(qid)
+        return None if pos is None else str(self.answers[pos])
+
+    def uses_inverted(self) -> bool:
+        if self.retrieval == "auto":
+            return self.scoring == "dot" and len(self) >= INVERTED_MIN_ROWS
+        return self.retrieval == "inverted"
+
+    @property
+    def inverted(self):
+        # Beim ersten Zugriff aufgebaut (max. Gewicht je Term), teilt sich XT
+        if self._inverted is None:
+            from .inverted import InvertedIndex
+            self._inverted = InvertedIndex(self.X, self.XT)
+        return self._inverted
+
+    def search(self, texts, threshold=0.30, topk=3, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Beantwortet einen ganzen Batch; liefert eine Answer pro Anfrage."""
+        texts = list(texts)
+        metrics.inc("hotelbot_scored_queries_total", len(texts))
+        if self.uses_inverted():
+            return self._search_inverted(texts, threshold, topk)
+        results = []
+        chunk_size = max(1, min(chunk_size, MAX_DENSE_CELLS // max(len(self), 1)))
+        for start in range(0, len(texts), chunk_size):
+            sims = self.score(texts[start:start + chunk_size])
+            top_idx, top_sim = topk_rows(sims, max(topk, 1))
+            for idx, vals in zip(top_idx, top_sim):
+                results.append(self._answer(idx, vals, threshold, topk))
+        return results
+
+    def _search_inverted(self, texts, threshold, topk):
+        with metrics.span("vectorize"):
+            Q = self.vec.transform(texts)
+        inv = self.inverted
+        results = []
+        with metrics.span("score"):
+            for r in range(Q.shape[0]):
+                idx, vals = inv.topk(Q[r], max(topk, 1))
+                results.append(self._answer(idx, vals, threshold, topk))
+        return results
+
+    def _answer(self, idx, vals, threshold, topk):
+        if len(idx) == 0:
+            return Answer(None, None, None, 0.0, [])
+        best_idx, best_sim = int(idx[0]), float(vals[0])
+        if best_sim < threshold:
+            related = self._related(best_idx, include_self=True) if best_sim >= NEAR_MISS_MIN else []
+            return Answer(None, None, None, best_sim, [], related)
+        top = [(str(self.ids[i]), str(self.questions[i]), float(s)) for i, s in zip(idx[:topk], vals[:topk])]
+        return Answer(str(self.ids[best_idx]), str(self.questions[best_idx]),
+                      str(self.answers[best_idx]), best_sim, top, self._related(best_idx))
+
+    def _related(self, row, include_self=False):
+        # Nur Lookup im vorberechneten Graphen; ohne Graph keine Vorschläge
+        if self.neighbors is None:
+            return []
+        rows = ([row] if include_self else []) + self.neighbors.related(row, RELATED_LIMIT)
+        return [(str(self.ids[i]), str(self.questions[i])) for i in rows[:RELATED_LIMIT]]
+
+
+def load_kb(csv_path="answers.csv", scoring="dot", use_index=True, vectorizer="tfidf"):
+    """Lädt die KB; mit use_index aus dem kompilierten Index neben der CSV."""
+    if use_index:
+        from .index_store import load_or_build
+        return load_or_build(csv_path, scoring=scoring, vectorizer=vectorizer)
+    return KnowledgeBase.from_csv(csv_path, scoring=scoring, vectorizer=vectorizer)
+
+
+def answer_query(user_text, kb, threshold=0.30, topk=3, cache=None) -> Answer:
+    """Einzelanfrage (optional über den Antwort-Cache), zählt Anfragen und Fallbacks."""
+    if cache is not None:
+        res = cache.search(kb, user_text, threshold=threshold, topk=topk)
+    else:
+        res = kb.search([user_text], threshold=threshold, topk=topk)[0]
+    metrics.inc("hotelbot_queries_total")
+    if res.picked_id is None:
+        metrics.inc("hotelbot_fallbacks_total")
+    return res
+
+
+def find_best_answer(user_text, kb, threshold=0.30, topk=3, cache=None):
+    """Einzelanfrage im Format der Apps: (best oder None, similarity, top)."""
+    res = answer_query(user_text, kb, threshold=threshold, topk=topk, cache=cache)
+    if res.picked_id is None:
+        return None, res.similarity, []
+    best = {"id": res.picked_id, "question": res.question, "answer": res.answer}
+    return best, res.similarity, res.top
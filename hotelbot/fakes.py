@@ -0,0 +1,66 @@
+"""Lokale Stand-ins für externe Dienste (Tests, Lasttests, Offline-Betrieb)."""
+import random
+import threading
+import time
+
+
+class FakeAPIError(Exception):
+    """Imitiert gspread.exceptions.APIError (nur das Attribut ``code``)."""
+
+    def __init__(self, code, message=""):
+        super().__init__(f"{code} {message}".strip())
+        self.code = code
+
+
+class FakeWorksheet:
+    """In-Process-Ersatz für ein gspread-Worksheet.
+
+    ``latency`` (Sekunden) wird pro Request geschlafen, ``error_rate`` ist die
+    Wahrscheinlichkeit für einen Fehler mit ``error_code`` (z.B. 429 = Quota).
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, error_code=503, seed=None, header=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.rows = [list(header)] if header else []
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _request(self):
+        with self._lock:
+            self.requests += 1
+            fail = self._rng.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise FakeAPIError(self.error_code, "fake worksheet error")
+
+    def append_row(self, values, value_input_option="RAW"):
+        self._request()
+        with self._lock:
+            self.rows.append(list(values))
+
+    def append_rows(self, values, value_input_option="RAW"):
+        self._request()
+        with self._lock:
+            self.rows.extend(list(v) for v in values)
+
+    def update(self, range_name, values):
+        self._request()
+        with self._lock:
+            if range_name.startswith("A1") and values:
+                if self.rows:
+                    self.rows[0] = list(values[0])
+                else:
+                    self.rows.append(list(values[0]))
+
+    def row_values(self, row):
+        self._request()
+        with self._lock:
+            return list(self.rows[row - 1]) if len(self.rows) >= row else []
+
+    def get_all_values(self):
+        with self._lock:
+            return [list(r) for r in self.rows]
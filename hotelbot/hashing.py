@@ -0,0 +1,90 @@
+"""Zustandsloser Index-Modus: gehashte Terme statt gelerntem Vokabular.
+
+Der ``TfidfVectorizer`` lernt sein Vokabular beim Fit; neue Fragen mit neuen
+Wörtern brauchen daher irgendwann einen vollen Refit, und das Vokabular-Dict
+wächst mit der KB. Hier werden Wort-1/2-Gramme per ``HashingVectorizer`` auf
+``n_features`` feste Spalten abgebildet, die Dokumenthäufigkeit je Spalte
+läuft als Zähler mit:
+
+* ``partial_fit`` / ``forget`` zählen Fragen hinzu bzw. heraus (O(neue Zeilen)),
+* IDF wie beim TfidfVectorizer (``smooth_idf``): ln((1 + n) / (1 + df)) + 1;
+  Spalten mit df = 0 haben IDF 0, unbekannte Anfrage-Terme fallen also wie
+  beim gelernten Vokabular heraus,
+* Speicher fest: ``df_`` (int32) und ``idf_`` (float64) je Spalte, also
+  12 MB bei 2^20 Spalten – unabhängig von KB- und Vokabulargröße.
+
+Angehängte Zeilen werden mit der IDF zum Zeitpunkt des Anhängens gewichtet;
+ältere Zeilen behalten ihre Gewichte, bis ``hotelbot.live`` nach genügend
+Änderungen neu gewichtet (kein Vokabular-Fit, nur erneutes Hashen).
+Kollisionen (zwei Terme, eine Spalte) sind bei 2^20 Spalten selten;
+``bench/bench_hashing.py`` misst Trefferqualität und Speicher gegen TF-IDF.
+"""
+import numpy as np
+
+DEFAULT_N_FEATURES = 2 ** 20
+
+
+class HashingTfidfVectorizer:
+    """TF-IDF über gehashte Spalten mit laufenden Dokumenthäufigkeiten."""
+
+    def __init__(self, n_features=DEFAULT_N_FEATURES, ngram_range=(1, 2), lowercase=True):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.lowercase = lowercase
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self._hasher = HashingVectorizer(n_features=n_features, ngram_range=self.ngram_range,
+                                         lowercase=lowercase, alternate_sign=False, norm=None)
+        self.df_ = np.zeros(n_features, dtype=np.int32)
+        self.n_docs_ = 0
+        self._idf = None
+
+    @property
+    def idf_(self):
+        if self._idf is None:
+            df = self.df_.astype(np.float64)
+            # Spalten ohne Dokument zählen nicht – wie Terme außerhalb des Vokabulars
+            self._idf = np.where(df > 0, np.log((1 + self.n_docs_) / (1 + df)) + 1, 0.0)
+        return self._idf
+
+    def build_analyzer(self):
+        return self._hasher.build_analyzer()
+
+    def counts(self, texts):
+        """Rohe Termhäufigkeiten (CSR, Spalten je Zeile sortiert)."""
+        return self._hasher.transform(list(texts))
+
+    def _count(self, C, sign):
+        # Nach sum_duplicates ist jede (Zeile, Spalte) eindeutig -> bincount = df
+        self.df_ += sign * np.bincount(C.indices, minlength=self.n_features).astype(np.int32)
+        self.n_docs_ += sign * C.shape[0]
+        self._idf = None
+
+    def partial_fit(self, texts):
+        C = self.counts(texts)
+        self._count(C, 1)
+        return C
+
+    def forget(self, texts):
+        self._count(self.counts(texts), -1)
+
+    def weight(self, C):
+        """Termhäufigkeiten -> L2-normierte TF-IDF-Zeilen mit der aktuellen IDF."""
+        from sklearn.preprocessing import normalize
+        C = C.astype(np.float64, copy=True)
+        C.data *= self.idf_[C.indices]
+        return normalize(C, norm="l2", copy=False)
+
+    def fit_transform(self, texts):
+        self.df_[:] = 0
+        self.n_docs_ = 0
+        return self.weight(self.partial_fit(texts))
+
+    def transform(self, texts):
+        return self.weight(self.counts(texts))
+
+    def copy(self):
+        """Unabhängige Zähler für einen neuen Snapshot; der Hasher ist zustandslos."""
+        other = HashingTfidfVectorizer.__new__(HashingTfidfVectorizer)
+        other.__dict__.update(self.__dict__)
+        other.df_ = self.df_.copy()
+        return other
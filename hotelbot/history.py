@@ -0,0 +1,76 @@
+"""Begrenzter Chat-Verlauf je Session (ohne Streamlit importierbar).
+
+Im Session-State liegen höchstens ``window`` Turns (Frage + Antwort) als
+kompakte Tupel; die Antwort ist dabei nur eine Referenz auf den String aus der
+KB bzw. der Persona, keine Kopie. Ältere Turns fallen aus dem Fenster – sie
+stehen bereits im Log (``log_event`` schreibt jeden Turn mit ``session_id``)
+und werden über "Frühere Nachrichten" seitenweise von dort nachgeladen.
+
+Damit rendert jeder Rerun höchstens ``window`` Turns (plus nachgeladene
+Seiten bis zur nächsten Eingabe), unabhängig von der Gesprächslänge.
+``window=None`` behält alle Turns – für Log-Ziele, aus denen sich nichts
+nachladen lässt (nur Google Sheets).
+"""
+import os
+from collections import deque
+from typing import NamedTuple
+
+DEFAULT_WINDOW = 20
+
+
+def window_from_env(default=DEFAULT_WINDOW) -> int:
+    """Fenstergröße aus ``HOTELBOT_HISTORY_WINDOW`` (Turns, mindestens 1)."""
+    try:
+        return max(1, int(os.environ.get("HOTELBOT_HISTORY_WINDOW", default)))
+    except ValueError:
+        return default
+
+
+class Turn(NamedTuple):
+    user_text: str
+    picked_id: str
+    answer: str
+
+
+class ChatHistory:
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.turns = deque(maxlen=window)
+        self.archived = 0   # aus dem Fenster gefallene Turns (nur noch im Log)
+        self.earlier = []   # nachgeladene ältere Turns, bis zur nächsten Eingabe
+
+    def __len__(self):
+        return self.archived + len(self.turns)
+
+    def add(self, user_text, picked_id, answer):
+        if self.window is not None and len(self.turns) == self.window:
+            self.archived += 1
+        self.turns.append(Turn(user_text, picked_id, answer))
+        self.earlier = []
+
+    def hidden(self) -> int:
+        """Anzahl älterer Turns, die noch nicht nachgeladen sind."""
+        return self.archived - len(self.earlier)
+
+    def load_earlier(self, fetch, resolve, page=None):
+        """Lädt die nächste Seite älterer Turns aus dem Log; liefert deren Anzahl.
+
+        ``fetch(n)``: die letzten n Log-Zeilen der Session (chronologisch, Dicts
+        mit ``user_text``/``picked_id``); ``resolve(picked_id)``: Antworttext.
+        """
+        page = min(page or self.window, self.hidden())
+        if page <= 0:
+            return 0
+        shown = len(self.turns) + len(self.earlier)
+        rows = fetch(shown + page)
+        rows = rows[:max(0, len(rows) - shown)]
+        fresh = [Turn(r["user_text"], r["picked_id"], resolve(r["picked_id"])) for r in rows]
+        self.earlier[:0] = fresh
+        if len(fresh) < page:
+            # Log reicht nicht so weit zurück (rotiert und gelöscht)
+            self.archived = len(self.earlier)
+        return len(fresh)
+
+    def visible(self):
+        yield from self.earlier
+        yield from self.turns
@@ -0,0 +1,305 @@
+"""Schlanker HTTP/JSON-Antwortdienst neben der Streamlit-UI (nur asyncio, keine Extra-Pakete).
+
+Für Zimmer-Tablets und das Widget der Buchungsseite, die Streamlit nicht
+einbetten können:
+
+    POST /answer        {"text": "...", "session_id": "...", "threshold": 0.3, "topk": 3}
+    POST /answer/batch  {"queries": ["...", ...]}  oder  {"queries": [{"text": ...}, ...]}
+    GET  /health
+    GET  /metrics       Prometheus-Textformat (siehe hotelbot.metrics)
+
+Antwort je Anfrage: ``{"id", "answer", "similarity", "top"}`` (``id`` leer bei Fallback).
+Mehrere Hotels: ``?tenant=…`` (oder ``"tenant"`` im Body) wählt die KB aus der
+Mandanten-Registry (hotelbot.tenants); ohne Angabe gilt der Default-Mandant.
+
+HTTP/1.1 Keep-Alive wird unterstützt. Einzelanfragen, die innerhalb von
+``batch_window`` Sekunden eintreffen, werden gesammelt und mit *einem*
+``kb.search``-Aufruf beantwortet (in einem Worker-Thread, damit die Event-Loop
+frei bleibt). Geloggt wird über denselben CSV-Writer wie die UI (arm="api").
+"""
+import asyncio
+import json
+import logging
+import time
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from . import metrics
+from .log_sinks import make_event
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY = 1 << 20
+MAX_BATCH_QUERIES = 10_000
+
+
+class PlainText(str):
+    """Antwort-Body, der nicht als JSON serialisiert wird."""
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str = ""):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+def content_length(headers):
+    """Content-Length als Zahl; None bei ungültigem Wert (keine Ziffern, negativ)."""
+    raw = headers.get("content-length") or "0"
+    if not (raw.isascii() and raw.isdigit()):
+        return None
+    return int(raw)
+
+
+def answer_payload(res) -> dict:
+    return {
+        "id": res.picked_id or "",
+        "answer": res.answer,
+        "similarity": res.similarity,
+        "top": [{"id": i, "question": q, "similarity": s} for i, q, s in res.top],
+    }
+
+
+class MicroBatcher:
+    """Sammelt Einzelanfragen kurz ein und beantwortet sie gemeinsam."""
+
+    def __init__(self, window=0.005, max_batch=256):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = {}   # (live_kb, threshold, topk) -> [(text, future)]
+        self._timers = {}
+        self.batches = 0
+
+    async def submit(self, live_kb, text, threshold, topk):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        key = (live_kb, threshold, topk)
+        bucket = self._pending.setdefault(key, [])
+        bucket.append((text, fut))
+        if len(bucket) >= self.max_batch:
+            self._fire(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._fire, key)
+        return await fut
+
+    def _fire(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        bucket = self._pending.pop(key, [])
+        if bucket:
+            asyncio.ensure_future(self._run(key, bucket))
+
+    async def _run(self, key, bucket):
+        live_kb, threshold, topk = key
+        texts = [t for t, _ in bucket]
+        self.batches += 1
+        try:
+            results = await asyncio.to_thread(
+                live_kb.search, texts, threshold=threshold, topk=topk)
+        except Exception as e:
+            for _, fut in bucket:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), res in zip(bucket, results):
+            if not fut.done():
+                fut.set_result(res)
+
+
+class AnswerService:
+    def __init__(self, live_kb=None, log_writer=None, threshold=0.30, topk=3,
+                 batch_window=0.005, max_batch=256, registry=None):
+        if (live_kb is None) == (registry is None):
+            raise ValueError("Entweder live_kb oder registry angeben")
+        self.live_kb = live_kb
+        self.registry = registry
+        self.log_writer = log_writer
+        self.threshold = threshold
+        self.topk = topk
+        self.batcher = MicroBatcher(window=batch_window, max_batch=max_batch)
+        self.requests = 0
+
+    async def _kb(self, tenant):
+        if self.registry is None:
+            return self.live_kb
+        from .tenants import UnknownTenant
+        try:
+            self.registry.resolve(tenant)
+        except UnknownTenant:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Unbekannter Mandant: {tenant}") from None
+        # Erstes Laden kann dauern; gleichzeitige Anfragen teilen sich den Ladevorgang
+        return await asyncio.to_thread(self.registry.get, tenant)
+
+    # ---- Fachlogik ----
+    def _params(self, body):
+        try:
+            threshold = float(body.get("threshold", self.threshold))
+            topk = int(body.get("topk", self.topk))
+        except (TypeError, ValueError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "threshold/topk ungültig") from None
+        return threshold, max(1, min(topk, 50))
+
+    @staticmethod
+    def _count(res):
+        metrics.inc("hotelbot_queries_total")
+        if res.picked_id is None:
+            metrics.inc("hotelbot_fallbacks_total")
+
+    def _log(self, text, res, session_id):
+        if self.log_writer is None:
+            return
+        self.log_writer.write(make_event(text, res.picked_id, res.similarity if res.picked_id else 0.0,
+                                         session_id=session_id, arm="api"))
+
+    async def answer(self, body, tenant=None):
+        text = body.get("text") or body.get("user_text") or body.get("query")
+        if not isinstance(text, str) or not text.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Feld 'text' fehlt")
+        threshold, topk = self._params(body)
+        live_kb = await self._kb(body.get("tenant") or tenant)
+        res = await self.batcher.submit(live_kb, text, threshold, topk)
+        self._count(res)
+        self._log(text, res, body.get("session_id"))
+        return answer_payload(res)
+
+    async def answer_batch(self, body, tenant=None):
+        queries = body.get("queries") if isinstance(body, dict) else body
+        if not isinstance(queries, list) or len(queries) > MAX_BATCH_QUERIES:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"'queries' muss eine Liste (max. {MAX_BATCH_QUERIES}) sein")
+        texts = [q.get("text") if isinstance(q, dict) else q for q in queries]
+        if not all(isinstance(t, str) for t in texts):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Jede Anfrage braucht 'text' als String")
+        threshold, topk = self._params(body if isinstance(body, dict) else {})
+        live_kb = await self._kb((body.get("tenant") if isinstance(body, dict) else None) or tenant)
+        results = await asyncio.to_thread(live_kb.search, texts, threshold=threshold, topk=topk)
+        session_id = body.get("session_id") if isinstance(body, dict) else None
+        for text, res in zip(texts, results):
+            self._count(res)
+            self._log(text, res, session_id)
+        return {"results": [answer_payload(r) for r in results]}
+
+    async def dispatch(self, method, target, body_bytes):
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        tenant = parse_qs(url.query).get("tenant", [None])[0]
+        if path == "/health":
+            if self.registry is not None:
+                return {"status": "ok", "tenants_loaded": self.registry.loaded(),
+                        "resident_bytes": self.registry.resident_bytes(), "batches": self.batcher.batches}
+            return {"status": "ok", "kb_size": len(self.live_kb.current()),
+                    "kb_version": self.live_kb.version, "batches": self.batcher.batches}
+        if path == "/metrics":
+            return PlainText(metrics.render_prometheus())
+        if path not in ("/answer", "/answer/batch"):
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+        if method != "POST":
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+        try:
+            body = json.loads(body_bytes or b"{}")
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body ist kein JSON") from None
+        if path == "/answer":
+            if not isinstance(body, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "JSON-Objekt erwartet")
+            return await self.answer(body, tenant)
+        return await self.answer_batch(body, tenant)
+
+    # ---- HTTP/1.1 ----
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "bad request line"}, False)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                conn = headers.get("connection", "").lower()
+                keep_alive = conn != "close" if version == "HTTP/1.1" else conn == "keep-alive"
+                length = content_length(headers)
+                if length is None:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "bad content-length"}, False)
+                    return
+                if length > MAX_BODY:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"}, False)
+                    return
+                body = await reader.readexactly(length) if length else b""
+                self.requests += 1
+                try:
+                    status, payload = HTTPStatus.OK, await self.dispatch(method.upper(), target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception:
+                    logger.exception("Fehler bei %s %s", method, target)
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "internal error"}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        if isinstance(payload, PlainText):
+            body, ctype = payload.encode("utf-8"), payload.content_type
+        else:
+            body, ctype = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: {ctype}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(service: AnswerService, host="127.0.0.1", port=8502, ready=None):
+    server = await asyncio.start_server(service.handle, host, port)
+    addr = server.sockets[0].getsockname()
+    logger.info("Antwortdienst läuft auf http://%s:%s", addr[0], addr[1])
+    if ready is not None:
+        ready(addr)
+    async with server:
+        await server.serve_forever()
+
+
+def run(csv_path="answers.csv", host="127.0.0.1", port=8502, log_path="logs.csv",
+        batch_window=0.005, threshold=0.30, scoring="dot", tenants=None, vectorizer="tfidf"):
+    """Startet KB-Registry (Hot-Reload je Mandant), Log-Ziele und Server; blockiert bis Strg+C.
+
+    ``tenants``: Pfad zur Mandanten-Konfiguration; ohne nur ``csv_path`` als Default-Mandant.
+    ``log_path``: Log-Ziele wie in hotelbot.log_sinks, z.B. "logs.csv" oder "csv,sqlite:logs.db".
+    """
+    from .log_sinks import open_sinks
+    from .tenants import DEFAULT_TENANT, TenantRegistry
+
+    if tenants:
+        registry = TenantRegistry.from_config(tenants, scoring=scoring, vectorizer=vectorizer)
+    else:
+        registry = TenantRegistry({DEFAULT_TENANT: csv_path}, scoring=scoring, vectorizer=vectorizer)
+    registry.get()  # Default-Mandant vorab laden, erste Anfrage wartet nicht
+    log_writer = open_sinks(log_path) if log_path else None
+    service = AnswerService(registry=registry, log_writer=log_writer, threshold=threshold,
+                            batch_window=batch_window)
+    t0 = time.perf_counter()
+    try:
+        asyncio.run(serve(service, host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        registry.close()
+        if log_writer is not None:
+            log_writer.close()
+        logger.info("%d Requests in %.0fs", service.requests, time.perf_counter() - t0)
@@ -0,0 +1,225 @@
+"""Kompilierter KB-Index auf der Platte (neben der CSV).
+
+Layout von ``answers.index/`` (``answers.hashing.index/`` mit vectorizer="hashing"):
+    meta.json                       Format-Version, CSV-Hash, Vektorizer-Parameter
+    vocab_{offsets,blob,prefix,values}.npy
+                                    Vokabular als sortierte String-Tabelle -> Spalte
+                                    (hotelbot.string_table.SortedStringIndex)
+    idf.npy                         IDF-Gewichte je Spalte
+    df.npy                          statt vocab/idf bei vectorizer="hashing":
+                                    Dokumenthäufigkeit je gehashter Spalte
+    x_{data,indices,indptr}.npy     L2-normierte Fragenmatrix X (CSR)
+    xt_{data,indices,indptr}.npy    Xᵀ als CSR für das Scoring
+    {ids,questions,answers}_{offsets,blob}.npy
+                                    Zeilen als UTF-8-Blob mit Offsets (StringTable)
+    id_index_*.npy                  sortierte IDs -> Zeile (``answer_by_id``)
+    semantic/                       nur mit scoring="hybrid": LSA-Modell und
+                                    float16-Vektoren (hotelbot.semantic)
+    neighbors_{idx,sim}.npy         k ähnlichste Fragen je Frage (hotelbot.neighbors);
+                                    bis AUTO_MAX_ROWS Fragen automatisch gebaut
+
+Speichert ``LiveKnowledgeBase`` einen inkrementell nachgeführten Stand, steht
+dessen Drift in ``meta.json`` (``drift``: seitdem unbekannte Terme bzw.
+geänderte Zeilen). Ein tfidf-Index mit unbekannten Termen passt nicht mehr zur
+CSV – neue Wörter wären unauffindbar – und gilt daher beim Laden als veraltet.
+
+Alle Arrays sind einzelne .npy-Dateien und werden per ``mmap_mode="r"``
+geladen; Anfragen vektorisiert danach ``hotelbot.analyzer`` ohne scikit-learn. Der Index trägt den SHA-256 der CSV-Bytes als Schlüssel und wird nur
+neu gebaut, wenn sich die CSV ändert.
+
+Auch Vokabular, IDs und Texte liegen nur in gemappten Arrays statt in
+Python-Dicts und -Strings: mehrere Worker-Prozesse (z.B. Streamlit-Replikate
+auf einem Host) teilen sich die Seiten des Index über den Page-Cache, ein
+weiterer Worker kostet für die KB kaum zusätzlichen privaten Speicher.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import scipy.sparse as sp
+
+from .analyzer import VocabVectorizer
+from .engine import NGRAM_RANGE, KnowledgeBase, make_vectorizer
+from .neighbors import AUTO_MAX_ROWS, NeighborGraph
+from .string_table import SortedStringIndex, StringTable
+
+FORMAT_VERSION = 2
+_ROW_FIELDS = ("ids", "questions", "answers")
+
+
+def csv_hash(csv_path) -> str:
+    h = hashlib.sha256()
+    with open(csv_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def default_index_dir(csv_path, vectorizer="tfidf") -> str:
+    """``answers.index`` (tfidf) bzw. ``answers.<vectorizer>.index``: jede Art hat ihren eigenen Index."""
+    root, _ = os.path.splitext(os.fspath(csv_path))
+    return root + (".index" if vectorizer == "tfidf" else f".{vectorizer}.index")
+
+
+def _vectorizer_params(vec) -> dict:
+    params = {"ngram_range": list(vec.ngram_range), "lowercase": vec.lowercase}
+    if hasattr(vec, "n_features"):
+        params.update(kind="hashing", n_features=vec.n_features)
+    return params
+
+
+def _expected_params(kind) -> dict:
+    if kind == "tfidf":
+        # Parameter von make_vectorizer(), ohne dafür scikit-learn zu importieren
+        return {"ngram_range": list(NGRAM_RANGE), "lowercase": True}
+    return _vectorizer_params(make_vectorizer(kind))
+
+
+def read_meta(index_dir):
+    try:
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(index_dir, digest, scoring="dot", vectorizer="tfidf") -> bool:
+    meta = read_meta(index_dir)
+    return bool(meta) and meta.get("version") == FORMAT_VERSION \
+        and meta.get("csv_sha256") == digest \
+        and meta.get("vectorizer") == _expected_params(vectorizer) \
+        and (scoring != "hybrid" or bool(meta.get("semantic"))) \
+        and "neighbors" in meta \
+        and not (meta.get("drift") or {}).get("unseen_terms")
+    # "neighbors" fehlt: ältere Indizes einmal mit Graph neu bauen;
+    # unbekannte Terme: inkrementell gepatchter tfidf-Stand, neu fitten
+
+
+def _save_csr(index_dir, prefix, M):
+    np.save(os.path.join(index_dir, f"{prefix}_data.npy"), M.data)
+    np.save(os.path.join(index_dir, f"{prefix}_indices.npy"), M.indices)
+    np.save(os.path.join(index_dir, f"{prefix}_indptr.npy"), M.indptr)
+
+
+def _load_csr(index_dir, prefix, shape, mmap_mode):
+    arrs = [np.load(os.path.join(index_dir, f"{prefix}_{name}.npy"), mmap_mode=mmap_mode)
+            for name in ("data", "indices", "indptr")]
+    return sp.csr_matrix(tuple(arrs), shape=shape, copy=False)
+
+
+def save_index(kb: KnowledgeBase, index_dir, digest, drift=None):
+    """Schreibt den Index atomar (temporäres Verzeichnis + rename).
+
+    ``drift``: Stand der inkrementellen Aktualisierung (hotelbot.live), None nach vollem Fit.
+    """
+    parent = os.path.dirname(os.path.abspath(index_dir))
+    tmp = tempfile.mkdtemp(prefix=".index-", dir=parent)
+    try:
+        if kb.vectorizer == "hashing":
+            np.save(os.path.join(tmp, "df.npy"), kb.vec.df_)
+        else:
+            SortedStringIndex.from_mapping(kb.vec.vocabulary_).save(tmp, "vocab")
+            np.save(os.path.join(tmp, "idf.npy"), kb.vec.idf_)
+        _save_csr(tmp, "x", kb.X)
+        _save_csr(tmp, "xt", kb.XT)
+        for field in _ROW_FIELDS:
+            StringTable.from_strings(getattr(kb, field)).save(tmp, field)
+        # bei doppelten IDs gewinnt wie in answer_by_id die letzte Zeile
+        SortedStringIndex.from_mapping({str(i): n for n, i in enumerate(kb.ids)}).save(tmp, "id_index")
+        if kb.semantic is not None:
+            kb.semantic.save(os.path.join(tmp, "semantic"))
+        if kb.neighbors is not None:
+            kb.neighbors.save(tmp)
+        meta = {
+            "version": FORMAT_VERSION,
+            "csv_sha256": digest,
+            "vectorizer": _vectorizer_params(kb.vec),
+            "shape": list(kb.X.shape),
+            "n_docs": kb.vec.n_docs_ if kb.vectorizer == "hashing" else None,
+            "semantic": {"dim": kb.semantic.dim} if kb.semantic is not None else None,
+            "neighbors": {"k": kb.neighbors.k} if kb.neighbors is not None else None,
+            "drift": drift,
+        }
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        # mkdtemp legt 0700 an: Worker unter anderen Benutzern sollen den Index lesen/mappen
+        os.chmod(tmp, 0o755)
+        # Altes Verzeichnis beiseiteschieben, dann das neue an seine Stelle
+        old = None
+        if os.path.exists(index_dir):
+            old = tempfile.mkdtemp(prefix=".index-old-", dir=parent)
+            os.replace(index_dir, os.path.join(old, "idx"))
+        os.replace(tmp, index_dir)
+        if old:
+            shutil.rmtree(old, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def load_index(index_dir, scoring="dot", mmap_mode="r") -> KnowledgeBase:
+    """Lädt einen kompilierten Index ohne pandas-Parsing und ohne Refit."""
+    meta = read_meta(index_dir)
+    if not meta or meta.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Kein gültiger Index in {index_dir}")
+    shape = tuple(meta["shape"])
+    params = meta["vectorizer"]
+    if params.get("kind") == "hashing":
+        vec = make_vectorizer("hashing")
+        vec.df_ = np.load(os.path.join(index_dir, "df.npy"))
+        vec.n_docs_ = meta["n_docs"]
+    else:
+        vec = VocabVectorizer(SortedStringIndex.load(index_dir, "vocab", mmap_mode),
+                              np.load(os.path.join(index_dir, "idf.npy"), mmap_mode=mmap_mode),
+                              ngram_range=params["ngram_range"], lowercase=params["lowercase"])
+    X = _load_csr(index_dir, "x", shape, mmap_mode)
+    XT = _load_csr(index_dir, "xt", shape[::-1], mmap_mode)
+    rows = [StringTable.load(index_dir, f, mmap_mode) for f in _ROW_FIELDS]
+    semantic = None
+    if scoring == "hybrid" and meta.get("semantic"):
+        from .semantic import SemanticIndex
+        semantic = SemanticIndex.load(os.path.join(index_dir, "semantic"), mmap_mode=mmap_mode)
+    neighbors = NeighborGraph.load(index_dir, mmap_mode=mmap_mode) if meta.get("neighbors") else None
+    return KnowledgeBase(*rows, vec, X, scoring=scoring, XT=XT, normalized=True, semantic=semantic,
+                         neighbors=neighbors, id_index=SortedStringIndex.load(index_dir, "id_index", mmap_mode))
+
+
+def with_neighbors(kb, neighbors=None) -> KnowledgeBase:
+    """Baut den Nachbarschaftsgraphen; ``neighbors=None``: nur bis AUTO_MAX_ROWS Fragen."""
+    if neighbors is None:
+        neighbors = len(kb) <= AUTO_MAX_ROWS
+    if neighbors and kb.neighbors is None:
+        kb.build_neighbors()
+    return kb
+
+
+def build_index(csv_path, index_dir=None, scoring="dot", vectorizer="tfidf",
+                neighbors=None) -> KnowledgeBase:
+    """Fittet die KB aus der CSV und schreibt den Index (erzwungen)."""
+    index_dir = index_dir or default_index_dir(csv_path, vectorizer)
+    digest = csv_hash(csv_path)
+    kb = with_neighbors(KnowledgeBase.from_csv(csv_path, scoring=scoring, vectorizer=vectorizer), neighbors)
+    save_index(kb, index_dir, digest)
+    return kb
+
+
+def load_or_build(csv_path="answers.csv", index_dir=None, scoring="dot",
+                  vectorizer="tfidf") -> KnowledgeBase:
+    """Index laden, wenn er zum CSV-Hash passt; sonst neu bauen und speichern."""
+    index_dir = index_dir or default_index_dir(csv_path, vectorizer)
+    digest = csv_hash(csv_path)
+    if is_fresh(index_dir, digest, scoring, vectorizer):
+        try:
+            return load_index(index_dir, scoring=scoring)
+        except (OSError, ValueError):
+            pass  # beschädigter Index: unten neu bauen
+    kb = with_neighbors(KnowledgeBase.from_csv(csv_path, scoring=scoring, vectorizer=vectorizer))
+    try:
+        save_index(kb, index_dir, digest)
+    except OSError:
+        # z.B. schreibgeschütztes Deployment: dann eben ohne Cache weiter
+        pass
+    return kb
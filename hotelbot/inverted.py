@@ -0,0 +1,143 @@
+"""Kandidatensuche über invertierte Posting-Listen mit MaxScore-Abbruch.
+
+Xᵀ (CSR, Zeile = Term, Spalten = Dokumente) *ist* bereits ein invertierter
+Index: ``XT.indices[indptr[t]:indptr[t+1]]`` sind die Dokumente mit Term t,
+``XT.data`` die zugehörigen TF-IDF-Gewichte. Pro Anfrage:
+
+1. Obergrenze je Anfrageterm: ``ub_t = q_t * max(Posting t)``. Terme werden
+   absteigend nach ``ub_t`` abgearbeitet, Teilscores in einem Akkumulator.
+2. Nach jedem Term ist ``theta`` der k-t beste Teilscore (eine untere Schranke,
+   alle Gewichte sind >= 0). Ist die Summe der restlichen ``ub_t`` kleiner als
+   ``theta``, kann kein noch nicht gesehenes Dokument mehr in die Top-k –
+   die restlichen (häufigen, billigen) Terme werden nur noch für die
+   vorhandenen Kandidaten per Binärsuche nachgeschlagen (MaxScore); wer auch
+   mit allen noch offenen Termen ``theta`` nicht erreicht, fällt heraus.
+3. Die verbleibenden Kandidaten werden exakt nachgerechnet (``X[cand] @ qᵀ``).
+   Beide Produkte summieren über die Terme in aufsteigender Indexfolge, die
+   Scores sind damit bitgleich zum Brute-Force-Pfad ``Q @ XT``; Gleichstände
+   gehen wie dort an den kleineren Zeilenindex.
+"""
+import threading
+
+import numpy as np
+
+# Teilscores summieren in anderer Reihenfolge als Q @ XT und können daher um
+# wenige ULP abweichen; Schranken werden um diesen relativen Spielraum gelockert.
+SLACK = 1e-9
+# Ab so wenigen Kandidaten lohnt Nachschlagen nicht mehr, sie werden direkt exakt gerechnet
+PROBE_MIN = 512
+
+
+class InvertedIndex:
+    def __init__(self, X, XT):
+        if not XT.has_sorted_indices:
+            XT = XT.sorted_indices()
+        # Zeilen mit aufsteigenden Termindizes (siehe oben); ältere Indizes ggf. kopieren
+        self.X = X if X.has_sorted_indices else X.sorted_indices()
+        self.indptr = np.asarray(XT.indptr)
+        self.indices = np.asarray(XT.indices)
+        self.data = np.asarray(XT.data)
+        self.n_docs = X.shape[0]
+        self.term_max = self._term_max()
+        self._local = threading.local()
+
+    def _term_max(self):
+        lengths = np.diff(self.indptr)
+        out = np.zeros(len(lengths))
+        nonempty = np.flatnonzero(lengths)
+        if len(nonempty):
+            out[nonempty] = np.maximum.reduceat(self.data, self.indptr[:-1][nonempty])
+        return out
+
+    def _acc(self):
+        # Ein Akkumulator je Thread (Micro-Batcher und UI rechnen parallel)
+        acc = getattr(self._local, "acc", None)
+        if acc is None or len(acc) != self.n_docs:
+            acc = self._local.acc = np.zeros(self.n_docs)
+        return acc
+
+    def _posting(self, t):
+        s, e = self.indptr[t], self.indptr[t + 1]
+        return self.indices[s:e], self.data[s:e]
+
+    def topk(self, q, k):
+        """Top-k für eine Anfragezeile ``q`` (1 x Terme, CSR); wie ``topk_rows``."""
+        k = min(k, self.n_docs)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        cand = self._candidates(q.indices, q.data, k)
+        scores = self._exact(q, cand)
+        if len(cand) > k:
+            # Nur Werte ab dem k-ten (inkl. Gleichstände) sortieren
+            keep = scores >= np.partition(scores, len(scores) - k)[len(scores) - k]
+            cand, scores = cand[keep], scores[keep]
+        order = np.lexsort((cand, -scores))[:k]
+        idx, vals = cand[order], scores[order]
+        if len(idx) < k:
+            # Weniger Treffer als k: mit Score-0-Dokumenten auffüllen (kleinste Indizes)
+            fill = np.setdiff1d(np.arange(min(self.n_docs, k + len(cand))), cand)[:k - len(idx)]
+            idx = np.concatenate([idx, fill])
+            vals = np.concatenate([vals, np.zeros(len(fill))])
+        return idx.astype(np.intp, copy=False), vals
+
+    def _candidates(self, terms, weights, k):
+        ub = weights * self.term_max[terms]
+        order = np.argsort(-ub, kind="stable")
+        # rest[i] = größtmöglicher Beitrag der Terme order[i:]
+        rest = np.append(np.cumsum(ub[order][::-1])[::-1], 0.0)
+        acc = self._acc()
+        touched = []
+        top = np.empty(0, dtype=self.indices.dtype)
+        theta = 0.0
+        stop = len(order)
+        try:
+            for i, j in enumerate(order):
+                if theta > 0 and rest[i] < theta * (1 - SLACK):
+                    stop = i
+                    break
+                docs, w = self._posting(terms[j])
+                acc[docs] += weights[j] * w
+                touched.append(docs)
+                if len(docs) > k:
+                    docs = docs[np.argpartition(acc[docs], len(docs) - k)[len(docs) - k:]]
+                pool = np.union1d(top, docs)
+                if len(pool) >= k:
+                    part = np.argpartition(acc[pool], len(pool) - k)[len(pool) - k:]
+                    top = pool[part]
+                    theta = float(acc[top].min())
+                else:
+                    top = pool
+            if not touched:
+                return np.empty(0, dtype=np.intp)
+            # Kandidaten, die selbst mit allen Resttermen theta erreichen können
+            bound = theta * (1 - SLACK) - rest[stop]
+            parts = []
+            for docs in touched:
+                sel = docs[acc[docs] >= bound]
+                parts.append((sel, acc[sel]))
+                acc[sel] = -np.inf  # jedes Dokument nur einmal übernehmen
+            cand = np.concatenate([c for c, _ in parts])
+            partial = np.concatenate([v for _, v in parts])
+        finally:
+            for docs in touched:
+                acc[docs] = 0.0
+        return self._probe(terms, weights, k, order[stop:], rest[stop:], cand, partial, theta)
+
+    def _probe(self, terms, weights, k, order, rest, cand, partial, theta):
+        """Restterme nur noch für die Kandidaten nachschlagen und dabei weiter aussortieren."""
+        for i, j in enumerate(order):
+            if len(cand) <= max(PROBE_MIN, k):
+                break
+            docs, w = self._posting(terms[j])
+            pos = np.minimum(np.searchsorted(docs, cand), len(docs) - 1)
+            hit = docs[pos] == cand
+            partial[hit] += weights[j] * w[pos[hit]]
+            theta = max(theta, float(np.partition(partial, len(partial) - k)[len(partial) - k]))
+            keep = partial + rest[i + 1] >= theta * (1 - SLACK)
+            cand, partial = cand[keep], partial[keep]
+        return cand
+
+    def _exact(self, q, cand):
+        if not len(cand):
+            return np.empty(0)
+        return (self.X[cand] @ q.T).toarray().ravel()
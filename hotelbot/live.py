@@ -0,0 +1,255 @@
+"""Live-KB: beobachtet answers.csv und tauscht den Index im laufenden Betrieb.
+
+Leser holen sich mit ``current()`` einen unveränderlichen Snapshot; laufende
+Anfragen rechnen also gegen den alten Stand weiter, während ein neuer Snapshot
+gebaut und per Referenzzuweisung (atomar) eingesetzt wird.
+
+Änderungen an der CSV werden inkrementell übernommen:
+  * neue/geänderte Fragen werden mit dem bestehenden Vokabular transformiert,
+  * unveränderte Zeilen von X werden wiederverwendet,
+  * reine Antwort-Änderungen tauschen nur das Antwort-Array.
+Ein voller Refit läuft erst, wenn der Anteil unbekannter Terme
+(``refit_threshold``, bezogen auf die Vokabulargröße) überschritten ist.
+
+Mit ``vectorizer="hashing"`` gibt es kein Vokabular: Dokumenthäufigkeiten
+werden für neue, geänderte und gelöschte Fragen nachgezählt, reine
+Ergänzungen am Dateiende werden nur angehängt (``KnowledgeBase.append``).
+Neu gewichtet wird, sobald der Anteil seit dem letzten Build geänderter
+Zeilen ``refit_threshold`` übersteigt.
+
+Jeder neue Stand wird als Index gespeichert (``answers.index`` bzw.
+``answers.hashing.index``), samt Drift (unbekannte Terme bzw. geänderte
+Zeilen) in ``meta.json``. Ein Neustart lädt ihn ohne Refit und zählt die Drift
+weiter; ein tfidf-Stand mit unbekannten Termen wird dabei neu gefittet
+(``index_store.is_fresh``), sonst blieben neue Wörter bis zum nächsten
+Überschreiten von ``refit_threshold`` unauffindbar.
+"""
+import logging
+import os
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+
+from .engine import KnowledgeBase, REQUIRED_COLUMNS
+from .index_store import csv_hash, default_index_dir, load_or_build, read_meta, save_index, with_neighbors
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_REFIT_THRESHOLD = 0.05
+
+
+class LiveKnowledgeBase:
+    def __init__(self, csv_path="answers.csv", refit_threshold=DEFAULT_REFIT_THRESHOLD,
+                 poll_interval=DEFAULT_POLL_INTERVAL, scoring="dot", vectorizer="tfidf", name=None):
+        self.csv_path = csv_path
+        self._name = name or csv_path
+        self.refit_threshold = refit_threshold
+        self.poll_interval = poll_interval
+        self.scoring = scoring
+        self.vectorizer = vectorizer
+        self.version = 0
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._stat = self._file_stat()
+        self._digest = csv_hash(csv_path)
+        self._kb = load_or_build(csv_path, scoring=scoring, vectorizer=vectorizer)
+        self._kb.source = self._name
+        self._unseen = set()
+        self._stale_rows = self._saved_stale_rows()
+
+    # ---- Lesen ----
+    def current(self) -> KnowledgeBase:
+        return self._kb
+
+    @property
+    def name(self) -> str:
+        """Stabiler Name der Quelle (Mandant, sonst CSV-Pfad); steht als ``source`` an jedem Snapshot."""
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+        self._kb.source = value
+
+    def search(self, texts, **kwargs):
+        return self.current().search(texts, **kwargs)
+
+    def drift(self) -> float:
+        if self._kb.vectorizer == "hashing":
+            return self._stale_rows / max(len(self._kb), 1)
+        return len(self._unseen) / max(len(self._kb.vec.vocabulary_), 1)
+
+    def subscribe(self, fn):
+        """fn(kb) wird nach jedem Tausch mit dem neuen Snapshot aufgerufen."""
+        self._listeners.append(fn)
+        return fn
+
+    # ---- Beobachten ----
+    def _file_stat(self):
+        st = os.stat(self.csv_path)
+        return st.st_mtime_ns, st.st_size
+
+    def maybe_reload(self) -> bool:
+        """Prüft mtime/Größe (billig) und bei Änderung den Inhalts-Hash."""
+        try:
+            stat = self._file_stat()
+        except OSError:
+            return False
+        if stat == self._stat:
+            return False
+        with self._lock:
+            self._stat = stat
+            digest = csv_hash(self.csv_path)
+            if digest == self._digest:
+                return False
+            try:
+                import pandas as pd
+                df = pd.read_csv(self.csv_path).fillna("")
+                kb = self._apply(df, digest)
+            except Exception:
+                # halb gespeicherte Datei o.ä.: alten Stand behalten
+                logger.exception("Neuladen von %s fehlgeschlagen", self.csv_path)
+                return False
+            self._digest = digest
+            self._swap(kb)
+            self._persist(kb, digest)
+            return True
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="kb-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            self.maybe_reload()
+
+    def _swap(self, kb):
+        kb.source = self._name
+        self._kb = kb
+        self.version += 1
+        for fn in list(self._listeners):
+            try:
+                fn(kb)
+            except Exception:
+                logger.exception("KB-Listener fehlgeschlagen")
+
+    # ---- Inkrementelle Aktualisierung ----
+    def _apply(self, df, digest):
+        if not REQUIRED_COLUMNS.issubset(df.columns):
+            raise ValueError("CSV braucht Spalten: id, question, answer")
+        ids = df["id"].astype(str).tolist()
+        if len(set(ids)) != len(ids):
+            logger.info("Doppelte IDs in %s, voller Refit", self.csv_path)
+            return self._refit(df, digest)
+
+        old = self._kb
+        old_pos = {str(i): n for n, i in enumerate(old.ids)}
+        questions = df["question"].tolist()
+        reuse, changed = [], []
+        for n, (qid, q) in enumerate(zip(ids, questions)):
+            pos = old_pos.get(qid)
+            if pos is not None and str(old.questions[pos]) == q:
+                reuse.append((n, pos))
+            else:
+                changed.append(n)
+
+        vec = old.vec
+        if old.vectorizer == "hashing":
+            reused = {pos for _, pos in reuse}
+            self._stale_rows += len(changed) + len(old) - len(reused)
+            if self.drift() > self.refit_threshold:
+                logger.info("%.3f der Zeilen geändert > %.3f, neu gewichten",
+                            self.drift(), self.refit_threshold)
+                return self._refit(df, digest)
+            if len(reused) == len(old) and all(n == pos for n, pos in reuse):
+                tail = slice(len(old), None)
+                answers = df["answer"].tolist()
+                kb = old.append(ids[tail], questions[tail], answers[tail])
+                kb.answers = np.asarray(answers, dtype=object)  # auch Antwort-Änderungen übernehmen
+                logger.info("KB ergänzt: %d Fragen angehängt", len(changed))
+                return kb
+            vec = old.vec.copy()
+            vec.forget([str(old.questions[p]) for p in range(len(old)) if p not in reused])
+            vec.partial_fit([questions[n] for n in changed])
+        else:
+            vocab = old.vec.vocabulary_
+            analyzer = old.vec.build_analyzer()
+            for n in changed:
+                self._unseen.update(t for t in analyzer(questions[n]) if t not in vocab)
+            if self.drift() > self.refit_threshold:
+                logger.info("Vokabular-Drift %.3f > %.3f, voller Refit", self.drift(), self.refit_threshold)
+                return self._refit(df, digest)
+
+        parts, order = [], np.empty(len(ids), dtype=np.intp)
+        if reuse:
+            new_rows, old_rows = map(list, zip(*reuse))
+            parts.append(old.X[old_rows])
+            order[new_rows] = np.arange(len(reuse))
+        if changed:
+            from sklearn.preprocessing import normalize
+            fresh = normalize(vec.transform([questions[n] for n in changed]), norm="l2", copy=False)
+            parts.append(fresh)
+            order[changed] = len(reuse) + np.arange(len(changed))
+        if parts:
+            X = sp.vstack(parts, format="csr")[order]
+        else:
+            X = sp.csr_matrix((0, old.X.shape[1]))
+        semantic = self._apply_semantic(old, questions, reuse, changed) if old.semantic is not None else None
+        deleted = len(old_pos.keys() - set(ids))
+        logger.info("KB inkrementell aktualisiert: %d neu/geändert, %d gelöscht",
+                    len(changed), deleted)
+        kb = KnowledgeBase(ids, questions, df["answer"].tolist(), vec, X,
+                           scoring=self.scoring, normalized=True, semantic=semantic,
+                           semantic_weight=old.semantic_weight)
+        if old.neighbors is not None:
+            # nur neue/geänderte Fragen gegen alle rechnen, im Watcher-Thread
+            kb.neighbors = old.neighbors.updated(kb.X, kb.XT, reuse, changed)
+        return kb
+
+    @staticmethod
+    def _apply_semantic(old, questions, reuse, changed):
+        # Gleiches LSA-Modell, nur neue/geänderte Fragen einbetten
+        from .semantic import SemanticIndex
+        sem = old.semantic
+        vectors = np.empty((len(questions), sem.dim), dtype=np.float16)
+        if reuse:
+            new_rows, old_rows = map(list, zip(*reuse))
+            vectors[new_rows] = sem.vectors[old_rows]
+        if changed:
+            vectors[changed] = sem.embed_all([questions[n] for n in changed])
+        return SemanticIndex(sem.vec, sem.components, vectors)
+
+    def _refit(self, df, digest):
+        self._unseen = set()
+        self._stale_rows = 0
+        return with_neighbors(KnowledgeBase.from_frame(df, scoring=self.scoring, vectorizer=self.vectorizer))
+
+    def _persist(self, kb, digest):
+        # Auch inkrementelle Stände speichern, damit ein Neustart sie ohne Refit lädt;
+        # jede Vektorizer-Art in ihr eigenes Verzeichnis, die Drift steht in meta.json
+        drift = None
+        if self._unseen or self._stale_rows:
+            drift = {"unseen_terms": len(self._unseen), "stale_rows": self._stale_rows}
+        try:
+            save_index(kb, default_index_dir(self.csv_path, self.vectorizer), digest, drift=drift)
+        except OSError:
+            pass
+
+    def _saved_stale_rows(self):
+        # Seit dem letzten Build geänderte Zeilen (hashing) aus dem geladenen Index
+        meta = read_meta(default_index_dir(self.csv_path, self.vectorizer))
+        if not meta or meta.get("csv_sha256") != self._digest:
+            return 0
+        return int((meta.get("drift") or {}).get("stale_rows") or 0)
@@ -0,0 +1,247 @@
+"""Austauschbare Log-Ziele mit gemeinsamem Event-Schema.
+
+Jedes Ziel nimmt Events als Dict mit den Feldern ``LOG_FIELDS`` an und hat
+dieselbe Schnittstelle: ``start()``, ``write(row)``, ``flush()``, ``close()``
+(optional ``session_rows`` für "Frühere Nachrichten"):
+
+    csv      hotelbot.csv_log.CsvLogWriter (gepuffert, Dateisperre, Rotation)
+    sqlite   SqliteLogWriter (WAL, gebündelte Inserts, Indizes)
+    sheets   hotelbot.sheets_log.SheetsLogWorker (Hintergrund-Batches, Spill)
+
+``FanOutLogWriter`` verteilt jedes Event auf mehrere Ziele; ein fehlerhaftes
+Ziel hält die anderen nicht auf. Konfiguriert wird per Spezifikation, z.B.
+``HOTELBOT_LOG_SINKS="csv,sqlite:logs.db,sheets"`` (``open_sinks``).
+
+SQLite läuft im WAL-Modus: Leser (Auswertungen, ``hotelbot unanswered``)
+sehen einen konsistenten Stand und blockieren keine Schreiber, Schreiber aus
+mehreren Prozessen warten per ``busy_timeout`` aufeinander. Jeder Flush ist
+eine Transaktion mit ``executemany``; Indizes auf ``timestamp``,
+``picked_id`` und ``session_id``.
+"""
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from . import metrics
+from .csv_log import LOG_FIELDS, CsvLogWriter, PendingRows
+
+logger = logging.getLogger(__name__)
+
+SINK_KINDS = ("csv", "sqlite", "sheets")
+DEFAULT_TARGETS = {"csv": "logs.csv", "sqlite": "logs.db", "sheets": ""}
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+def make_event(user_text, picked_id, similarity, session_id="", arm="", timestamp=None) -> dict:
+    """Ein Log-Event im gemeinsamen Schema (``LOG_FIELDS``)."""
+    return {
+        "timestamp": timestamp or datetime.utcnow().isoformat(),
+        "user_text": user_text,
+        "picked_id": picked_id or "",
+        "similarity": similarity,
+        "session_id": session_id or "",
+        "arm": arm or "",
+    }
+
+
+class SqliteLogWriter:
+    _COLUMNS = {"similarity": "REAL"}
+
+    def __init__(self, path="logs.db", fieldnames=LOG_FIELDS, buffer_size=200, flush_interval=1.0,
+                 busy_timeout=10.0, table="logs"):
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.busy_timeout = busy_timeout
+        self.table = table
+        self._pending = PendingRows("sqlite", buffer_size)
+        self._db_lock = threading.Lock()
+        self._db = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"written": 0, "flushes": 0}
+
+    def write(self, row: dict):
+        if self._pending.add(row):
+            self.flush()
+
+    def start(self):
+        with self._db_lock:
+            self._connect()  # Schema und WAL gleich beim Start, Fehler fallen sofort auf
+        if self._thread is None and self.flush_interval:
+            self._thread = threading.Thread(target=self._run, name="sqlite-log", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush(force=True)
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self, force=False):
+        """Gepufferte Zeilen in einer Transaktion; Fehlerpolitik wie CSV (``PendingRows``)."""
+        rows = self._pending.take(force)
+        if not rows:
+            return
+        values = [tuple(r.get(f, "") for f in self.fieldnames) for r in rows]
+        cols = ", ".join(self.fieldnames)
+        sql = f"INSERT INTO {self.table} ({cols}) VALUES ({', '.join('?' * len(self.fieldnames))})"
+        try:
+            with metrics.span("sqlite_write"), self._db_lock:
+                db = self._connect()
+                with db:  # eine Transaktion je Flush
+                    db.executemany(sql, values)
+        except (sqlite3.Error, OSError) as e:
+            # Zeilen für den nächsten Versuch zurücklegen, Chat läuft weiter
+            self._pending.failed(rows, e)
+            return
+        self._pending.succeeded()
+        self.stats["written"] += len(rows)
+        self.stats["flushes"] += 1
+
+    def session_rows(self, session_id, limit):
+        """Die letzten ``limit`` Zeilen einer Session, chronologisch."""
+        if not limit:
+            return []
+        self.flush()
+        with self._db_lock:
+            cur = self._connect().execute(
+                f"SELECT {', '.join(self.fieldnames)} FROM {self.table} "
+                "WHERE session_id = ? ORDER BY rowid DESC LIMIT ?", (session_id, limit))
+            rows = cur.fetchall()
+        return [{f: "" if v is None else str(v) for f, v in zip(self.fieldnames, r)} for r in reversed(rows)]
+
+    # ---- Datenbank ----
+    def _connect(self):
+        # Aufrufer hält _db_lock
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")  # im WAL-Modus sicher gegen Korruption
+            cols = ", ".join(f"{f} {self._COLUMNS.get(f, 'TEXT')}" for f in self.fieldnames)
+            with db:
+                db.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({cols})")
+                for col in ("timestamp", "picked_id", "session_id"):
+                    if col in self.fieldnames:
+                        db.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_{col} ON {self.table} ({col})")
+            self._db = db
+        return self._db
+
+
+def iter_sqlite_chunks(path, chunk_rows, table="logs"):
+    """Log-Zeilen (Dicts) aus SQLite in Blöcken, schreibgeschützt und ohne Schreiber zu blockieren."""
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        cur = db.execute(f"SELECT * FROM {table} ORDER BY rowid")
+        names = [d[0] for d in cur.description]
+        while True:
+            rows = cur.fetchmany(chunk_rows)
+            if not rows:
+                return
+            yield [{n: "" if v is None else str(v) for n, v in zip(names, r)} for r in rows]
+    finally:
+        db.close()
+
+
+class FanOutLogWriter:
+    """Verteilt jedes Event auf mehrere Ziele; Fehler eines Ziels bleiben dort."""
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+
+    def _each(self, method, *args):
+        for sink in self.sinks:
+            try:
+                getattr(sink, method)(*args)
+            except Exception as e:
+                metrics.inc("hotelbot_logging_failures_total", sink=type(sink).__name__)
+                logger.warning("Log-Ziel %s: %s fehlgeschlagen: %s", type(sink).__name__, method, e)
+
+    def write(self, row: dict):
+        self._each("write", row)
+
+    def start(self):
+        self._each("start")
+        return self
+
+    def flush(self):
+        self._each("flush")
+
+    def close(self):
+        self._each("close")
+
+    @property
+    def can_reload(self) -> bool:
+        """Kann ein Ziel Sessions nachlesen? Sonst darf die UI den Verlauf nicht kürzen."""
+        return any(hasattr(sink, "session_rows") for sink in self.sinks)
+
+    def session_rows(self, session_id, limit):
+        """Aus dem ersten Ziel, das Sessions nachlesen kann (CSV oder SQLite)."""
+        for sink in self.sinks:
+            if hasattr(sink, "session_rows"):
+                return sink.session_rows(session_id, limit)
+        return []
+
+
+def parse_sinks(spec) -> list:
+    """``"csv,sqlite:logs.db,sheets"`` -> [(Art, Ziel)]; ein bloßer Pfad zählt nach Endung."""
+    out = []
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        kind, _, target = item.partition(":")
+        if kind not in SINK_KINDS:
+            kind, target = ("sqlite" if item.lower().endswith(SQLITE_SUFFIXES) else "csv"), item
+        out.append((kind, target or DEFAULT_TARGETS[kind]))
+    return out
+
+
+def open_sink(kind, target, open_worksheet=None, spill_path="logs_spill.jsonl"):
+    """Ein (noch nicht gestartetes) Ziel; ``sheets`` braucht ``open_worksheet``."""
+    if kind == "csv":
+        return CsvLogWriter(target)
+    if kind == "sqlite":
+        return SqliteLogWriter(target)
+    if kind == "sheets":
+        if open_worksheet is None:
+            raise ValueError("Log-Ziel 'sheets' braucht open_worksheet")
+        from .sheets_log import SheetsLogWorker
+        return SheetsLogWorker(open_worksheet, spill_path=spill_path)
+    raise ValueError(f"Unbekanntes Log-Ziel: {kind}")
+
+
+def open_sinks(spec, open_worksheet=None, spill_path="logs_spill.jsonl"):
+    """Gestarteter Fan-out über alle Ziele der Spezifikation (leer = kein Logging).
+
+    Unbekannte Ziele und ``sheets`` ohne ``open_worksheet`` werden mit Warnung
+    übersprungen.
+    """
+    sinks = []
+    for kind, target in parse_sinks(spec):
+        try:
+            sinks.append(open_sink(kind, target, open_worksheet, spill_path))
+        except ValueError as e:
+            # Falsch konfiguriertes Ziel fällt weg, der Chat läuft weiter
+            logger.warning("Log-Ziel %s:%s übersprungen: %s", kind, target, e)
+    return FanOutLogWriter(sinks).start()
+
+
+def sinks_from_env(default="csv", **kwargs):
+    """Fan-out laut ``HOTELBOT_LOG_SINKS`` (Standard ``default``)."""
+    return open_sinks(os.environ.get("HOTELBOT_LOG_SINKS", default), **kwargs)
@@ -0,0 +1,219 @@
+"""Zeitmessung je Verarbeitungsschritt und Zähler, exportiert im Prometheus-Textformat.
+
+Schritte (Label ``stage`` von ``hotelbot_stage_seconds``):
+    vectorize, score, animation, csv_write, sqlite_write, sheets_append
+Zähler:
+    hotelbot_queries_total, hotelbot_fallbacks_total, hotelbot_scored_queries_total,
+    hotelbot_cache_{hits,misses,evictions}_total, hotelbot_logging_failures_total{sink[,reason="dropped"]},
+    hotelbot_tenant_{loads,evictions}_total{tenant}
+Gauges:
+    hotelbot_tenant_load_seconds{tenant}, hotelbot_tenant_resident_bytes{tenant}
+
+Verwendung:
+    with metrics.span("vectorize"):
+        ...
+    metrics.inc("hotelbot_fallbacks_total")
+
+``start_http_server`` stellt ``/metrics`` lokal bereit, ``start_file_dump``
+schreibt denselben Text periodisch in eine Datei (z.B. für node_exporter).
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Sekunden; von Sub-Millisekunde (Scoring) bis Sekunden (Sheets, Animation)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+STAGE_METRIC = "hotelbot_stage_seconds"
+
+_HELP = {
+    STAGE_METRIC: "Dauer je Verarbeitungsschritt",
+    "hotelbot_queries_total": "Beantwortete Gast-Anfragen",
+    "hotelbot_fallbacks_total": "Anfragen unter dem Schwellwert (Fallback-Antwort)",
+    "hotelbot_scored_queries_total": "Gegen die KB gerechnete Anfragen (ohne Cache-Treffer)",
+    "hotelbot_cache_hits_total": "Treffer im Antwort-Cache",
+    "hotelbot_cache_misses_total": "Fehlgriffe im Antwort-Cache",
+    "hotelbot_cache_evictions_total": "Verdrängte Einträge im Antwort-Cache",
+    "hotelbot_logging_failures_total": "Fehlgeschlagene Log-Schreibvorgänge je Ziel",
+    "hotelbot_tenant_loads_total": "Geladene Mandanten-KBs",
+    "hotelbot_tenant_evictions_total": "Wegen des Speicherbudgets entladene Mandanten-KBs",
+    "hotelbot_tenant_load_seconds": "Dauer des letzten Ladevorgangs je Mandant",
+    "hotelbot_tenant_resident_bytes": "Geschätzter Speicher der geladenen KB je Mandant (0 = entladen)",
+}
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}    # (name, labels-tuple) -> float
+        self._gauges = {}      # (name, labels-tuple) -> float
+        self._histograms = {}  # (name, labels-tuple) -> Histogram
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            h = self._histograms.get(key)
+            if h is None:
+                h = self._histograms[key] = Histogram()
+            h.observe(value)
+
+    @contextmanager
+    def span(self, stage):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(STAGE_METRIC, time.perf_counter() - t0, stage=stage)
+
+    def counter_value(self, name, **labels) -> float:
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def gauge_value(self, name, **labels) -> float:
+        with self._lock:
+            return self._gauges.get((name, tuple(sorted(labels.items()))), 0)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            hists = sorted(((k, (h.buckets, list(h.counts), h.sum, h.count))
+                            for k, h in self._histograms.items()), key=lambda kv: kv[0])
+        out, seen = [], set()
+        for kind, series in (("counter", counters), ("gauge", gauges)):
+            for (name, labels), value in series:
+                if name not in seen:
+                    seen.add(name)
+                    out.append(f"# HELP {name} {_HELP.get(name, name)}")
+                    out.append(f"# TYPE {name} {kind}")
+                out.append(f"{name}{_labels(dict(labels))} {_number(value)}")
+        for (name, labels), (buckets, counts, total, count) in hists:
+            if name not in seen:
+                seen.add(name)
+                out.append(f"# HELP {name} {_HELP.get(name, name)}")
+                out.append(f"# TYPE {name} histogram")
+            cum = 0
+            for le, c in zip(buckets + ("+Inf",), counts):
+                cum += c
+                out.append(f"{name}_bucket{_labels(dict(labels, le=le))} {cum}")
+            out.append(f"{name}_sum{_labels(dict(labels))} {total:.6f}")
+            out.append(f"{name}_count{_labels(dict(labels))} {count}")
+        return "\n".join(out) + "\n"
+
+
+REGISTRY = Registry()
+inc = REGISTRY.inc
+set_gauge = REGISTRY.set
+observe = REGISTRY.observe
+span = REGISTRY.span
+render_prometheus = REGISTRY.render_prometheus
+
+
+# ---- Export ----
+def start_http_server(port=9464, host="127.0.0.1", registry=REGISTRY):
+    """Stellt GET /metrics in einem Daemon-Thread bereit; gibt den Server zurück."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def dump(path, registry=REGISTRY):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(registry.render_prometheus())
+    os.replace(tmp, path)
+
+
+def start_file_dump(path, interval=30.0, registry=REGISTRY):
+    """Schreibt die Metriken alle ``interval`` Sekunden atomar nach ``path``."""
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                dump(path, registry)
+            except OSError:
+                pass
+
+    threading.Thread(target=run, name="metrics-dump", daemon=True).start()
+    return stop
+
+
+def start_from_env(registry=REGISTRY):
+    """HOTELBOT_METRICS_PORT / HOTELBOT_METRICS_FILE (+ _INTERVAL) auswerten."""
+    started = {}
+    port = os.environ.get("HOTELBOT_METRICS_PORT")
+    if port:
+        try:
+            started["http"] = start_http_server(int(port), registry=registry)
+        except OSError:
+            # Port schon belegt (z.B. zweiter Streamlit-Worker): Datei-Export reicht
+            pass
+    path = os.environ.get("HOTELBOT_METRICS_FILE")
+    if path:
+        interval = float(os.environ.get("HOTELBOT_METRICS_INTERVAL", "30"))
+        started["file"] = start_file_dump(path, interval, registry=registry)
+    return started
@@ -0,0 +1,59 @@
+"""Persona-Definitionen (Chatino = KI, Sarah = Mitarbeiterin) als Konfiguration.
+
+Früher gab es pro Persona ein eigenes Skript (``app.py``/``app_human.py``),
+und jede Persona lief in einem eigenen Prozess. Jetzt bedient ein Server beide
+Personas. Jede Session wird anhand ihrer Session-ID deterministisch einem Arm
+zugeordnet. Dieser Arm wird mit jedem Log-Event geschrieben.
+"""
+import hashlib
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Persona:
+    key: str
+    page_title: str
+    name: str           # Name im Seitenpanel
+    label: str          # Überschrift im Seitenpanel / Untertitel
+    logo: str           # Bild im Seitenpanel
+    avatar: str         # Avatar der Assistenten-Nachrichten
+    greeting: str
+    fallback: str = "Das weiß ich leider nicht."
+    threshold: float = 0.30
+
+
+PERSONAS = {
+    "ai": Persona(
+        key="ai",
+        page_title="KI-Chatbot",
+        name="Chatino",
+        label="KI-Chatbot",
+        logo="AI-Chatbot.png",
+        avatar="AI-Icon.png",
+        greeting="Willkommen im Hotel! Ich bin Chatino, ein KI-Chatbot, und stehe Ihnen jederzeit gerne für Fragen oder Anliegen rund um Ihren Aufenthalt zur Verfügung. Wie kann ich helfen?",
+    ),
+    "human": Persona(
+        key="human",
+        page_title="Mitarbeiter-Chat",
+        name="Sarah",
+        label="Mitarbeiter-Chat",
+        logo="Mitarbeiter.jpg",
+        avatar="Human-Icon.png",
+        greeting="Willkommen im Hotel! Ich bin Sarah, eine Hotelmitarbeiterin, und stehe Ihnen jederzeit gerne für Fragen oder Anliegen rund um Ihren Aufenthalt zur Verfügung. Wie kann ich helfen?",
+    ),
+}
+
+DEFAULT_ARMS = ("ai", "human")
+
+
+def assign_arm(session_id: str, arms=DEFAULT_ARMS, salt: str = "persona-v1") -> str:
+    """Deterministische Zuordnung Session -> Arm (gleichverteilt über den Hash)."""
+    digest = hashlib.sha256(f"{salt}:{session_id}".encode("utf-8")).digest()
+    return arms[int.from_bytes(digest[:8], "big") % len(arms)]
+
+
+def get_persona(key: str) -> Persona:
+    try:
+        return PERSONAS[key]
+    except KeyError:
+        raise ValueError(f"Unbekannte Persona: {key}") from None
@@ -0,0 +1,131 @@
+"""Semantischer Modus: LSA-Vektoren (Char-n-Gramm-TF-IDF + TruncatedSVD), rein offline.
+
+Wort-TF-IDF sieht in "Frühstückszeiten" und "Wann gibt es Frühstück?" kaum
+Gemeinsamkeiten; Zeichen-n-Gramme (``char_wb``, 3-5) fangen Komposita,
+Flexion und Tippfehler ab, die SVD verdichtet sie auf ``dim`` Dimensionen
+mit latenten Themen.
+
+Die Dokumentvektoren sind L2-normiert und liegen als float16-Matrix im Index
+(``semantic/vectors.npy``, per mmap geladen; 1 Mio. Fragen x 128 Dim = 256 MB).
+Gerechnet wird blockweise in float32 (BLAS), Top-k wie im Sparse-Pfad.
+Das Char-Vokabular liegt wie das Wort-Vokabular als gemappte sortierte
+String-Tabelle im Index (``char_vocab_*.npy``, hotelbot.string_table).
+
+Fit auf großen KBs: Vektorizer und SVD lernen auf einer Stichprobe von
+höchstens ``fit_rows`` Fragen, transformiert wird danach alles in Blöcken.
+"""
+import os
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from .analyzer import term_columns
+from .string_table import SortedStringIndex
+
+DEFAULT_DIM = 128
+DEFAULT_FIT_ROWS = 50_000
+# Zeilen je float16->float32-Block beim Scoring; klein genug für den L2-Cache
+SCORE_BLOCK = 2048
+TRANSFORM_BLOCK = 10_000
+
+
+def make_char_vectorizer():
+    return TfidfVectorizer(analyzer="char_wb", ngram_range=(3, 5), lowercase=True, sublinear_tf=True)
+
+
+class SemanticIndex:
+    def __init__(self, vec: TfidfVectorizer, components, vectors):
+        self.vec = vec
+        self.components = np.asarray(components, dtype=np.float32)  # dim x Char-Terme
+        self.vectors = vectors                                      # Dokumente x dim, float16
+
+    @classmethod
+    def fit(cls, questions, dim=DEFAULT_DIM, fit_rows=DEFAULT_FIT_ROWS, seed=0):
+        questions = [str(q) for q in questions]
+        sample = questions
+        if len(questions) > fit_rows:
+            rng = np.random.default_rng(seed)
+            sample = [questions[i] for i in rng.choice(len(questions), fit_rows, replace=False)]
+        vec = make_char_vectorizer()
+        C = vec.fit_transform(sample)
+        dim = max(1, min(dim, C.shape[0] - 1, C.shape[1] - 1))
+        svd = TruncatedSVD(n_components=dim, algorithm="randomized", random_state=seed)
+        svd.fit(C)
+        index = cls(vec, svd.components_, None)
+        index.vectors = index.embed_all(questions)
+        return index
+
+    def __len__(self):
+        return self.vectors.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.components.shape[0]
+
+    def embed(self, texts):
+        """Anfragen -> L2-normierte float32-Vektoren (Anzahl x dim)."""
+        V = np.asarray(self._tfidf(list(texts)) @ self.components.T, dtype=np.float32)
+        return normalize(V, norm="l2", copy=False)
+
+    def _tfidf(self, texts):
+        vocab = self.vec.vocabulary_
+        if not isinstance(vocab, SortedStringIndex):
+            return self.vec.transform(texts)
+        # Gemapptes Vokabular: Terme des Batches auf einmal nachschlagen, Gewichtung wie
+        # TfidfVectorizer (sublinear_tf, IDF, L2)
+        analyzer = self.vec.build_analyzer()
+        docs = [analyzer(t) for t in texts]
+        columns = term_columns(vocab, {term for terms in docs for term in terms})
+        rows, cols = [], []
+        for r, terms in enumerate(docs):
+            for term in terms:
+                col = columns.get(term)
+                if col is not None:
+                    rows.append(r)
+                    cols.append(col)
+        C = sp.csr_matrix((np.ones(len(cols)), (rows, cols)), shape=(len(docs), len(vocab)))
+        C.sum_duplicates()
+        np.log(C.data, out=C.data)
+        C.data += 1
+        C.data *= self.vec.idf_[C.indices]
+        return normalize(C, norm="l2", copy=False)
+
+    def embed_all(self, texts):
+        out = np.empty((len(texts), self.dim), dtype=np.float16)
+        for start in range(0, len(texts), TRANSFORM_BLOCK):
+            out[start:start + TRANSFORM_BLOCK] = self.embed(texts[start:start + TRANSFORM_BLOCK])
+        return out
+
+    def score(self, texts):
+        """Kosinus-Ähnlichkeiten aller Anfragen gegen alle Fragen (Batch x KB, float32)."""
+        Q = self.embed(texts)
+        sims = np.empty((Q.shape[0], len(self)), dtype=np.float32)
+        buf = np.empty((min(SCORE_BLOCK, len(self)), self.dim), dtype=np.float32)
+        for start in range(0, len(self), SCORE_BLOCK):
+            block = self.vectors[start:start + SCORE_BLOCK]
+            np.copyto(buf[:len(block)], block)
+            np.matmul(Q, buf[:len(block)].T, out=sims[:, start:start + len(block)])
+        return sims
+
+    def nbytes(self) -> int:
+        return int(self.vectors.nbytes + self.components.nbytes + self.vec.idf_.nbytes)
+
+    # ---- Persistenz (Unterverzeichnis des kompilierten Index) ----
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        SortedStringIndex.from_mapping(self.vec.vocabulary_).save(directory, "char_vocab")
+        np.save(os.path.join(directory, "char_idf.npy"), self.vec.idf_)
+        np.save(os.path.join(directory, "components.npy"), self.components)
+        np.save(os.path.join(directory, "vectors.npy"), np.asarray(self.vectors, dtype=np.float16))
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        vec = make_char_vectorizer()
+        vec.vocabulary_ = SortedStringIndex.load(directory, "char_vocab", mmap_mode)
+        vec.idf_ = np.load(os.path.join(directory, "char_idf.npy"))
+        components = np.load(os.path.join(directory, "components.npy"))
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode=mmap_mode)
+        return cls(vec, components, vectors)
@@ -0,0 +1,300 @@
+"""Nicht-blockierendes, gebündeltes Logging nach Google Sheets.
+
+Alle Sessions eines Prozesses legen Zeilen in eine gemeinsame Queue. Ein
+Hintergrund-Thread sammelt sie zu ``append_rows``-Batches, wiederholt
+Fehlschläge mit exponentiellem Backoff und hält einen Mindestabstand zwischen
+zwei Requests ein (Sheets-Quota: ca. 60 Schreibzugriffe/Minute).
+
+Ist Sheets nicht erreichbar, landen die Zeilen in einer lokalen JSONL-Datei
+(``spill_path``) und werden nach dem nächsten erfolgreichen Schreiben
+nachgereicht.
+
+Nur der Worker-Thread spricht mit Sheets (Senden wie Nachreichen); ``flush``
+reiht eine Marke in die Queue und wartet, bis der Worker sie erreicht hat.
+Verbindung (``_ws``) und Request-Takt gehören damit allein dem Worker.
+
+Den Spill teilen sich alle Prozesse mit demselben ``spill_path`` (z.B.
+Streamlit-Replikate): Anhängen und Beiseiteschieben halten ``fcntl.flock`` auf
+``<spill>.lock``, Nachreichen hält ``<spill>.replay.lock`` bis die Datei
+gelöscht ist. Ein Prozess, der die Replay-Sperre nicht bekommt, überlässt das
+Nachreichen dem anderen; stirbt dieser, gibt das System die Sperre frei und
+die ``.replay``-Datei wird beim nächsten Versuch übernommen.
+
+Als Log-Ziel (hotelbot.log_sinks) nimmt ``write`` Events im gemeinsamen
+Schema ``LOG_FIELDS`` an. Beim Öffnen wird die Kopfzeile des Blatts geprüft:
+fehlt sie oder ist sie eine ältere, kürzere Fassung (z.B. ohne
+``session_id``/``arm``), wird sie auf das aktuelle Schema gesetzt.
+"""
+import atexit
+import contextlib
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: ohne Sperre, nur ein Prozess empfohlen
+    fcntl = None
+
+from . import metrics
+from .csv_log import LOG_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# HTTP-Status, bei dem Sheets "zu viele Requests" meldet
+_QUOTA_STATUS = 429
+
+
+@contextlib.contextmanager
+def _file_lock(path, blocking=True):
+    """Exklusive Sperre über Prozesse hinweg; liefert False, wenn belegt (``blocking=False``)."""
+    if fcntl is None:
+        yield True
+        return
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+    finally:
+        os.close(fd)  # gibt auch die Sperre frei
+
+
+def _status_code(exc):
+    code = getattr(exc, "code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code
+
+
+class SheetsLogWorker:
+    def __init__(self, open_worksheet, spill_path="logs_spill.jsonl", batch_size=100,
+                 flush_interval=2.0, min_interval=1.0, max_retries=4, base_backoff=1.0,
+                 max_backoff=60.0, quota_backoff=30.0, replay_interval=60.0, max_queue=10_000,
+                 fieldnames=LOG_FIELDS):
+        self._open_worksheet = open_worksheet
+        self.fieldnames = list(fieldnames)
+        self.spill_path = spill_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.quota_backoff = quota_backoff
+        self.replay_interval = replay_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._ws = None
+        self._last_request = 0.0
+        self._spill_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"sent": 0, "batches": 0, "retries": 0, "spilled": 0, "replayed": 0}
+
+    # ---- API für die Apps ----
+    def enqueue(self, row):
+        """Legt eine Zeile ab, ohne zu blockieren; volle Queue -> direkt auf Platte."""
+        try:
+            self._queue.put_nowait(list(row))
+        except queue.Full:
+            self._spill([list(row)])
+
+    def write(self, row: dict):
+        """Event im gemeinsamen Schema (Dict) als Zeile in Spaltenreihenfolge einreihen."""
+        self.enqueue([row.get(f, "") for f in self.fieldnames])
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sheets-log", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+        return self
+
+    def stop(self, timeout=10.0):
+        """Beendet den Worker; was nicht mehr rausgeht, wird gespillt."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self._thread = None
+        rest = self._drain(self._queue.qsize())
+        if rest:
+            self._spill(rest)
+
+    def close(self):
+        # Log-Ziel-Schnittstelle (hotelbot.log_sinks)
+        self.stop()
+
+    def flush(self, timeout=None) -> bool:
+        """Schreibt alles bis hierher Eingereihte und reicht den Spill nach (blockierend).
+
+        Läuft der Worker, erledigt er das: ``flush`` reiht nur eine Marke ein
+        und wartet (höchstens ``timeout`` Sekunden) auf sie. False, wenn die
+        Marke nicht rechtzeitig erreicht wurde.
+        """
+        if not self._worker_alive():
+            # Kein Worker (nicht gestartet oder beendet): hier ist niemand sonst am Senden
+            while not self._queue.empty():
+                self._send_or_spill(self._drain(self.batch_size))
+            self._replay_spill()
+            return True
+        done = threading.Event()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        while not done.wait(0.1):
+            if not self._worker_alive():
+                return done.is_set()  # stop() hat die Queue übernommen
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+        return True
+
+    def _worker_alive(self):
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    # ---- Worker ----
+    def _run(self):
+        last_replay = 0.0
+        while not self._stop.is_set():
+            batch, flushes = self._collect()
+            ok = self._send(batch) if batch else False
+            if batch and not ok:
+                self._spill(batch)
+            else:
+                # Spill nachreichen, sobald Sheets wieder antwortet (sonst nur ab und zu
+                # probieren oder wenn flush() es verlangt)
+                due = time.monotonic() - last_replay >= self.replay_interval
+                if (ok or due or flushes) and not self._stop.is_set() and self._has_spill():
+                    last_replay = time.monotonic()
+                    self._replay_spill()
+            for done in flushes:
+                done.set()
+
+    def _collect(self):
+        """Wartet bis zu flush_interval auf Zeilen, höchstens batch_size Stück.
+
+        Eine flush()-Marke beendet das Sammeln sofort; zurück kommen die
+        Zeilen und die erreichten Marken.
+        """
+        deadline = time.monotonic() + self.flush_interval
+        batch = []
+        while len(batch) < self.batch_size and not self._stop.is_set():
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                return batch, [item]
+            batch.append(item)
+        return batch, []
+
+    def _drain(self, n):
+        """Bis zu n Zeilen ohne Warten; dabei gefundene flush()-Marken gelten als erledigt."""
+        out = []
+        for _ in range(n):
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            else:
+                out.append(item)
+        return out
+
+    def _send_or_spill(self, rows):
+        if rows and not self._send(rows):
+            self._spill(rows)
+
+    def _pace(self):
+        wait = self._last_request + self.min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_request = time.monotonic()
+
+    def _send(self, rows) -> bool:
+        for attempt in range(self.max_retries + 1):
+            self._pace()
+            try:
+                with metrics.span("sheets_append"):
+                    if self._ws is None:
+                        ws = self._open_worksheet()
+                        self._ensure_header(ws)
+                        self._ws = ws
+                    self._ws.append_rows(rows, value_input_option="USER_ENTERED")
+                self.stats["sent"] += len(rows)
+                self.stats["batches"] += 1
+                return True
+            except Exception as e:
+                metrics.inc("hotelbot_logging_failures_total", sink="sheets")
+                if attempt == self.max_retries:
+                    logger.warning("Sheets-Log fehlgeschlagen (%d Zeilen gespillt): %s", len(rows), e)
+                    return False
+                self.stats["retries"] += 1
+                if _status_code(e) == _QUOTA_STATUS:
+                    delay = self.quota_backoff
+                else:
+                    self._ws = None  # Verbindung beim nächsten Versuch neu öffnen
+                    delay = min(self.base_backoff * 2 ** attempt, self.max_backoff)
+                if self._stop.wait(delay * random.uniform(0.8, 1.2)):
+                    return False
+        return False
+
+    def _ensure_header(self, ws):
+        header = [str(v) for v in ws.row_values(1)]
+        if header == self.fieldnames:
+            return
+        if header == self.fieldnames[:len(header)]:
+            # Leer oder älteres Schema mit weniger Spalten: Kopfzeile ergänzen
+            ws.update("A1", [self.fieldnames])
+        else:
+            logger.warning("Sheets-Kopfzeile %s passt nicht zum Log-Schema %s", header, self.fieldnames)
+
+    # ---- Lokaler Spill ----
+    def _spill(self, rows):
+        with self._spill_lock, _file_lock(self.spill_path + ".lock"):
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.stats["spilled"] += len(rows)
+
+    def _has_spill(self):
+        return os.path.exists(self.spill_path) or os.path.exists(self.spill_path + ".replay")
+
+    def _replay_spill(self):
+        replay = self.spill_path + ".replay"
+        with _file_lock(replay + ".lock", blocking=False) as mine:
+            if not mine:
+                return  # ein anderer Prozess reicht gerade nach
+            with self._spill_lock, _file_lock(self.spill_path + ".lock"):
+                # Datei beiseiteschieben, damit neue Spills nicht verloren gehen
+                if not os.path.exists(replay):
+                    if not os.path.exists(self.spill_path):
+                        return
+                    os.replace(self.spill_path, replay)
+            with open(replay, encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+            for start in range(0, len(rows), self.batch_size):
+                chunk = rows[start:start + self.batch_size]
+                if not self._send(chunk):
+                    # Rest zurück in den Spill, nächster Versuch später
+                    self._spill(rows[start:])
+                    self.stats["spilled"] -= len(rows) - start
+                    break
+                self.stats["replayed"] += len(chunk)
+            os.remove(replay)
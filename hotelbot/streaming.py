@@ -0,0 +1,64 @@
+"""Gestreamte Bot-Antworten statt Zeichen-für-Zeichen-Animation.
+
+Der alte Loop schickte pro Zeichen den kompletten bisherigen Text an den
+Browser (O(n²) Bytes) und schlief 10-30 ms dazwischen. Hier wird die Antwort in
+höchstens ``max_chunks`` Wort-Blöcke geteilt, die als Deltas (z.B. über
+``st.write_stream``) ausgegeben werden. Die Gesamtdauer der Animation ist auf
+``budget`` Sekunden gedeckelt, unabhängig von der Antwortlänge.
+
+Mit ``HOTELBOT_ANIMATION=off`` (Lasttests, Barrierefreiheit) entfällt jede
+Verzögerung.
+"""
+import os
+import re
+import time
+from dataclasses import dataclass
+
+_WORDS = re.compile(r"\S+\s*")
+
+
+@dataclass(frozen=True)
+class Pacing:
+    budget: float = 1.2      # Sekunden für die gesamte Textanimation
+    indicator: float = 0.5   # Sekunden "schreibt..." vor der Antwort
+    max_chunks: int = 30
+
+
+NO_DELAY = Pacing(budget=0.0, indicator=0.0)
+
+
+def pacing_from_env(default: Pacing = Pacing()) -> Pacing:
+    if os.environ.get("HOTELBOT_ANIMATION", "").lower() in ("0", "off", "false", "no"):
+        return NO_DELAY
+    budget = os.environ.get("HOTELBOT_ANIMATION_BUDGET")
+    if budget is not None:
+        return Pacing(budget=float(budget), indicator=default.indicator, max_chunks=default.max_chunks)
+    return default
+
+
+def chunk_text(text: str, max_chunks: int = 30) -> list:
+    """Teilt an Wortgrenzen in höchstens max_chunks Stücke (Leerzeichen bleiben erhalten)."""
+    words = _WORDS.findall(text)
+    if not words:
+        return [text] if text else []
+    per = -(-len(words) // max(max_chunks, 1))
+    return ["".join(words[i:i + per]) for i in range(0, len(words), per)]
+
+
+def stream_chunks(text: str, pacing: Pacing = Pacing(), sleep=time.sleep):
+    """Generator für st.write_stream: liefert Text-Deltas im Takt des Budgets."""
+    chunks = chunk_text(text, pacing.max_chunks)
+    delay = pacing.budget / len(chunks) if chunks and pacing.budget > 0 else 0.0
+    for chunk in chunks:
+        yield chunk
+        if delay:
+            sleep(delay)
+
+
+def typing_indicator(placeholder, pacing: Pacing = Pacing(), sleep=time.sleep, steps=3):
+    """Zeigt kurz "schreibt..." im Placeholder und räumt ihn danach ab."""
+    if pacing.indicator > 0:
+        for i in range(steps):
+            placeholder.markdown(f"_schreibt{'.' * (i + 1)}_")
+            sleep(pacing.indicator / steps)
+    placeholder.empty()
@@ -0,0 +1,166 @@
+"""Zeichenketten im kompilierten Index: UTF-8-Blob plus Offsets, per mmap teilbar.
+
+``StringTable``: alle Strings hintereinander als ein ``uint8``-Blob, String i
+liegt in ``blob[offsets[i]:offsets[i + 1]]``. Beide Arrays sind ``.npy`` und
+werden read-only gemappt; mehrere Worker-Prozesse teilen sich dieselben
+physischen Seiten, dekodiert wird erst beim Zugriff auf eine Zeile.
+
+``SortedStringIndex``: Abbildung String -> Zahl ohne Python-Dict. Die
+Schlüssel liegen als ``StringTable`` in UTF-8-Bytefolge sortiert (= Reihenfolge
+der Codepoints), dazu die ersten 8 Bytes je Schlüssel als big-endian
+``uint64``. Nachgeschlagen wird per ``searchsorted`` über diese Präfixe (für
+viele Schlüssel auf einmal) und Binärsuche im verbleibenden Bereich.
+"""
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+PREFIX_BYTES = 8
+
+
+class StringTable:
+    """Unveränderliche Folge von Strings; Indizierung wie bei einem 1-D-Array."""
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets  # int64, Länge n + 1
+        self.blob = blob        # uint8
+
+    @classmethod
+    def from_strings(cls, strings):
+        encoded = [str(s).encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def raw(self, i) -> bytes:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            n = len(self)
+            if not -n <= key < n:
+                raise IndexError(f"Zeile {key} außerhalb von 0..{n - 1}")
+            return self.raw(key % n).decode("utf-8")
+        # Slices, Masken und Index-Arrays: object-Array wie bei NumPy
+        rows = np.arange(len(self))[key]
+        out = np.empty(len(rows), dtype=object)
+        out[:] = [self.raw(i).decode("utf-8") for i in rows]
+        return out
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.raw(i).decode("utf-8")
+
+    def __array__(self, dtype=None, copy=None):
+        return self[:] if dtype is None else self[:].astype(dtype)
+
+    def astype(self, dtype):
+        return np.asarray(self, dtype=dtype)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.offsets.nbytes + self.blob.nbytes)
+
+    # ---- Persistenz ----
+    def save(self, directory, name):
+        np.save(os.path.join(directory, f"{name}_offsets.npy"), np.asarray(self.offsets, dtype=np.int64))
+        np.save(os.path.join(directory, f"{name}_blob.npy"), np.asarray(self.blob, dtype=np.uint8))
+
+    @classmethod
+    def load(cls, directory, name, mmap_mode="r"):
+        offsets = np.load(os.path.join(directory, f"{name}_offsets.npy"), mmap_mode=mmap_mode)
+        blob = np.load(os.path.join(directory, f"{name}_blob.npy"), mmap_mode=mmap_mode)
+        return cls(offsets, blob)
+
+
+def _prefixes(encoded):
+    """Erste PREFIX_BYTES Bytes je Schlüssel, mit Nullen aufgefüllt, als uint64."""
+    joined = b"".join(b[:PREFIX_BYTES].ljust(PREFIX_BYTES, b"\0") for b in encoded)
+    return np.frombuffer(joined, dtype=">u8").astype(np.uint64)
+
+
+class SortedStringIndex(Mapping):
+    """String -> int über sortierte Schlüssel; lesbar wie ein Dict (``get``, ``in``, ``items``)."""
+
+    def __init__(self, keys: StringTable, values, prefixes):
+        self.keys_table = keys
+        self.values_array = values
+        self.prefixes = prefixes
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        items = sorted((str(k).encode("utf-8"), int(v)) for k, v in mapping.items())
+        encoded = [k for k, _ in items]
+        keys = StringTable.from_strings(k.decode("utf-8") for k in encoded)
+        return cls(keys, np.array([v for _, v in items], dtype=np.int64), _prefixes(encoded))
+
+    def _find(self, key: bytes, lo, hi) -> int:
+        # Binärsuche in [lo, hi) (Schlüssel mit gleichem Präfix); -1 = nicht vorhanden
+        table = self.keys_table
+        while lo < hi:
+            mid = (lo + hi) // 2
+            k = table.raw(mid)
+            if k == key:
+                return mid
+            if k < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return -1
+
+    def lookup(self, keys) -> np.ndarray:
+        """Werte für viele Schlüssel auf einmal; -1 für unbekannte."""
+        encoded = [str(k).encode("utf-8") for k in keys]
+        out = np.full(len(encoded), -1, dtype=np.int64)
+        if not encoded or not len(self):
+            return out
+        p = _prefixes(encoded)
+        lo = np.searchsorted(self.prefixes, p, side="left")
+        hi = np.searchsorted(self.prefixes, p, side="right")
+        for i in np.flatnonzero(hi > lo):
+            pos = self._find(encoded[i], int(lo[i]), int(hi[i]))
+            if pos >= 0:
+                out[i] = self.values_array[pos]
+        return out
+
+    def get(self, key, default=None):
+        value = int(self.lookup([key])[0])
+        return default if value < 0 else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self.keys_table)
+
+    def __iter__(self):
+        return iter(self.keys_table)
+
+    def items(self):
+        return zip(self.keys_table, (int(v) for v in self.values_array))
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.keys_table.nbytes + self.values_array.nbytes + self.prefixes.nbytes)
+
+    # ---- Persistenz ----
+    def save(self, directory, name):
+        self.keys_table.save(directory, name)
+        np.save(os.path.join(directory, f"{name}_values.npy"), self.values_array)
+        np.save(os.path.join(directory, f"{name}_prefix.npy"), self.prefixes)
+
+    @classmethod
+    def load(cls, directory, name, mmap_mode="r"):
+        return cls(StringTable.load(directory, name, mmap_mode),
+                   np.load(os.path.join(directory, f"{name}_values.npy"), mmap_mode=mmap_mode),
+                   np.load(os.path.join(directory, f"{name}_prefix.npy"), mmap_mode=mmap_mode))
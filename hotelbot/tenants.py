@@ -0,0 +1,201 @@
+"""Mandanten-Registry: ein Prozess bedient die KBs mehrerer Hotels.
+
+Konfiguration (JSON, Pfad über ``HOTELBOT_TENANTS``)::
+
+    {
+      "default": "bellevue",
+      "memory_budget_mb": 1024,
+      "tenants": {
+        "bellevue": "answers.csv",
+        "seeblick": "kb/seeblick.csv"
+      }
+    }
+
+Ohne Konfiguration gibt es genau einen Mandanten ``default`` mit
+``answers.csv`` – das bisherige Verhalten.
+
+* Eine KB wird erst bei der ersten Anfrage ihres Mandanten geladen (aus dem
+  kompilierten Index, mit Hot-Reload wie bisher).
+* Gleichzeitige erste Anfragen teilen sich *einen* Ladevorgang; alle weiteren
+  warten auf dessen Ergebnis (bzw. dessen Fehler).
+* Übersteigt der geschätzte Speicher aller geladenen KBs ``memory_budget``,
+  werden die am längsten nicht genutzten entladen (LRU). Die gerade benötigte
+  KB bleibt immer geladen, auch wenn sie allein über dem Budget liegt.
+  ``on_unload``-Listener (z.B. der Antwort-Cache) erfahren davon.
+* Snapshots tragen den Mandanten-Namen als ``source``.
+
+Mandanten-Namen kommen nur aus der Konfiguration; Nutzereingaben werden nie
+zu Dateipfaden zusammengesetzt.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from . import metrics
+from .live import LiveKnowledgeBase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+DEFAULT_MEMORY_BUDGET = 1024 * 1024 * 1024
+
+
+class UnknownTenant(KeyError):
+    pass
+
+
+def load_tenant_config(path=None) -> dict:
+    """Liest die Mandanten-Konfiguration; ohne Datei ein einzelner Default-Mandant."""
+    path = path or os.environ.get("HOTELBOT_TENANTS")
+    if not path:
+        return {"default": DEFAULT_TENANT, "tenants": {DEFAULT_TENANT: "answers.csv"}}
+    with open(path, encoding="utf-8") as f:
+        cfg = json.load(f)
+    if "tenants" not in cfg:  # Kurzform: {"bellevue": "answers.csv", ...}
+        cfg = {"tenants": cfg}
+    base = os.path.dirname(os.path.abspath(path))
+    cfg["tenants"] = {name: p if os.path.isabs(p) else os.path.join(base, p)
+                      for name, p in cfg["tenants"].items()}
+    cfg.setdefault("default", next(iter(cfg["tenants"]), DEFAULT_TENANT))
+    return cfg
+
+
+class TenantRegistry:
+    def __init__(self, tenants: dict, default=DEFAULT_TENANT, memory_budget=DEFAULT_MEMORY_BUDGET,
+                 scoring="dot", loader=None, vectorizer="tfidf"):
+        self.tenants = dict(tenants)
+        self.default = default
+        self.memory_budget = memory_budget
+        self.scoring = scoring
+        self.vectorizer = vectorizer
+        self._loader = loader or (lambda path: LiveKnowledgeBase(path, scoring=self.scoring,
+                                                                 vectorizer=self.vectorizer).start())
+        self._lock = threading.Lock()
+        self._loaded = OrderedDict()  # Mandant -> LiveKnowledgeBase, ältester zuerst
+        self._loading = {}            # Mandant -> Future des laufenden Ladevorgangs
+        self._listeners = []
+        self._unload_listeners = []
+        self.stats = {"loads": 0, "evictions": 0, "shared_waits": 0}
+
+    @classmethod
+    def from_config(cls, path=None, scoring="dot", vectorizer="tfidf"):
+        cfg = load_tenant_config(path)
+        budget_mb = os.environ.get("HOTELBOT_KB_MEMORY_MB", cfg.get("memory_budget_mb"))
+        budget = int(float(budget_mb) * 2**20) if budget_mb else DEFAULT_MEMORY_BUDGET
+        return cls(cfg["tenants"], default=cfg["default"], memory_budget=budget, scoring=scoring,
+                   vectorizer=vectorizer)
+
+    def resolve(self, tenant=None) -> str:
+        tenant = tenant or self.default
+        if tenant not in self.tenants:
+            raise UnknownTenant(tenant)
+        return tenant
+
+    def get(self, tenant=None) -> LiveKnowledgeBase:
+        """Live-KB des Mandanten; lädt beim ersten Zugriff (single-flight)."""
+        tenant = self.resolve(tenant)
+        with self._lock:
+            live = self._loaded.get(tenant)
+            if live is not None:
+                self._loaded.move_to_end(tenant)
+                return live
+            fut = self._loading.get(tenant)
+            owner = fut is None
+            if owner:
+                fut = self._loading[tenant] = Future()
+            else:
+                self.stats["shared_waits"] += 1
+        if not owner:
+            return fut.result()
+        try:
+            live = self._load(tenant)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[tenant]
+            fut.set_exception(e)
+            raise
+        with self._lock:
+            del self._loading[tenant]
+            self._loaded[tenant] = live
+            evicted = self._evict_locked(keep=tenant)
+        fut.set_result(live)
+        for name, old in evicted:
+            old.stop()
+            self._notify_unload(name)
+            logger.info("Mandant %s entladen (Speicherbudget)", name)
+        return live
+
+    def _load(self, tenant):
+        t0 = time.perf_counter()
+        live = self._loader(self.tenants[tenant])
+        elapsed = time.perf_counter() - t0
+        live.name = tenant
+        for fn in self._listeners:
+            live.subscribe(fn)
+        live.subscribe(lambda kb, tenant=tenant: self._update_size(tenant, kb))
+        self.stats["loads"] += 1
+        metrics.inc("hotelbot_tenant_loads_total", tenant=tenant)
+        metrics.set_gauge("hotelbot_tenant_load_seconds", elapsed, tenant=tenant)
+        self._update_size(tenant, live.current())
+        logger.info("Mandant %s geladen: %d Fragen in %.2fs", tenant, len(live.current()), elapsed)
+        return live
+
+    @staticmethod
+    def _update_size(tenant, kb):
+        metrics.set_gauge("hotelbot_tenant_resident_bytes", kb.nbytes(), tenant=tenant)
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(live.current().nbytes() for live in self._loaded.values())
+
+    def _evict_locked(self, keep):
+        evicted = []
+        total = sum(live.current().nbytes() for live in self._loaded.values())
+        for name in list(self._loaded):
+            if total <= self.memory_budget:
+                break
+            if name == keep:
+                continue
+            live = self._loaded.pop(name)
+            total -= live.current().nbytes()
+            evicted.append((name, live))
+            self.stats["evictions"] += 1
+            metrics.inc("hotelbot_tenant_evictions_total", tenant=name)
+            metrics.set_gauge("hotelbot_tenant_resident_bytes", 0, tenant=name)
+        return evicted
+
+    def subscribe(self, fn):
+        """fn(kb) nach jedem Index-Tausch irgendeines Mandanten (z.B. Cache leeren)."""
+        with self._lock:
+            self._listeners.append(fn)
+            for live in self._loaded.values():
+                live.subscribe(fn)
+        return fn
+
+    def on_unload(self, fn):
+        """fn(tenant) nachdem ein Mandant entladen wurde (Budget oder ``close``)."""
+        with self._lock:
+            self._unload_listeners.append(fn)
+        return fn
+
+    def _notify_unload(self, tenant):
+        for fn in list(self._unload_listeners):
+            try:
+                fn(tenant)
+            except Exception:
+                logger.exception("Entlade-Listener fehlgeschlagen")
+
+    def loaded(self) -> list:
+        with self._lock:
+            return list(self._loaded)
+
+    def close(self):
+        with self._lock:
+            loaded, self._loaded = list(self._loaded.items()), OrderedDict()
+        for name, live in loaded:
+            live.stop()
+            self._notify_unload(name)
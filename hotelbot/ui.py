@@ -0,0 +1,368 @@
+"""Streamlit-Oberfläche, gemeinsam für alle Personas.
+
+Die Einstiegsskripte rufen nur ``run_app`` auf:
+    chat.py       -> Persona je Session (deterministisch aus der Session-ID)
+    app.py        -> fest Chatino (KI)
+    app_human.py  -> fest Sarah (Mitarbeiterin)
+
+KB-Registry, Antwort-Cache und Log-Ziele (``HOTELBOT_LOG_SINKS``) sind per
+``st.cache_resource`` prozessweit einmal vorhanden, egal wie viele Personas
+ein Server bedient. Mehrere Hotels: ``HOTELBOT_TENANTS`` (siehe
+hotelbot.tenants), Auswahl je Session per ``?tenant=…``.
+"""
+import os
+import uuid
+
+import streamlit as st
+
+from . import assets, engine, metrics
+from .answer_cache import AnswerCache
+from .history import ChatHistory, window_from_env
+from .log_sinks import LOG_FIELDS, make_event, open_sinks
+from .personas import DEFAULT_ARMS, assign_arm, get_persona
+from .streaming import pacing_from_env, stream_chunks, typing_indicator
+from .tenants import TenantRegistry, UnknownTenant
+
+LOG_PATH = "logs.csv"
+# "dot" (Standard) oder "hybrid" für den semantischen LSA-Modus
+SCORING = os.environ.get("HOTELBOT_SCORING", "dot")
+# "tfidf" (Standard) oder "hashing": feste Spalten, neue Fragen ohne Refit
+VECTORIZER = os.environ.get("HOTELBOT_VECTORIZER", "tfidf")
+SHEET_HEADER = LOG_FIELDS
+# Log-Ziele (hotelbot.log_sinks), z.B. "csv,sqlite:logs.db,sheets"
+LOG_SINKS = os.environ.get("HOTELBOT_LOG_SINKS", f"csv:{LOG_PATH},sheets")
+
+CSS = """
+<style>
+/* ========== Design Preset: Hotel Bellevue Grand ========== */
+
+/* — Farben & Typo — */
+:root{
+  --brand:#8fd1f2;     /* Primärfarbe */
+  --brand-2:#3B6EA8;   /* Akzent */
+  --bg:#F6F7F9;        /* App-Hintergrund */
+  --card:#FFFFFF;      /* Karten / Bubbles */
+  --muted:#6B7280;     /* Sekundärtext */
+  --border:#E6E8EC;    /* Ränder */
+  --shadow:0 8px 24px rgba(15,23,42,0.08);
+}
+@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap');
+html, body, [data-testid="stAppViewContainer"] *{
+  font-family:'Inter', system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif;
+}
+
+/* — App-Layout — */
+[data-testid="stAppViewContainer"]{ background:var(--bg); }
+main [data-testid="block-container"]{
+  max-width: 980px;
+  padding-top: 0rem;
+  padding-bottom: 2rem;
+  padding-right: 290px; /* Platz rechts für Sidepanel */
+}
+
+/* Buttons */
+.stButton button{
+  border-radius: 12px;
+  background: var(--brand);
+  color:#fff;
+  border:1px solid var(--brand);
+  padding:.55rem .9rem;
+  box-shadow: var(--shadow);
+  font-weight:600;
+}
+.stButton button:hover{ filter: brightness(1.05); }
+.stButton button:active{ transform: translateY(1px); }
+
+
+
+
+/* Scrollbar */
+::-webkit-scrollbar{ width:10px; }
+::-webkit-scrollbar-thumb{
+  background:#C9D4E3; border-radius:8px; border:2px solid transparent; background-clip: padding-box;
+}
+::-webkit-scrollbar-track{ background:transparent; }
+
+/* Fixiertes Seitenpanel */
+.fixed-sidebox{
+  position:fixed;
+  top:120px;  /* tiefer wegen Header-Bild */
+  right:24px;
+  width:230px;
+  background:#ffffff;
+  border:1px solid var(--border);
+  border-radius:16px;
+  box-shadow: var(--shadow);
+  text-align:center;
+  padding:16px 14px 18px;
+  z-index:1000;
+}
+.fixed-sidebox h3{
+  margin:10px 0 0;
+  color:var(--brand);
+  font-weight:700;
+  font-size:22px;
+  line-height:1.2;
+}
+.fixed-sidebox img{
+  display:block;
+  margin:2px auto 6px;
+  max-width:65%;
+  height:auto;
+  border-radius:12px;
+}
+@media (max-width: 1100px){
+  main [data-testid="block-container"]{ padding-right: 0; }
+}
+@media (max-width:900px){
+  .fixed-sidebox{ display:none; }
+}
+</style>
+"""
+
+
+# ---- Bilder: einmalig auf Anzeigegröße verkleinert, per Static Serving ausgeliefert ----
+@st.cache_resource(show_spinner=False)
+def image_src(path: str, size: tuple) -> str:
+    return assets.image_src(path, size, static_serving=st.get_option("server.enableStaticServing"))
+
+@st.cache_resource(show_spinner=False)
+def avatar(path: str) -> str:
+    return assets.thumbnail(path, assets.AVATAR_SIZE) or path
+
+
+# ---- Daten laden & Helfer ----
+@st.cache_resource
+def tenant_registry():
+    # Prozessweit eine Registry; KBs werden je Mandant bei Bedarf geladen und entladen
+    return TenantRegistry.from_config(scoring=SCORING, vectorizer=VECTORIZER)
+
+def load_kb(tenant=None):
+    # Live-KB des Mandanten; Änderungen an der CSV werden im Hintergrund übernommen
+    return tenant_registry().get(tenant)
+
+@st.cache_resource
+def answer_cache():
+    # LRU über normalisierte Anfragen; Einträge eines Mandanten fallen bei Neuaufbau und Entladen weg
+    return AnswerCache().bind(tenant_registry())
+
+@st.cache_resource(show_spinner=False)
+def metrics_exporter():
+    # Einmal pro Prozess: /metrics-Port bzw. Datei-Dump laut HOTELBOT_METRICS_*
+    return metrics.start_from_env()
+
+def find_best_answer(user_text, kb, threshold=0.30, topk=3):
+    return engine.find_best_answer(user_text, kb, threshold=threshold, topk=topk, cache=answer_cache())
+
+def answer_query(user_text, kb, threshold=0.30, topk=3):
+    return engine.answer_query(user_text, kb, threshold=threshold, topk=topk, cache=answer_cache())
+
+
+# ---- Google Sheets ----
+# Scopes: Sheets lesen/schreiben + Drive lesen (für open_by_…)
+_SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive.readonly"
+]
+
+@st.cache_resource(show_spinner=False)
+def _get_gsheet_client():
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    creds = Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"],
+        scopes=_SCOPES
+    )
+    return gspread.authorize(creds)
+
+@st.cache_resource(show_spinner=False)
+def _open_worksheet():
+    import gspread
+
+    gc = _get_gsheet_client()
+    ss_conf = st.secrets["sheets"]
+    # Öffnen per Name ODER per ID (falls in secrets gesetzt)
+    if "spreadsheet_id" in ss_conf and ss_conf["spreadsheet_id"]:
+        sh = gc.open_by_key(ss_conf["spreadsheet_id"])
+    else:
+        sh = gc.open(ss_conf["spreadsheet_name"])
+    try:
+        ws = sh.worksheet(ss_conf.get("worksheet_name", "Logs"))
+    except gspread.WorksheetNotFound:
+        # Falls Blatt nicht existiert: anlegen und Header setzen
+        ws = sh.add_worksheet(title=ss_conf.get("worksheet_name", "Logs"), rows="1000", cols="10")
+        ws.update("A1", [SHEET_HEADER])
+    return ws
+
+@st.cache_resource(show_spinner=False)
+def _log_sink():
+    # Ein Fan-out pro Prozess über alle Log-Ziele, gemeinsam für alle Sessions und Personas
+    return open_sinks(LOG_SINKS, open_worksheet=_open_worksheet, spill_path="logs_spill.jsonl")
+
+def log_event(user_text, picked_id, sim):
+    event = make_event(user_text, picked_id, sim, session_id=st.session_state.get("session_id", ""),
+                       arm=st.session_state.get("arm", ""))
+    # Blockiert nicht: CSV/SQLite puffern, Sheets sendet im Hintergrund (Retry, lokaler Spill)
+    _log_sink().write(event)
+
+
+# ---- Session & Persona ----
+def session_persona(persona=None, arms=DEFAULT_ARMS):
+    """Persona der Session: fest vorgegeben, per ?persona=…, sonst aus der Session-ID."""
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    if "arm" not in st.session_state:
+        arm = persona or st.query_params.get("persona")
+        if arm not in arms:
+            arm = assign_arm(st.session_state.session_id, arms)
+        st.session_state.arm = arm
+    return get_persona(st.session_state.arm)
+
+
+def session_history() -> ChatHistory:
+    """Begrenzter Verlauf der Session (Fenster laut ``HOTELBOT_HISTORY_WINDOW``).
+
+    Kann kein Log-Ziel Sessions nachlesen (nur Sheets), wird nicht gekürzt –
+    sonst wären ältere Turns für die Session verloren.
+    """
+    if "history" not in st.session_state:
+        window = window_from_env() if _log_sink().can_reload else None
+        st.session_state.history = ChatHistory(window)
+    return st.session_state.history
+
+
+def _load_earlier(history, kb, fallback):
+    # Callback des "Frühere Nachrichten"-Buttons: nächste Seite aus dem Log (CSV oder SQLite)
+    session_id = st.session_state.get("session_id", "")
+    history.load_earlier(lambda n: _log_sink().session_rows(session_id, n),
+                         lambda pid: (kb.answer_by_id(pid) if pid else None) or fallback)
+
+
+def _pick_quick_reply(question):
+    # Callback der Vorschlags-Buttons: Frage wird im nächsten Lauf wie eine Eingabe behandelt
+    st.session_state.quick_reply = question
+
+
+def render_quick_replies(related, near_miss):
+    """Vorschläge zur letzten Antwort als Buttons (aus dem vorberechneten Graphen)."""
+    if not related:
+        return
+    st.caption("Meinten Sie vielleicht:" if near_miss else "Ähnliche Fragen:")
+    for col, (qid, question) in zip(st.columns(len(related)), related):
+        with col:
+            st.button(question, key=f"qr_{qid}", on_click=_pick_quick_reply, args=(question,))
+
+
+def session_tenant():
+    """Mandant der Session: einmalig aus ``?tenant=…``, sonst der konfigurierte Default."""
+    if "tenant" not in st.session_state:
+        st.session_state.tenant = tenant_registry().resolve(st.query_params.get("tenant"))
+    return st.session_state.tenant
+
+
+# ---- Seitenaufbau ----
+def render_header(p):
+    header_src = image_src("bed.jpg", assets.HEADER_SIZE)
+    subtitle = f"Schnelle Hilfe beim Check-in, Zimmer & mehr mit unserem {p.label}"
+    if header_src:
+        st.markdown(
+            f"""
+            <div style='position:relative; text-align:center; margin-top:-30px; margin-bottom:0.5rem;'>
+                <img src='{header_src}'
+                     alt='Hotel Header'
+                     style='width:100%; max-height:180px; object-fit:cover; border-radius:0 0 20px 20px;
+                            box-shadow:0 4px 14px rgba(0,0,0,0.15);'>
+                <div style='position:absolute; bottom:25px; left:0; width:100%; text-align:center; color:white;
+                            text-shadow:0 2px 6px rgba(0,0,0,0.5);'>
+                    <h1 style='font-size:2.2rem; margin-bottom:0.2rem;'>🏨 Hotel Bellevue Grand</h1>
+                    <p style='font-size:1.05rem; margin-top:0;'>{subtitle}</p>
+                </div>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+    else:
+        st.markdown(
+            "<div style='text-align:center; margin-bottom:0.5rem;'>"
+            "<h1 style='margin-bottom:0.2rem;'>🏨 Hotel Bellevue Grand</h1>"
+            f"<p style='margin-top:0; color:#666;'>{subtitle}</p>"
+            "</div>",
+            unsafe_allow_html=True
+        )
+
+
+def render_sidebox(p):
+    logo_src = image_src(p.logo, assets.SIDEBOX_LOGO_SIZE)
+    img_tag = f"<img src='{logo_src}' alt='Chatbot Logo'>" if logo_src else ""
+    st.markdown(CSS + f"""
+<div class="fixed-sidebox">
+{img_tag}
+<p style='margin:0; font-weight:600; font-size:14px;'>{p.name}</p>
+<h3>{p.label}</h3>
+</div>
+""", unsafe_allow_html=True)
+
+
+def run_app(persona=None, arms=DEFAULT_ARMS):
+    """Komplette Chat-Seite; persona=None verteilt Sessions auf ``arms``."""
+    p = session_persona(persona, arms)
+    st.set_page_config(page_title=p.page_title, page_icon="💬")
+    render_header(p)
+    render_sidebox(p)
+
+    metrics_exporter()
+    pacing = pacing_from_env()  # HOTELBOT_ANIMATION=off für Lasttests/Barrierefreiheit
+    try:
+        kb = load_kb(session_tenant()).current()
+    except UnknownTenant as e:
+        st.error(f"Unbekanntes Hotel: {e.args[0]}")
+        st.stop()
+
+    # ---- Initiale Begrüßung (bleibt immer stehen) ----
+    history = session_history()
+    with st.chat_message("assistant", avatar=avatar(p.avatar)):
+        st.write(p.greeting)
+
+    # ---- Verlauf anzeigen: letzte Turns, ältere aus dem Log auf Abruf ----
+    if history.hidden():
+        st.button(f"Frühere Nachrichten ({history.hidden()})", key="btn_earlier",
+                  on_click=_load_earlier, args=(history, kb, p.fallback))
+    for turn in history.visible():
+        with st.chat_message("user", avatar=avatar("User-Icon.png")):
+            st.write(turn.user_text)
+        with st.chat_message("assistant", avatar=avatar(p.avatar)):
+            st.write(turn.answer)
+    render_quick_replies(*st.session_state.get("related", ([], False)))
+
+    # ---- Eingabe (Textfeld oder Klick auf einen Vorschlag) ----
+    quick_reply = st.session_state.pop("quick_reply", None)
+    user_msg = st.chat_input("Frag mich etwas …") or quick_reply
+    if not user_msg:
+        return
+
+    with st.chat_message("user", avatar=avatar("User-Icon.png")):
+        st.write(user_msg)
+
+    res = answer_query(user_msg, kb, threshold=p.threshold, topk=3)
+    if res.picked_id is None:
+        bot_text = p.fallback
+        picked_id = ""
+    else:
+        bot_text = res.answer
+        picked_id = res.picked_id
+    st.session_state.related = (res.related, res.picked_id is None)
+
+    # ---- Chatbot-Antwort als Stream (Gesamtdauer gedeckelt, siehe pacing) ----
+    with st.chat_message("assistant", avatar=avatar(p.avatar)):
+        with metrics.span("animation"):
+            typing_indicator(st.empty(), pacing)
+            st.write_stream(stream_chunks(bot_text, pacing))
+
+    # Turn in den Verlauf; fällt er später aus dem Fenster, steht er noch im Log
+    history.add(user_msg, picked_id, bot_text)
+
+    # Logging
+    log_event(user_msg, picked_id, res.similarity if res.picked_id is not None else 0.0)
+
+    st.rerun()
@@ -0,0 +1,268 @@
+"""Offline-Auswertung: unbeantwortete Gästefragen aus dem Log clustern.
+
+Liest ``logs.csv`` (und rotierte ``logs.*.csv``, ``logs.db`` oder einen
+CSV-Export des Sheets-Tabs "Logs") in Blöcken und sammelt Fragen ohne Treffer
+(``picked_id`` leer) oder mit knappem Score (``similarity`` unter
+``low_similarity``). Speicher hängt nicht an der Zeilenzahl, sondern an der
+Zahl *verschiedener* Fragen: gezählt wird je normalisierter Frage
+(``normalize_query``); wird ``max_distinct`` überschritten, fallen die
+seltensten Einzelfälle weg (als ``pruned`` ausgewiesen).
+
+Die Fragen werden mit dem Analyzer der KB (Wort-1/2-Gramme, hotelbot.analyzer)
+in TF-IDF-Vektoren über ihrem eigenen Vokabular übersetzt – unbekannte Wörter
+sind hier ja gerade interessant – und gierig nach Häufigkeit geclustert: die
+häufigste noch freie Frage eröffnet einen Cluster, jede weitere schließt sich
+dem ähnlichsten Cluster-Anführer an (Kosinus >= ``threshold``). Die
+Ähnlichkeiten werden blockweise als dünne Produkte gerechnet, je Block
+höchstens ``MAX_DENSE_CELLS`` dichte Zellen.
+
+Ausgabe: CSV mit Clustern absteigend nach Häufigkeit, Beispiel-Formulierungen
+und (mit ``kb``) der nächstgelegenen KB-Frage – hoher Score heißt eher
+"Paraphrase fehlt", niedriger "Thema fehlt".
+
+    python -m hotelbot unanswered logs.csv logs.*.csv -o unanswered_clusters.csv --kb answers.csv
+"""
+import csv
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.sparse as sp
+
+from .analyzer import word_ngrams
+from .answer_cache import normalize_query
+from .engine import MAX_DENSE_CELLS, NGRAM_RANGE
+from .log_sinks import SQLITE_SUFFIXES, iter_sqlite_chunks
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_LOW_SIMILARITY = 0.35
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_MAX_DISTINCT = 500_000
+CLUSTER_BLOCK = 1024
+
+CLUSTER_FIELDS = ["rank", "count", "share", "variants", "representative", "examples",
+                  "nearest_id", "nearest_question", "nearest_similarity"]
+
+
+@dataclass
+class Cluster:
+    count: int
+    variants: int
+    representative: str
+    examples: list
+    nearest_id: str = ""
+    nearest_question: str = ""
+    nearest_similarity: float = 0.0
+
+
+def iter_log_chunks(paths, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Log-Zeilen (Dicts) in Blöcken zu höchstens ``chunk_rows``, Datei für Datei.
+
+    SQLite-Logs (``logs.db``, hotelbot.log_sinks) werden schreibgeschützt gelesen.
+    """
+    chunk = []
+    for path in paths:
+        if path.lower().endswith(SQLITE_SUFFIXES):
+            for rows in iter_sqlite_chunks(path, chunk_rows):
+                chunk.extend(rows)
+                while len(chunk) >= chunk_rows:
+                    yield chunk[:chunk_rows]
+                    chunk = chunk[chunk_rows:]
+            continue
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                chunk.append(row)
+                if len(chunk) >= chunk_rows:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+
+def _is_unanswered(row, low_similarity) -> bool:
+    if not (row.get("picked_id") or "").strip():
+        return True
+    try:
+        return float(row.get("similarity") or 0) < low_similarity
+    except ValueError:
+        return True
+
+
+def collect_unanswered(paths, low_similarity=DEFAULT_LOW_SIMILARITY, chunk_rows=DEFAULT_CHUNK_ROWS,
+                       max_distinct=DEFAULT_MAX_DISTINCT):
+    """Zählt unbeantwortete Fragen je normalisierter Form.
+
+    Liefert ([(Originaltext, Anzahl)] absteigend nach Anzahl, stats).
+    """
+    counts = {}  # normalisierte Frage -> [Anzahl, erste Originalformulierung]
+    stats = {"rows": 0, "unanswered": 0, "pruned": 0}
+    for chunk in iter_log_chunks(paths, chunk_rows):
+        stats["rows"] += len(chunk)
+        for row in chunk:
+            if not _is_unanswered(row, low_similarity):
+                continue
+            text = (row.get("user_text") or "").strip()
+            key = normalize_query(text)
+            if not key:
+                continue
+            stats["unanswered"] += 1
+            entry = counts.get(key)
+            if entry is None:
+                counts[key] = [1, text]
+            else:
+                entry[0] += 1
+        if len(counts) > max_distinct:
+            stats["pruned"] += _prune(counts, max_distinct)
+    stats["distinct"] = len(counts)
+    ranked = sorted(counts.values(), key=lambda e: -e[0])
+    return [(text, n) for n, text in ranked], stats
+
+
+def _prune(counts, max_distinct) -> int:
+    # Seltenste zuerst verwerfen, bis höchstens 80 % von max_distinct übrig sind
+    target = int(max_distinct * 0.8)
+    cutoff, dropped = 1, 0
+    while len(counts) > target:
+        for key in [k for k, e in counts.items() if e[0] <= cutoff]:
+            dropped += counts.pop(key)[0]
+        cutoff += 1
+    return dropped
+
+
+def vectorize(texts, ngram_range=NGRAM_RANGE):
+    """TF-IDF (smooth idf, L2) über dem Vokabular der Texte selbst; CSR, float32."""
+    vocab, indptr, indices, data = {}, [0], [], []
+    for text in texts:
+        tf = {}
+        for term in word_ngrams(text, ngram_range):
+            col = vocab.setdefault(term, len(vocab))
+            tf[col] = tf.get(col, 0) + 1
+        indices.extend(tf)
+        data.extend(tf.values())
+        indptr.append(len(indices))
+    X = sp.csr_matrix((np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32),
+                       np.asarray(indptr, dtype=np.int64)), shape=(len(texts), len(vocab)))
+    df = np.bincount(X.indices, minlength=len(vocab))
+    idf = (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+    X.data *= idf[X.indices]
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    X = sp.diags(1 / norms).astype(np.float32) @ X
+    X.sort_indices()
+    return X.tocsr()
+
+
+def _best_leader(Xb, L):
+    """Bester Anführer (Score, Cluster) je Zeile von ``Xb``; Anführer-Zeilen ``L``.
+
+    Gerechnet in Anführer-Blöcken, damit die dichte Scorematrix höchstens
+    ``MAX_DENSE_CELLS`` Zellen hat; Gleichstände zum früheren Cluster.
+    """
+    best = np.full(Xb.shape[0], -1.0, dtype=np.float32)
+    arg = np.zeros(Xb.shape[0], dtype=np.int64)
+    step = max(1, MAX_DENSE_CELLS // max(Xb.shape[0], 1))
+    for start in range(0, L.shape[0], step):
+        sims = (Xb @ L[start:start + step].T).toarray()
+        j = sims.argmax(axis=1)
+        s = sims[np.arange(len(j)), j]
+        better = s > best
+        best[better], arg[better] = s[better], j[better] + start
+    return best, arg
+
+
+def cluster(X, threshold=DEFAULT_THRESHOLD, block=CLUSTER_BLOCK):
+    """Gierige Anführer-Clusterung in Zeilenreihenfolge (häufigste zuerst).
+
+    Liefert (Cluster-Nummer je Zeile, Zeile des Anführers je Cluster).
+    """
+    n = X.shape[0]
+    labels = np.full(n, -1, dtype=np.int64)
+    leaders = []
+    L = X[:0]  # Zeilen der Anführer aus früheren Blöcken
+    for start in range(0, n, block):
+        Xb = X[start:start + block]
+        best, arg = _best_leader(Xb, L)
+        inner = (Xb @ Xb.T).toarray()
+        # Bester Anführer aus diesem Block je Zeile, nachgeführt sobald einer
+        # dazukommt (eine Spalte von inner) statt je Zeile über alle zu suchen
+        local_best = np.full(Xb.shape[0], -np.inf, dtype=inner.dtype)
+        local_label = np.zeros(Xb.shape[0], dtype=np.int64)
+        local_rows = []
+        for i in range(Xb.shape[0]):
+            sim, label = best[i], arg[i]
+            if local_best[i] > sim:
+                sim, label = local_best[i], local_label[i]
+            if Xb.indptr[i] == Xb.indptr[i + 1]:
+                sim = -1.0  # ohne Terme: eigener Cluster
+            if sim >= threshold:
+                labels[start + i] = label
+            else:
+                labels[start + i] = len(leaders)
+                col = inner[i + 1:, i]
+                better = col > local_best[i + 1:]  # Gleichstand: früherer Anführer bleibt
+                local_best[i + 1:][better] = col[better]
+                local_label[i + 1:][better] = len(leaders)
+                local_rows.append(i)
+                leaders.append(start + i)
+        if local_rows:
+            L = sp.vstack([L, Xb[local_rows]], format="csr")
+    return labels, leaders
+
+
+def rank_clusters(utterances, labels, leaders, examples=5):
+    """Cluster absteigend nach Gesamthäufigkeit, Beispiele je Cluster nach Häufigkeit."""
+    members = [[] for _ in leaders]
+    for (text, n), label in zip(utterances, labels):
+        members[label].append((text, n))  # utterances sind schon absteigend sortiert
+    clusters = [Cluster(count=sum(n for _, n in m), variants=len(m),
+                        representative=utterances[lead][0], examples=[t for t, _ in m[:examples]])
+                for m, lead in zip(members, leaders)]
+    clusters.sort(key=lambda c: -c.count)  # stabil: bei Gleichstand häufigster Anführer zuerst
+    return clusters
+
+
+def annotate_nearest(clusters, kb):
+    """Nächste KB-Frage je Cluster (Score des Anführers gegen die KB)."""
+    results = kb.search([c.representative for c in clusters], threshold=0.0, topk=1)
+    for c, res in zip(clusters, results):
+        if not res.similarity > 0:
+            continue  # kein gemeinsamer Term mit der KB
+        c.nearest_id = res.picked_id or ""
+        c.nearest_question = res.question or ""
+        c.nearest_similarity = res.similarity
+
+
+def write_clusters(path, clusters, total):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=CLUSTER_FIELDS)
+        w.writeheader()
+        for rank, c in enumerate(clusters, 1):
+            w.writerow({
+                "rank": rank,
+                "count": c.count,
+                "share": f"{c.count / total:.4f}" if total else "0",
+                "variants": c.variants,
+                "representative": c.representative,
+                "examples": " | ".join(c.examples),
+                "nearest_id": c.nearest_id,
+                "nearest_question": c.nearest_question,
+                "nearest_similarity": f"{c.nearest_similarity:.3f}",
+            })
+
+
+def run(paths, out_path, kb=None, low_similarity=DEFAULT_LOW_SIMILARITY, threshold=DEFAULT_THRESHOLD,
+        chunk_rows=DEFAULT_CHUNK_ROWS, max_distinct=DEFAULT_MAX_DISTINCT, examples=5, top=None):
+    """Kompletter Lauf: Log lesen, clustern, CSV schreiben; liefert die Statistik."""
+    utterances, stats = collect_unanswered(paths, low_similarity, chunk_rows, max_distinct)
+    logger.info("%d Zeilen gelesen, %d unbeantwortet, %d verschiedene Fragen",
+                stats["rows"], stats["unanswered"], stats["distinct"])
+    X = vectorize([text for text, _ in utterances])
+    labels, leaders = cluster(X, threshold)
+    clusters = rank_clusters(utterances, labels, leaders, examples)[:top]
+    if kb is not None and clusters:
+        annotate_nearest(clusters, kb)
+    write_clusters(out_path, clusters, stats["unanswered"] - stats["pruned"])
+    stats["clusters"] = len(leaders)
+    return stats
@@ -1,37 +1,34 @@
 import streamlit as st
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from datetime import datetime
-import os, base64, time, random
+from hotelbot import AnswerCache, assets, engine
+from hotelbot.history import ChatHistory
+from hotelbot.live import LiveKnowledgeBase
+from hotelbot.log_sinks import make_event, sinks_from_env
+from hotelbot.streaming import pacing_from_env, stream_chunks, typing_indicator
 
 st.set_page_config(page_title="KI-Chatbot", page_icon="💬")
 
-# ---- Logo laden & als Base64 einbetten (vermeidet Pfad-/Serving-Probleme) ----
-def to_b64(path: str) -> str:
-    try:
-        with open(path, "rb") as f:
-            return base64.b64encode(f.read()).decode("utf-8")
-    except Exception:
-        return ""
+# ---- Bilder: einmalig auf Anzeigegröße verkleinert, per Static Serving ausgeliefert ----
+@st.cache_resource(show_spinner=False)
+def image_src(path: str, size: tuple) -> str:
+    return assets.image_src(path, size, static_serving=st.get_option("server.enableStaticServing"))
+
+@st.cache_resource(show_spinner=False)
+def avatar(path: str) -> str:
+    return assets.thumbnail(path, assets.AVATAR_SIZE) or path
 
 # Rechtsseitiges Chatbot-Logo
 LOGO_PATH = "AI-Chatbot.png"
-LOGO_B64 = to_b64(LOGO_PATH)
-
-# Header-Bild oben mittig
-HEADER_LOGO_PATH = "bed.jpg"
-HEADER_LOGO_B64 = to_b64(HEADER_LOGO_PATH)
+LOGO_SRC = image_src(LOGO_PATH, assets.SIDEBOX_LOGO_SIZE)
 
 # ---- Kopfbereich mit Headerbild (Banner-Stil), Titel & Reset-Button ----
 HEADER_IMG_PATH = "bed.jpg"
-HEADER_IMG_B64 = to_b64(HEADER_IMG_PATH)
+HEADER_IMG_SRC = image_src(HEADER_IMG_PATH, assets.HEADER_SIZE)
 
-if HEADER_IMG_B64:
+if HEADER_IMG_SRC:
     st.markdown(
         f"""
         <div style='position:relative; text-align:center; margin-bottom:1.5rem;'>
-            <img src='data:image/jpeg;base64,{HEADER_IMG_B64}'
+            <img src='{HEADER_IMG_SRC}'
                  alt='Hotel Header'
                  style='width:100%; max-height:280px; object-fit:cover; border-radius:0 0 20px 20px;
                         box-shadow:0 4px 14px rgba(0,0,0,0.15);'>
@@ -62,7 +59,7 @@ else:
 
 
 # ---- Fixiertes Seiten-Panel rechts ----
-img_tag = f"<img src='data:image/png;base64,{LOGO_B64}' alt='Chatbot Logo'>" if LOGO_B64 else ""
+img_tag = f"<img src='{LOGO_SRC}' alt='Chatbot Logo'>" if LOGO_SRC else ""
 st.markdown("""
 <style>
 /* ========== Design Preset: Hotel Bellevue Grand ========== */
@@ -159,54 +156,50 @@ main [data-testid="block-container"]{
 # ---- Daten laden & Helfer ----
 @st.cache_resource
 def load_kb(csv_path="answers.csv"):
-    df = pd.read_csv(csv_path).fillna("")
-    if not {"id","question","answer"}.issubset(df.columns):
-        raise ValueError("CSV braucht Spalten: id, question, answer")
-    vec = TfidfVectorizer(ngram_range=(1,2), stop_words=None, lowercase=True)
-    X = vec.fit_transform(df["question"].tolist())
-    return df, vec, X
-
-def find_best_answer(user_text, df, vec, X, threshold=0.25, topk=3):
-    q = vec.transform([user_text])
-    sims = cosine_similarity(q, X).flatten()
-    best_idx = int(sims.argmax())
-    best_sim = float(sims[best_idx])
-    if best_sim < threshold:
-        return None, best_sim, []
-    top_idx = sims.argsort()[::-1][:topk]
-    top = [(df.iloc[i]["id"], df.iloc[i]["question"], float(sims[i])) for i in top_idx]
-    return df.iloc[best_idx], best_sim, top
-
-def log_event(user_text, picked_id, sim, logfile="logs.csv"):
-    row = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "user_text": user_text,
-        "picked_id": picked_id,
-        "similarity": sim,
-    }
-    exists = os.path.exists(logfile)
-    pd.DataFrame([row]).to_csv(logfile, mode="a", index=False, header=not exists)
+    # Prozessweit eine Live-KB; Änderungen an der CSV werden im Hintergrund übernommen
+    return LiveKnowledgeBase(csv_path).start()
+
+@st.cache_resource
+def answer_cache(csv_path="answers.csv"):
+    # LRU über normalisierte Anfragen; leert sich bei jedem Neuaufbau der KB
+    return AnswerCache().bind(load_kb(csv_path))
+
+def find_best_answer(user_text, kb, threshold=0.25, topk=3):
+    return engine.find_best_answer(user_text, kb, threshold=threshold, topk=topk, cache=answer_cache())
+
+@st.cache_resource(show_spinner=False)
+def _log_sink():
+    # Log-Ziele laut HOTELBOT_LOG_SINKS (Standard: logs.csv), siehe hotelbot.log_sinks
+    return sinks_from_env(default="csv")
+
+def log_event(user_text, picked_id, sim):
+    _log_sink().write(make_event(user_text, picked_id, sim))
 
 # ---- Hauptlogik ----
-df, vec, X = load_kb("answers.csv")
+PACING = pacing_from_env()  # HOTELBOT_ANIMATION=off für Lasttests/Barrierefreiheit
+kb = load_kb("answers.csv").current()
 if "history" not in st.session_state:
-    st.session_state.history = []
+    # Ohne Session-ID im Log und ohne "Frühere Nachrichten" lässt sich nichts
+    # nachladen: ganzen Verlauf behalten (Turns bleiben kompakte Tupel)
+    st.session_state.history = ChatHistory(None)
+history = st.session_state.history
 
-if not st.session_state.history:
+if not len(history):
     with st.chat_message("assistant"):
         st.write("Willkommen im Hotel! Wie kann ich helfen?")
 
-for role, text in st.session_state.history:
-    with st.chat_message(role):
-        st.write(text)
+for turn in history.visible():
+    with st.chat_message("user"):
+        st.write(turn.user_text)
+    with st.chat_message("assistant"):
+        st.write(turn.answer)
 
 user_msg = st.chat_input("Frag mich etwas …")
 if user_msg:
-    st.session_state.history.append(("user", user_msg))
     with st.chat_message("user"):
         st.write(user_msg)
 
-    best, sim, top = find_best_answer(user_msg, df, vec, X, threshold=0.20, topk=3)
+    best, sim, top = find_best_answer(user_msg, kb, threshold=0.20, topk=3)
     if best is None:
         bot_text = "Dazu kann ich dir leider nicht weiterhelfen."
         picked_id = ""
@@ -214,19 +207,10 @@ if user_msg:
         bot_text = best["answer"]
         picked_id = best["id"]
 
+    # ---- Chatbot-Antwort als Stream (Gesamtdauer gedeckelt, siehe PACING) ----
     with st.chat_message("assistant"):
-        dots = st.empty()
-        for i in range(3):
-            dots.markdown(f"_schreibt{'.' * ((i % 3) + 1)}_")
-            time.sleep(0.35)
-        dots.empty()
-
-        output = st.empty()
-        displayed = ""
-        for ch in bot_text:
-            displayed += ch
-            output.markdown(displayed)
-            time.sleep(random.uniform(0.01, 0.03))
-
-    st.session_state.history.append(("assistant", bot_text))
+        typing_indicator(st.empty(), PACING)
+        st.write_stream(stream_chunks(bot_text, PACING))
+
+    history.add(user_msg, picked_id, bot_text)
     log_event(user_msg, picked_id, sim if best is not None else 0.0)
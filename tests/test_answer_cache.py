@@ -0,0 +1,79 @@
+"""AnswerCache: Schlüssel aus normalisiertem Text und Snapshot, Verwerfen bei Tausch/Entladen."""
+import os
+
+import pandas as pd
+import pytest
+
+from hotelbot import AnswerCache, KnowledgeBase, normalize_query
+from hotelbot.live import LiveKnowledgeBase
+from hotelbot.tenants import TenantRegistry
+
+FAQ = pd.DataFrame({
+    "id": ["Q1", "Q2", "Q3"],
+    "question": ["Wann gibt es Frühstück?", "Wie kann ich einchecken?", "Gibt es einen Parkplatz?"],
+    "answer": ["Ab 6:30 Uhr.", "An der Rezeption.", "Ja, in der Tiefgarage."],
+})
+
+
+@pytest.fixture(scope="module")
+def kb():
+    return KnowledgeBase.from_frame(FAQ)
+
+
+def test_normalize_query_only_drops_what_the_analyzer_ignores():
+    assert normalize_query("  Wann gibt's FRÜHSTÜCK?! ") == "wann gibt s frühstück"
+    assert normalize_query("Frühstück?") == normalize_query("frühstück")
+    assert normalize_query("fruehstueck") != normalize_query("Frühstück")
+
+
+@pytest.mark.parametrize("order", [["fruehstueck", "Frühstück?"], ["Frühstück?", "fruehstueck"]])
+def test_result_does_not_depend_on_which_spelling_came_first(kb, order):
+    cache = AnswerCache()
+    cached = {text: cache.search(kb, text).picked_id for text in order}
+    assert cached == {"Frühstück?": "Q1", "fruehstueck": None}
+    assert cached == {text: kb.search([text])[0].picked_id for text in order}
+
+
+def test_variants_of_one_query_share_an_entry(kb):
+    cache = AnswerCache()
+    assert cache.search(kb, "Frühstück?").picked_id == "Q1"
+    assert cache.search(kb, "  frühstück ").picked_id == "Q1"
+    assert cache.stats()["hits"] == 1
+
+
+def write_faq(path, answer="Ab 6:30 Uhr."):
+    frame = FAQ.copy()
+    frame.loc[0, "answer"] = answer
+    frame.to_csv(path, index=False)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    return str(path)
+
+
+def test_swap_drops_entries_of_that_source(tmp_path):
+    live = LiveKnowledgeBase(write_faq(tmp_path / "answers.csv"))
+    cache = AnswerCache().bind(live)
+    assert cache.search(live.current(), "Frühstück").answer == "Ab 6:30 Uhr."
+
+    write_faq(tmp_path / "answers.csv", answer="Ab 7:00 Uhr.")
+    assert live.maybe_reload()
+    assert cache.stats()["size"] == 0
+    assert cache.search(live.current(), "Frühstück").answer == "Ab 7:00 Uhr."
+
+
+def test_tenants_do_not_share_entries_and_eviction_purges(tmp_path):
+    for name in "ab":
+        (tmp_path / name).mkdir()
+    tenants = {"a": write_faq(tmp_path / "a" / "answers.csv"),
+               "b": write_faq(tmp_path / "b" / "answers.csv", answer="Ab 8:00 Uhr.")}
+    # Budget 1 Byte: jeder neu geladene Mandant verdrängt die anderen
+    registry = TenantRegistry(tenants, default="a", memory_budget=1, loader=LiveKnowledgeBase)
+    cache = AnswerCache().bind(registry)
+
+    assert cache.search(registry.get("a").current(), "Frühstück").answer == "Ab 6:30 Uhr."
+    assert cache.search(registry.get("b").current(), "Frühstück").answer == "Ab 8:00 Uhr."
+    assert registry.loaded() == ["b"]
+    assert cache.stats()["size"] == 1  # nur noch der Eintrag von b
+
+    registry.close()
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,17 @@
+"""Regressions-Gate der Benchmark-Suite."""
+from bench.suite import compare
+
+
+def results(**metrics):
+    return {"results": [dict(size=1000, **metrics)]}
+
+
+def test_small_absolute_changes_are_noise():
+    base = results(load_s=0.0037, p99_ms=0.4, matrix_bytes=1000)
+    assert compare(results(load_s=0.0059, p99_ms=0.9, matrix_bytes=1000), base, 0.25) == []
+
+
+def test_large_changes_are_regressions():
+    base = results(load_s=0.05, p99_ms=4.0, batch_qps=5000.0, matrix_bytes=1000)
+    current = results(load_s=0.5, p99_ms=9.0, batch_qps=2000.0, matrix_bytes=1300)
+    assert [m for _, m, *_ in compare(current, base, 0.25)] == ["load_s", "p99_ms", "batch_qps", "matrix_bytes"]
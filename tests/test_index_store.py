@@ -0,0 +1,36 @@
+"""Kompilierter Index: geladen gleich frisch gefittet, für andere Benutzer lesbar."""
+import os
+import stat
+
+import numpy as np
+import pytest
+
+from bench.synth import synth_kb, synth_queries
+from hotelbot.engine import KnowledgeBase
+from hotelbot.index_store import load_index, save_index
+
+
+@pytest.fixture(scope="module", params=["tfidf", "hashing"])
+def compiled(request, tmp_path_factory):
+    frame = synth_kb(2_000)
+    kb = KnowledgeBase.from_frame(frame, vectorizer=request.param)
+    kb.build_neighbors()
+    index_dir = str(tmp_path_factory.mktemp("idx") / "kb.index")
+    save_index(kb, index_dir, digest="test")
+    return kb, load_index(index_dir), index_dir, synth_queries(frame, 200) + ["", "xyzzy"]
+
+
+def test_loaded_index_answers_like_fitted_kb(compiled):
+    fitted, loaded, _, queries = compiled
+    assert list(loaded.ids) == list(fitted.ids)
+    assert list(loaded.answers) == list(fitted.answers)
+    np.testing.assert_array_equal(loaded.score(queries), fitted.score(queries))
+    for got, want in zip(loaded.search(queries, topk=5), fitted.search(queries, topk=5)):
+        assert got == want
+    qid = str(fitted.ids[17])
+    assert loaded.answer_by_id(qid) == fitted.answer_by_id(qid)
+
+
+def test_index_dir_is_readable_by_other_users(compiled):
+    mode = stat.S_IMODE(os.stat(compiled[2]).st_mode)
+    assert mode & 0o055 == 0o055
@@ -0,0 +1,26 @@
+"""Invertierter Index mit MaxScore-Abbruch liefert exakt die Brute-Force-Top-k."""
+import pytest
+
+from bench.synth import synth_kb, synth_queries
+from hotelbot.engine import KnowledgeBase
+
+
+@pytest.fixture(scope="module")
+def kb_and_queries():
+    frame = synth_kb(20_000)
+    queries = synth_queries(frame, 300) + ["", "xyzzy unbekannt", "Frühstück Frühstück Zimmer"]
+    return KnowledgeBase.from_frame(frame, retrieval="brute"), queries
+
+
+@pytest.mark.parametrize("k", [1, 3, 10])
+def test_inverted_topk_equals_brute_force(kb_and_queries, k):
+    kb, queries = kb_and_queries
+    kb.retrieval = "brute"
+    brute = kb.search(queries, threshold=0.0, topk=k)
+    kb.retrieval = "inverted"
+    try:
+        inverted = kb.search(queries, threshold=0.0, topk=k)
+    finally:
+        kb.retrieval = "brute"
+    assert [a.top for a in inverted] == [a.top for a in brute]
+    assert [a.picked_id for a in inverted] == [a.picked_id for a in brute]
@@ -0,0 +1,81 @@
+"""LiveKnowledgeBase: Neuladen übernimmt Ergänzungen, Änderungen und Löschungen."""
+import os
+
+import pandas as pd
+import pytest
+
+from hotelbot.live import LiveKnowledgeBase
+
+FAQ = [
+    ("Q1", "Wann gibt es Frühstück?", "Ab 6:30 Uhr."),
+    ("Q2", "Wie kann ich einchecken?", "An der Rezeption."),
+    ("Q3", "Gibt es einen Parkplatz?", "Ja, in der Tiefgarage."),
+    ("Q4", "Wann muss ich auschecken?", "Bis 11 Uhr."),
+    ("Q5", "Darf ich mein Haustier mitbringen?", "Hunde sind willkommen."),
+]
+
+
+def write_csv(path, rows):
+    pd.DataFrame(rows, columns=["id", "question", "answer"]).to_csv(path, index=False)
+    # mtime sicher verändern, auch wenn die Uhr grob auflöst
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture(params=["tfidf", "hashing"])
+def vectorizer(request):
+    return request.param
+
+
+def picked(live, text):
+    return live.search([text])[0].picked_id
+
+
+def test_reload_applies_adds_edits_and_deletes(tmp_path, vectorizer):
+    csv_path = tmp_path / "answers.csv"
+    write_csv(csv_path, FAQ)
+    live = LiveKnowledgeBase(str(csv_path), refit_threshold=1.0, vectorizer=vectorizer)
+    assert picked(live, "Parkplatz") == "Q3"
+
+    rows = [r for r in FAQ if r[0] != "Q3"]                          # löschen
+    rows[0] = ("Q1", "Wann gibt es Frühstück?", "Ab 7:00 Uhr.")      # nur Antwort
+    rows[1] = ("Q2", "Wo kann ich einchecken?", "An der Rezeption.")  # Frage geändert
+    rows.append(("Q6", "Gibt es einen Parkplatz für Busse?", "Ja, hinter dem Haus."))  # neu
+    write_csv(csv_path, rows)
+    assert live.maybe_reload()
+
+    kb = live.current()
+    assert list(kb.ids) == ["Q1", "Q2", "Q4", "Q5", "Q6"]
+    assert picked(live, "Parkplatz") == "Q6"
+    assert kb.answer_by_id("Q3") is None
+    assert live.search(["Frühstück"])[0].answer == "Ab 7:00 Uhr."
+    assert picked(live, "Wo kann ich einchecken") == "Q2"
+    assert not live.maybe_reload()  # unveränderte Datei: kein Tausch
+
+
+def test_new_terms_are_found_after_restart(tmp_path):
+    csv_path = tmp_path / "answers.csv"
+    write_csv(csv_path, FAQ)
+    live = LiveKnowledgeBase(str(csv_path), refit_threshold=1.0)
+    write_csv(csv_path, FAQ + [("Q6", "Gibt es einen Hubschrauberlandeplatz?", "Nein.")])
+    assert live.maybe_reload()
+    # inkrementell: altes Vokabular, das neue Wort ist (noch) unbekannt
+    assert picked(live, "Hubschrauberlandeplatz") is None
+    assert live.drift() > 0
+
+    restarted = LiveKnowledgeBase(str(csv_path), refit_threshold=1.0)
+    assert picked(restarted, "Hubschrauberlandeplatz") == "Q6"
+    assert restarted.drift() == 0
+
+
+def test_hashing_drift_survives_restart(tmp_path):
+    csv_path = tmp_path / "answers.csv"
+    write_csv(csv_path, FAQ)
+    live = LiveKnowledgeBase(str(csv_path), refit_threshold=1.0, vectorizer="hashing")
+    write_csv(csv_path, FAQ + [("Q6", "Gibt es einen Hubschrauberlandeplatz?", "Nein.")])
+    assert live.maybe_reload()
+    assert picked(live, "Hubschrauberlandeplatz") == "Q6"
+
+    restarted = LiveKnowledgeBase(str(csv_path), refit_threshold=1.0, vectorizer="hashing")
+    assert restarted.drift() == live.drift() > 0
+    assert picked(restarted, "Hubschrauberlandeplatz") == "Q6"
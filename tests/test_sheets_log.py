@@ -0,0 +1,149 @@
+"""SheetsLogWorker gegen FakeWorksheet: Batches, 429-Retry, Spill und Nachreichen."""
+import os
+import threading
+
+from hotelbot.fakes import FakeAPIError, FakeWorksheet
+from hotelbot.sheets_log import SheetsLogWorker
+
+FIELDS = ["ts", "user_text"]
+
+
+class FlakyWorksheet(FakeWorksheet):
+    """Die ersten ``failures`` append_rows-Aufrufe scheitern mit ``code``."""
+
+    def __init__(self, failures, code, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.code = code
+
+    def append_rows(self, values, value_input_option="RAW"):
+        if self.failures:
+            self.failures -= 1
+            raise FakeAPIError(self.code)
+        super().append_rows(values, value_input_option)
+
+
+def make_worker(ws, tmp_path, opened=None, **kwargs):
+    def open_worksheet():
+        if opened is not None:
+            opened.append(1)
+        return ws
+    options = dict(spill_path=str(tmp_path / "spill.jsonl"), batch_size=10, flush_interval=0.5,
+                   min_interval=0.0, max_retries=2, base_backoff=0.01, quota_backoff=0.01,
+                   replay_interval=3600.0, fieldnames=FIELDS)
+    options.update(kwargs)
+    return SheetsLogWorker(open_worksheet, **options)
+
+
+def rows(n, start=0):
+    return [{"ts": str(i), "user_text": f"frage {i}"} for i in range(start, start + n)]
+
+
+def sent(ws):
+    return [r[0] for r in ws.get_all_values()[1:]]
+
+
+def test_batches_rows_and_writes_header(tmp_path):
+    ws = FakeWorksheet()
+    worker = make_worker(ws, tmp_path).start()
+    try:
+        for row in rows(25):
+            worker.write(row)
+        assert worker.flush(timeout=10)
+    finally:
+        worker.stop()
+    assert ws.get_all_values()[0] == FIELDS
+    assert sent(ws) == [str(i) for i in range(25)]
+    assert worker.stats["batches"] == 3
+
+
+def test_quota_error_is_retried_without_reopening(tmp_path):
+    ws, opened = FlakyWorksheet(failures=2, code=429), []
+    worker = make_worker(ws, tmp_path, opened=opened).start()
+    try:
+        for row in rows(5):
+            worker.write(row)
+        assert worker.flush(timeout=10)
+    finally:
+        worker.stop()
+    assert sent(ws) == [str(i) for i in range(5)]
+    assert worker.stats["retries"] == 2
+    assert len(opened) == 1
+    assert not os.path.exists(tmp_path / "spill.jsonl")
+
+
+def test_failed_rows_are_spilled_and_replayed(tmp_path):
+    ws = FakeWorksheet(error_rate=1.0)
+    worker = make_worker(ws, tmp_path, max_retries=0).start()
+    try:
+        for row in rows(15):
+            worker.write(row)
+        assert worker.flush(timeout=10)
+        assert sent(ws) == []
+        assert worker.stats["spilled"] == 15
+        assert os.path.exists(tmp_path / "spill.jsonl")
+
+        ws.error_rate = 0.0
+        for row in rows(3, start=15):
+            worker.write(row)
+        assert worker.flush(timeout=10)
+    finally:
+        worker.stop()
+    assert sorted(sent(ws), key=int) == [str(i) for i in range(18)]
+    assert worker.stats["replayed"] == 15
+    assert not os.path.exists(tmp_path / "spill.jsonl")
+    assert not os.path.exists(tmp_path / "spill.jsonl.replay")
+
+
+def test_concurrent_flushes_send_each_row_once(tmp_path):
+    ws = FakeWorksheet(error_rate=1.0)
+    worker = make_worker(ws, tmp_path, max_retries=0).start()
+    try:
+        for row in rows(40):
+            worker.write(row)
+        assert worker.flush(timeout=10)
+        ws.error_rate = 0.0
+
+        def flush_many(start):
+            for row in rows(10, start=start):
+                worker.write(row)
+                worker.flush(timeout=10)
+
+        threads = [threading.Thread(target=flush_many, args=(40 + 10 * i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert worker.flush(timeout=10)
+    finally:
+        worker.stop()
+    assert sorted(sent(ws), key=int) == [str(i) for i in range(80)]
+
+
+def test_flush_without_worker_sends_inline(tmp_path):
+    ws = FakeWorksheet()
+    worker = make_worker(ws, tmp_path)
+    for row in rows(12):
+        worker.write(row)
+    assert worker.flush()
+    assert sent(ws) == [str(i) for i in range(12)]
+
+
+def test_workers_sharing_a_spill_replay_each_row_once(tmp_path):
+    # Zwei Worker mit demselben spill_path wie zwei Streamlit-Replikate
+    ws = FakeWorksheet(latency=0.005)
+    first = make_worker(ws, tmp_path, batch_size=5)
+    first._spill([[str(i), f"frage {i}"] for i in range(200)])
+    workers = [first, make_worker(ws, tmp_path, batch_size=5)]
+
+    def replay(worker):
+        for _ in range(5):
+            worker.flush()
+
+    threads = [threading.Thread(target=replay, args=(w,)) for w in workers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(sent(ws), key=int) == [str(i) for i in range(200)]
+    assert not os.path.exists(tmp_path / "spill.jsonl.replay")